@@ -0,0 +1,23 @@
+"""Gunicorn settings for DevReady."""
+from website.catalog import get_snapshot, require_shared_cache
+from website.extensions import db
+from website.metrics import clear_multiprocess_dir, require_shared_metrics
+
+# Import the application once in the master so forked workers start without re-importing it.
+preload_app = True  # pylint: disable=invalid-name
+
+
+def on_starting(_server):
+    """Starts metrics from zero instead of adding to the previous run's figures."""
+    clear_multiprocess_dir()
+
+
+def post_worker_init(worker):
+    """Loads the catalog snapshot before a worker accepts requests."""
+    require_shared_cache(worker.wsgi, worker.cfg.workers)
+    require_shared_metrics(worker.wsgi, worker.cfg.workers)
+    with worker.wsgi.app_context():
+        # Never share pooled connections opened in the master with forked workers.
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+        get_snapshot()
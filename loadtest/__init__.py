@@ -0,0 +1 @@
+"""Load-test harness: drives a realistic user mix against gunicorn with stubbed backends."""
@@ -0,0 +1,219 @@
+"""Runs the DevReady load test across gunicorn worker counts and reports per-endpoint latency.
+
+    python -m loadtest.run --workers 1,2,4 --users 20 --duration 30
+
+For each worker count a gunicorn server is started against a seeded database,
+`--users` synthetic users log in and replay a weighted mix of page views, sample
+runs, submissions and hints for `--duration` seconds, and throughput, p50/p99
+latency and error rates are printed per endpoint. AI requests go to a local stub
+DeepSeek server; `--sandbox-stub` replaces solution processes with a fixed delay
+to isolate web-tier capacity from sandbox cost.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+import requests
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from .stub_ai import start_stub_ai
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "loadtest-password"
+SOLUTION = "class Solution:\n    def solve(self, args):\n        return sum(args)\n"
+# Relative frequency of each action in a synthetic user's session.
+WEIGHTS = {"home": 3, "library": 2, "question": 4, "run": 2, "submit": 1, "hint": 1}
+
+def question_rows(count):
+    """Builds importable questions that SOLUTION passes."""
+    return [{"title": f"Load {i}", "description": f"Return the sum of the arguments ({i}).",
+             "difficulty": ("Easy", "Medium", "Hard")[i % 3], "expected_method": "solve",
+             "tags": [f"topic-{i % 10}", f"topic-{(i + 3) % 10}"],
+             "test_cases": [{"input": [i, n], "expected_output": i + n, "is_sample": n == 0}
+                            for n in range(3)]}
+            for i in range(count)]
+
+def seed_database(database_url, users, questions):
+    """Creates the schema, users and questions. Returns the question IDs."""
+    # Imported here so `--help` and the stub server don't pay for the application import.
+    # pylint: disable=import-outside-toplevel
+    from website import create_app
+    from website.extensions import db
+    from website.importer import import_questions
+    from website.models import Question, User
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url, "SECRET_KEY": "seed",
+                      "AUTO_CREATE_SCHEMA": True})
+    with app.app_context(), tempfile.TemporaryDirectory() as directory:
+        if not User.query.filter(User.username.like("load-user-%")).first():
+            password_hash = generate_password_hash(PASSWORD)
+            db.session.execute(insert(User), [
+                {"username": f"load-user-{i}", "email": f"load-user-{i}@example.com",
+                 "passwordHash": password_hash} for i in range(users)])
+            db.session.commit()
+        source = os.path.join(directory, "questions.jsonl")
+        with open(source, "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(row) + "\n" for row in question_rows(questions))
+        import_questions(source)
+        ids = [id_ for (id_,) in db.session.query(Question.questionID)
+               .filter(Question.title.like("Load %"))]
+        db.session.remove()
+    return ids
+
+def wait_for_port(process, port, timeout=30):
+    """Waits until `process` accepts connections on localhost:`port`."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+def start_server(workers, port, env):
+    """Starts gunicorn with the repository's gunicorn.conf.py."""
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "gunicorn", "--workers", str(workers),
+         "--bind", f"127.0.0.1:{port}", "app:app"],
+        cwd=REPO_ROOT, env={**os.environ, **env})
+    try:
+        wait_for_port(process, port)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process
+
+def run_user(base_url, username, question_ids, deadline, samples):
+    """Logs one synthetic user in and replays weighted actions until `deadline`."""
+    rng = random.Random(username)
+    session = requests.Session()
+    actions, weights = zip(*WEIGHTS.items())
+    action = "login"
+    while time.monotonic() < deadline:
+        question_id = rng.choice(question_ids)
+        started = time.perf_counter()
+        try:
+            response = perform(session, base_url, action, question_id, username)
+            # A successful login redirects; anything else redirecting means the session was lost.
+            ok = response.status_code == 302 if action == "login" else response.status_code < 300
+        except requests.RequestException:
+            ok = False
+        samples.append((action, time.perf_counter() - started, ok))
+        if ok or action != "login":  # Retry a failed login before anything else.
+            action = rng.choices(actions, weights)[0]
+
+def perform(session, base_url, action, question_id, username):
+    """Issues the request behind one action without following redirects."""
+    if action == "login":
+        return session.post(f"{base_url}/login", allow_redirects=False,
+                            data={"username": username, "password": PASSWORD})
+    if action == "hint":
+        return session.post(f"{base_url}/hint", allow_redirects=False,
+                            json={"question_id": question_id, "code": SOLUTION})
+    if action in ("run", "submit"):
+        return session.post(f"{base_url}/{action}/{question_id}", allow_redirects=False,
+                            json={"code": SOLUTION})
+    paths = {"home": "/", "library": "/library", "question": f"/questions/{question_id}"}
+    return session.get(f"{base_url}{paths[action]}", allow_redirects=False)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of already sorted values."""
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]
+
+def summarize(samples, duration):
+    """Aggregates (action, seconds, ok) samples into per-endpoint statistics."""
+    by_action = defaultdict(list)
+    for action, elapsed, ok in samples:
+        by_action[action].append((elapsed, ok))
+    summary = {}
+    for action, rows in sorted(by_action.items()):
+        latencies = sorted(elapsed for elapsed, _ in rows)
+        summary[action] = {
+            "requests": len(rows),
+            "throughput": len(rows) / duration,
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "error_rate": sum(not ok for _, ok in rows) / len(rows),
+        }
+    return summary
+
+def load_test(workers, args, env, question_ids):
+    """Runs one load test against `workers` gunicorn workers and returns its summary."""
+    server = start_server(workers, args.port, env)
+    try:
+        samples = []
+        deadline = time.monotonic() + args.duration
+        threads = [threading.Thread(target=run_user, args=(
+            f"http://127.0.0.1:{args.port}", f"load-user-{i}", question_ids, deadline, samples))
+            for i in range(args.users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+    return summarize(samples, args.duration)
+
+def print_summary(workers, summary):
+    """Prints one worker count's results as a table."""
+    print(f"\n{workers} worker(s)")
+    print(f"{'endpoint':<10}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for action, stats in summary.items():
+        print(f"{action:<10}{stats['requests']:>10}{stats['throughput']:>9.1f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['error_rate']:>8.1%}")
+    total = sum(stats["throughput"] for stats in summary.values())
+    print(f"{'total':<10}{'':>10}{total:>9.1f}")
+
+def parse_args(argv):
+    """Parses the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--workers", default="1,2,4",
+                        help="comma-separated gunicorn worker counts to test")
+    parser.add_argument("--users", type=int, default=20, help="concurrent synthetic users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per worker count")
+    parser.add_argument("--questions", type=int, default=200, help="questions to seed")
+    parser.add_argument("--ai-latency", type=float, default=0.5,
+                        help="seconds the stub DeepSeek server takes per completion")
+    parser.add_argument("--sandbox-stub", type=float, default=None,
+                        help="replace solution processes with this many seconds per test case")
+    parser.add_argument("--database-url", default=None,
+                        help="database to seed and serve (default: a temporary SQLite file)")
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Seeds a database, starts the stub AI server and load-tests each worker count."""
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directory, 'load.db')}"
+        question_ids = seed_database(database_url, args.users, args.questions)
+        stub = start_stub_ai(args.ai_latency)
+        env = {
+            "JAWSDB_URL": database_url,
+            "SECRET_KEY": "loadtest",
+            "OPENAI_API_KEY": "stub",
+            "AI_BASE_URL": f"http://127.0.0.1:{stub.server_port}",
+            # Several workers need a shared cache for catalog invalidation.
+            "CACHE_TYPE": "FileSystemCache",
+            "CACHE_DIR": os.path.join(directory, "cache"),
+        }
+        if args.sandbox_stub is not None:
+            env["LOAD_TEST"] = "1"
+            env["SANDBOX_STUB_SECONDS"] = str(args.sandbox_stub)
+        try:
+            for workers in (int(value) for value in args.workers.split(",")):
+                print_summary(workers, load_test(workers, args, env, question_ids))
+        finally:
+            stub.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Local stand-in for the DeepSeek chat completions API with configurable latency."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HINT = "Consider what happens to an empty input."
+
+def make_handler(latency):
+    """Builds a request handler that answers every completion after `latency` seconds."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        """Answers POST .../chat/completions with a fixed OpenAI-shaped completion."""
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            """Sleeps, then returns a canned completion."""
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(latency)
+            body = json.dumps({
+                "id": "stub", "object": "chat.completion", "created": int(time.time()),
+                "model": request.get("model", "deepseek-chat"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": HINT}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """Keeps load-test output readable."""
+
+    return StubHandler
+
+def start_stub_ai(latency=0.5, host="127.0.0.1", port=0):
+    """Starts the stub server on a background thread and returns it.
+
+    The base URL for AI_BASE_URL is `http://<host>:<server.server_port>`; call
+    `server.shutdown()` to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(latency))
+    threading.Thread(target=server.serve_forever, name="stub-ai", daemon=True).start()
+    return server
@@ -0,0 +1,125 @@
+"""content addressed submission code
+
+Revision ID: 5e9235484298
+Revises: 7b7e78100bda
+Create Date: 2026-10-19 11:28:00.176949
+
+"""
+import hashlib
+import zlib
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, sqlite
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9235484298'
+down_revision = '7b7e78100bda'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+COMPRESS_MIN_SIZE = 256
+
+submission = sa.table('submission', sa.column('submissionID', sa.Integer),
+                      sa.column('code', sa.Text), sa.column('codeHash', sa.String))
+code_blob = sa.table('code_blob', sa.column('codeHash', sa.String),
+                     sa.column('data', sa.LargeBinary), sa.column('compressed', sa.Boolean),
+                     sa.column('size', sa.Integer))
+
+
+def encode(text):
+    """Mirrors CodeBlob.encode at the time of this revision."""
+    raw = text.encode('utf-8')
+    compressed = len(raw) >= COMPRESS_MIN_SIZE
+    return {'codeHash': hashlib.sha256(raw).hexdigest(),
+            'data': zlib.compress(raw) if compressed else raw,
+            'compressed': compressed,
+            'size': len(raw)}
+
+
+def insert_missing_blobs(dialect):
+    """INSERT into code_blob that skips hashes already stored but no other error."""
+    if dialect == 'mysql':
+        statement = mysql.insert(code_blob)
+        return statement.on_duplicate_key_update(codeHash=statement.inserted.codeHash)
+    if dialect == 'sqlite':
+        return sqlite.insert(code_blob).on_conflict_do_nothing()
+    return sa.insert(code_blob)
+
+
+def upgrade():
+    op.create_table('code_blob',
+    sa.Column('codeHash', sa.String(length=64), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('compressed', sa.Boolean(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('codeHash')
+    )
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('codeHash', sa.String(length=64), nullable=True))
+
+    # Move code into blobs in keyset-ordered batches, storing each distinct source once.
+    connection = op.get_bind()
+    insert_blob = insert_missing_blobs(connection.dialect.name)
+    set_hash = (sa.update(submission)
+                .where(submission.c.submissionID == sa.bindparam('id'))
+                .values(codeHash=sa.bindparam('hash')))
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(submission.c.submissionID, submission.c.code)
+            .where(submission.c.submissionID > last_id)
+            .order_by(submission.c.submissionID)
+            .limit(BATCH_SIZE)).all()
+        if not rows:
+            break
+        blobs = {}
+        hashes = []
+        for submission_id, code in rows:
+            values = encode(code)
+            blobs[values['codeHash']] = values
+            hashes.append({'id': submission_id, 'hash': values['codeHash']})
+        connection.execute(insert_blob, list(blobs.values()))
+        connection.execute(set_hash, hashes)
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.alter_column('codeHash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index('ix_submission_code_hash', ['codeHash'], unique=False)
+        batch_op.create_foreign_key('fk_submission_code_hash_code_blob', 'code_blob',
+                                    ['codeHash'], ['codeHash'])
+        batch_op.drop_column('code')
+
+
+def downgrade():
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('code', sa.Text(), nullable=True))
+
+    # Copy code back in keyset-ordered batches of blobs, like the upgrade.
+    connection = op.get_bind()
+    set_code = (sa.update(submission)
+                .where(submission.c.codeHash == sa.bindparam('hash'))
+                .values(code=sa.bindparam('text')))
+    last_hash = ''
+    while True:
+        blobs = connection.execute(
+            sa.select(code_blob.c.codeHash, code_blob.c.data, code_blob.c.compressed)
+            .where(code_blob.c.codeHash > last_hash)
+            .order_by(code_blob.c.codeHash)
+            .limit(BATCH_SIZE)).all()
+        if not blobs:
+            break
+        connection.execute(set_code, [
+            {'hash': code_hash,
+             'text': (zlib.decompress(data) if compressed else data).decode('utf-8')}
+            for code_hash, data, compressed in blobs])
+        last_hash = blobs[-1][0]
+
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.alter_column('code', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_constraint('fk_submission_code_hash_code_blob', type_='foreignkey')
+        batch_op.drop_index('ix_submission_code_hash')
+        batch_op.drop_column('codeHash')
+
+    op.drop_table('code_blob')
@@ -0,0 +1,27 @@
+"""reset runtime distributions
+
+Runtimes recorded before this revision include interpreter startup, so they
+would rank every new submission as faster than all older ones.
+
+Revision ID: b62c0e4f7d15
+Revises: 9d3e6b1f2a48
+Create Date: 2026-10-19 15:03:27.518640
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b62c0e4f7d15'
+down_revision = '9d3e6b1f2a48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DELETE FROM question_distribution WHERE metric = 'runtime'")
+
+
+def downgrade():
+    # The discarded histograms cannot be restored; new ones accumulate as before.
+    pass
@@ -1,8 +1,12 @@
 """Configuration for pytest fixtures."""
+import time
 import pytest
+from sqlalchemy import event, insert
 from werkzeug.security import generate_password_hash
 from website import create_app, db
-from website.models import User, Tag, Question, QuestionTag, TestCase, MasteryScore
+from website.assets import build_assets, load_manifest
+from website.models import (User, Tag, Question, QuestionTag, TestCase, MasteryScore, CodeBlob,
+                            Submission)
 
 @pytest.fixture
 def app():
@@ -95,3 +99,85 @@ def test_user(app):
         db.session.add(user)
         db.session.commit()
         yield user
+
+class QueryCounter:
+    """Context manager that records the SQL statements executed on an engine and the wall time."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self.started = self.elapsed = None
+
+    def _record(self, conn, cursor, statement, *args):  # pylint: disable=unused-argument
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        """Number of statements recorded so far."""
+        return len(self.statements)
+
+@pytest.fixture
+def count_queries(app):
+    """Returns a factory for QueryCounter context managers bound to the app's engine."""
+    with app.app_context():
+        return lambda: QueryCounter(db.engine)
+
+LARGE_CATALOG = {"questions": 400, "tags": 40, "users": 50, "submissions": 5000}
+
+@pytest.fixture
+def large_catalog(sample_data, app):  # pylint: disable=unused-argument
+    """Adds a production-sized catalog and submission history on top of `sample_data`.
+
+    Rows are written with bulk Core inserts; the logged-in user (ID 1) owns a tenth of
+    the submissions and has mastery scores for every new tag.
+    """
+    sizes = LARGE_CATALOG
+    with app.app_context():
+        db.session.execute(insert(User), [
+            {"username": f"load{i}", "email": f"load{i}@example.com", "passwordHash": "x"}
+            for i in range(sizes["users"])])
+        db.session.execute(insert(Tag), [{"name": f"topic-{i}"} for i in range(sizes["tags"])])
+        db.session.execute(insert(Question), [
+            {"title": f"Catalog {i}", "description": f"Solve problem {i}. " * 20,
+             "difficulty": ("Easy", "Medium", "Hard")[i % 3], "expected_method": "solve"}
+            for i in range(sizes["questions"])])
+        question_ids = [id_ for (id_,) in db.session.query(Question.questionID)
+                        .filter(Question.title.like("Catalog %"))]
+        tag_ids = [id_ for (id_,) in db.session.query(Tag.tagID)
+                   .filter(Tag.name.like("topic-%"))]
+        db.session.execute(insert(QuestionTag), [
+            {"questionID": question_id, "tagID": tag_ids[(i + offset) % len(tag_ids)]}
+            for i, question_id in enumerate(question_ids) for offset in (0, 7)])
+        db.session.execute(insert(TestCase), [
+            {"questionID": question_id, "inputData": f"[{n}]", "expectedOutput": str(n),
+             "isSample": n == 0}
+            for question_id in question_ids for n in range(3)])
+        db.session.execute(insert(MasteryScore), [
+            {"userID": 1, "tagID": tag_id, "score": 50.0} for tag_id in tag_ids])
+        blob = CodeBlob.encode("class Solution:\n    pass\n")
+        db.session.execute(insert(CodeBlob), [blob])
+        user_count = sizes["users"] + 1
+        db.session.execute(insert(Submission), [
+            {"userID": 1 if i % 10 == 0 else 2 + i % (user_count - 1),
+             "questionID": question_ids[i % len(question_ids)], "codeHash": blob["codeHash"],
+             "result": "Passed" if i % 3 else "Failed", "runtime": 1000 + i, "language": "python"}
+            for i in range(sizes["submissions"])])
+        db.session.commit()
+    return sizes
+
+@pytest.fixture
+def built_assets(app, tmp_path):
+    """Builds the real static folder into a temporary directory and loads its manifest."""
+    app.config["ASSET_BUILD_DIR"] = str(tmp_path)
+    manifest = build_assets(app.static_folder, str(tmp_path))
+    load_manifest(app)
+    return manifest
@@ -0,0 +1,72 @@
+"""Functional tests for the AI helper endpoints."""
+import pytest
+
+def test_analyze_submission_served_locally(client, mocker):
+    """Test that a plain analysis request is answered without calling the LLM."""
+    mock_llm = mocker.patch("website.ai_helper.generate_response")
+    code = "class Solution:\n    def f(self, a):\n        return sorted(a)\n"
+
+    response = client.post("/analyze_submission", json={"code": code})
+
+    assert response.status_code == 200
+    assert response.json["source"] == "local"
+    assert response.json["complexity"]["time_complexity"] == "O(n log n)"
+    mock_llm.assert_not_called()
+
+def test_analyze_submission_detailed_uses_llm(client, mocker):
+    """Test that a detailed analysis falls through to the LLM with the local estimate."""
+    mock_llm = mocker.patch("website.ai_helper.generate_response",
+                            return_value=("Looks optimal.", None))
+    code = "class Solution:\n    def f(self, a):\n        return sorted(a)\n"
+
+    response = client.post("/analyze_submission", json={
+        "code": code, "question_description": "Sort an array", "detailed": True
+    })
+
+    assert response.status_code == 200
+    assert response.json["source"] == "llm"
+    assert response.json["analysis"] == "Looks optimal."
+    assert "O(n log n)" in mock_llm.call_args[0][1]
+
+def test_analyze_submission_unparseable_falls_back(client, mocker):
+    """Test that code the analyzer cannot parse is sent to the LLM."""
+    mock_llm = mocker.patch("website.ai_helper.generate_response",
+                            return_value=("Syntax error on line 1.", None))
+
+    response = client.post("/analyze_submission", json={
+        "code": "def f(:", "question_description": "Sort an array"
+    })
+
+    assert response.status_code == 200
+    assert response.json["source"] == "llm"
+    mock_llm.assert_called_once()
+
+def test_analyze_submission_missing_code(client):
+    """Test that a request without code is rejected."""
+    response = client.post("/analyze_submission", json={"question_description": "Sort"})
+    assert response.status_code == 400
+
+@pytest.mark.usefixtures("sample_data")
+def test_hint_builds_prompt_from_question_id(client, mocker):
+    """Test that hints resolve the question server-side from its ID."""
+    mock_llm = mocker.patch("website.ai_helper.generate_response",
+                            return_value=("Try a running total.", None))
+
+    response = client.post("/hint", json={"question_id": 1, "code": "class Solution: pass"})
+
+    assert response.status_code == 200
+    assert response.json["hint"] == "Try a running total."
+    assert "Sum Array: Find the sum of array elements" in mock_llm.call_args[0][1]
+
+@pytest.mark.usefixtures("sample_data")
+def test_hint_unknown_question(client, mocker):
+    """Test that hints for a nonexistent question return 404."""
+    mocker.patch("website.ai_helper.generate_response")
+    response = client.post("/hint", json={"question_id": 999, "code": "pass"})
+    assert response.status_code == 404
+    assert response.json["error"] == "Question not found"
+
+def test_hint_missing_question(client):
+    """Test that hints without a question ID or description are rejected."""
+    response = client.post("/hint", json={"code": "pass"})
+    assert response.status_code == 400
@@ -0,0 +1,68 @@
+"""Functional tests for fingerprinted static assets."""
+import gzip
+import pytest
+from website.assets import IMMUTABLE, build_assets, load_manifest
+
+def test_pages_link_fingerprinted_assets(client, built_assets):
+    """Test that templates link the hashed copies once assets are built."""
+    page = client.get("/login").get_data(as_text=True)
+
+    assert f"/assets/{built_assets['HeroBG.jpg']['file']}" in page
+    assert f"/assets/{built_assets['DevReadyLogo.svg']['file']}" in page
+    assert "../static/" not in page
+
+def test_serves_precompressed_variant(client, built_assets):
+    """Test that gzip clients get the precompressed file with immutable caching."""
+    name = built_assets["js/ace-editor.js"]["file"]
+    response = client.get(f"/assets/{name}", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.content_encoding == "gzip"
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    assert "Accept-Encoding" in response.vary
+    assert response.mimetype == "text/javascript"
+    with open(f"{client.application.static_folder}/js/ace-editor.js", "rb") as file:
+        assert gzip.decompress(response.get_data()) == file.read()
+
+def test_serves_identity_without_accept_encoding(client, built_assets):
+    """Test that clients without compression support get the original bytes."""
+    name = built_assets["FaviconLogo.svg"]["file"]
+    response = client.get(f"/assets/{name}", headers={"Accept-Encoding": "gzip;q=0"})
+
+    assert response.status_code == 200
+    assert response.content_encoding is None
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    assert response.get_data().startswith(b"<?xml")
+
+@pytest.mark.usefixtures("built_assets")
+def test_unknown_asset_not_found(client):
+    """Test that only fingerprinted files from the manifest are served."""
+    assert client.get("/assets/manifest.json").status_code == 404
+    assert client.get("/assets/js/ace-editor.js").status_code == 404
+
+def test_falls_back_to_static_without_build(client, app, tmp_path):
+    """Test that an unbuilt checkout links the plain static files."""
+    app.config["ASSET_BUILD_DIR"] = str(tmp_path)
+    load_manifest(app)
+
+    page = client.get("/login").get_data(as_text=True)
+    assert "/static/HeroBG.jpg" in page
+    assert "/assets/" not in page
+
+def test_serves_previous_build_after_redeploy(client, app, tmp_path):
+    """Test that a page rendered before a deploy can still load the old build's assets."""
+    static = tmp_path / "static"
+    static.mkdir()
+    build = tmp_path / "build"
+    app.config["ASSET_BUILD_DIR"] = str(build)
+    (static / "app.js").write_text("console.log('one');")
+    old = build_assets(str(static), str(build))["app.js"]["file"]
+    (static / "app.js").write_text("console.log('two');")
+    new = build_assets(str(static), str(build))["app.js"]["file"]
+    load_manifest(app)
+
+    old_response = client.get(f"/assets/{old}", headers={"Accept-Encoding": "identity"})
+    assert old_response.status_code == 200
+    assert old_response.get_data() == b"console.log('one');"
+    assert old_response.headers["Cache-Control"] == IMMUTABLE
+    assert client.get(f"/assets/{new}").get_data() == b"console.log('two');"
@@ -1,6 +1,7 @@
 """Functional tests for the code execution API."""
 import pytest
-from website.models import Question
+from website.models import Question, QuestionStats, Submission
+from website.extensions import db
 
 @pytest.mark.usefixtures("sample_data")
 def test_run_code_samples_success(client, app):
@@ -159,3 +160,44 @@ def test_submit_solution_unauthenticated(client, app):
         """
         response = client.post(f"/submit/{q1.questionID}", json={"code": code})
         assert response.status_code in (302, 401)
+
+@pytest.mark.usefixtures("sample_data")
+def test_submit_solution_updates_question_stats(client, app):
+    """Test that a submission is reflected in the question page's success rate."""
+    with app.app_context():
+        q1 = Question.query.filter_by(title="Sum Array").first()
+        code = f"""class Solution:
+            def {q1.expected_method}(self, args):
+                return sum(args)
+        """
+        client.post(f"/submit/{q1.questionID}", json={"code": code})
+        client.post(f"/submit/{q1.questionID}", json={"code": "class Solution: pass"})
+
+        stats = db.session.get(QuestionStats, q1.questionID)
+        assert (stats.attempts, stats.passes, stats.uniqueSolvers) == (2, 1, 1)
+
+        response = client.get(f"/questions/{q1.questionID}")
+        assert b"50% success rate" in response.data
+
+@pytest.mark.usefixtures("sample_data")
+def test_submit_solution_reports_usage_ranks(client, app):
+    """Test that passing submissions record runtime and memory and return their ranks."""
+    with app.app_context():
+        q1 = Question.query.filter_by(title="Sum Array").first()
+        code = f"""class Solution:
+            def {q1.expected_method}(self, args):
+                return sum(args)
+        """
+        data = client.post(f"/submit/{q1.questionID}", json={"code": code}).get_json()
+        assert data["usage"]["runtime"] >= 0
+        assert data["usage"]["memory"] > 0
+        assert data["ranks"] == {"runtime": 50.0, "memory": 50.0}
+
+        submission = Submission.query.filter_by(questionID=q1.questionID).one()
+        assert (submission.runtime, submission.memory) == (
+            data["usage"]["runtime"], data["usage"]["memory"])
+
+        failed = client.post(f"/submit/{q1.questionID}",
+                             json={"code": "class Solution: pass"}).get_json()
+        assert failed["ranks"] == {}
+        assert failed["usage"] == {"runtime": None, "memory": None}
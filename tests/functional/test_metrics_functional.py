@@ -0,0 +1,39 @@
+"""Functional tests for the /metrics endpoint."""
+import pytest
+
+def test_metrics_disabled_without_token(client):
+    """Test that the endpoint doesn't exist unless a scrape token is configured."""
+    assert client.get("/metrics").status_code == 404
+
+@pytest.mark.usefixtures("sample_data")
+def test_metrics_export(client, app):
+    """Test that request latency and SQL counts are exported to authorized scrapers."""
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    client.get("/questions")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics",
+                      headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    assert ('devready_request_duration_seconds_count{endpoint="questions.get_questions",'
+            'method="GET",status="200"') in text
+    assert 'devready_request_sql_queries_bucket{endpoint="questions.get_questions"' in text
+    assert "devready_sql_queries_total" in text
+
+def test_unhandled_errors_are_counted(client, app):
+    """Test that a view raising an exception is recorded as a 500."""
+    def fail():
+        raise RuntimeError("boom")
+    app.add_url_rule("/fail", "fail", fail)
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    with pytest.raises(RuntimeError):
+        client.get("/fail")
+
+    text = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).get_data(
+        as_text=True)
+    assert ('devready_request_duration_seconds_count{endpoint="fail",method="GET",'
+            'status="500"}') in text
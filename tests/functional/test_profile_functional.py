@@ -0,0 +1,35 @@
+"""Functional tests for the profile page."""
+import pytest
+from website.extensions import db
+from website.models import Submission
+
+@pytest.mark.usefixtures("sample_data")
+def test_profile_page_stats_and_history(client, app):
+    """Test that the profile page shows aggregate stats and a paginated history."""
+    with app.app_context():
+        db.session.add_all([
+            Submission(userID=1, questionID=1 + i % 2, code="pass",
+                       result="Passed" if i % 2 else "Failed", language="python")
+            for i in range(25)
+        ])
+        db.session.commit()
+
+    response = client.get("/profile")
+    assert response.status_code == 200
+    html = response.data.decode()
+    assert "48%" in html  # 12 of 25 submissions passed
+    assert html.count("Submitted on:") == 20
+    assert "?before=6" in html
+
+    response = client.get("/profile?before=6")
+    html = response.data.decode()
+    assert html.count("Submitted on:") == 5
+    assert "Newest" in html
+    assert "?before=" not in html
+
+@pytest.mark.usefixtures("sample_data")
+def test_profile_page_without_submissions(client):
+    """Test that the profile page renders for a user with no history."""
+    response = client.get("/profile")
+    assert response.status_code == 200
+    assert b"No submissions yet." in response.data
@@ -0,0 +1,55 @@
+"""Functional tests for the opt-in request profiler."""
+import pytest
+from werkzeug.security import generate_password_hash
+from website import create_app
+from website.extensions import db
+from website.models import User
+
+@pytest.fixture
+def profiled_client(tmp_path):
+    """A logged-in client for an app with profiling enabled."""
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SECRET_KEY": "test",
+        "PROFILER_DIR": str(tmp_path / "profiles"),
+        "PROFILER_TOKEN": "profile-secret",
+        "PROFILER_INTERVAL": 0.001,
+    })
+    with app.app_context():
+        db.session.add(User(username="admin", email="admin@example.com",
+                            passwordHash=generate_password_hash("password")))
+        db.session.commit()
+        client = app.test_client()
+        client.post("/login", data={"username": "admin", "password": "password"})
+        yield client
+        db.session.remove()
+
+def test_profiled_request_writes_dumps(profiled_client, tmp_path):
+    """Test that a request carrying the token leaves collapsed stacks and its SQL."""
+    response = profiled_client.get("/profile", headers={"X-Profile": "profile-secret"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert profile_id.endswith("main-profile")
+
+    folded = (tmp_path / "profiles" / f"{profile_id}.folded").read_text(encoding="utf-8")
+    for line in folded.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+    sql = (tmp_path / "profiles" / f"{profile_id}.sql").read_text(encoding="utf-8")
+    assert "FROM submission" in sql
+
+    response = profiled_client.get("/library?_profile=profile-secret")
+    assert response.headers["X-Profile-Id"].endswith("main-library")
+
+def test_unprofiled_requests_write_nothing(profiled_client, tmp_path):
+    """Test that requests without the right token are not profiled."""
+    assert "X-Profile-Id" not in profiled_client.get("/profile").headers
+    assert "X-Profile-Id" not in profiled_client.get(
+        "/profile", headers={"X-Profile": "guess"}).headers
+    assert not (tmp_path / "profiles").exists()
+
+def test_profiler_off_installs_no_hooks(app):
+    """Test that without configuration no profiling hooks run at all."""
+    hooks = [hook.__name__ for hook in app.before_request_funcs.get(None, [])]
+    assert "start_profile" not in hooks
@@ -0,0 +1,50 @@
+"""Query-count and latency budgets for the main endpoints over a large catalog.
+
+Each endpoint is requested twice: the first request may load the catalog snapshot,
+the second must be served with at most the warm budget. Budgets are independent of
+catalog size, so an N+1 regression blows through them immediately.
+"""
+import pytest
+
+# URL -> (first request, repeat request) statement budgets. First requests also load the
+# user's identity and, for catalog reads, the three-query snapshot.
+BUDGETS = {
+    "/": (12, 3),
+    "/library": (4, 0),
+    "/questions": (4, 0),
+    "/questions?status=unattempted&tag=topic-3": (5, 1),
+    "/questions/tags?tag=topic-5": (4, 0),
+    "/questions/5": (5, 1),
+    "/questions/search?q=problem": (4, 0),
+    "/profile": (4, 3),
+    "/profile?before=4000": (4, 3),
+}
+# Generous wall-clock ceiling per request: catches pathological slowdowns, not noise.
+LATENCY_BUDGET = 1.0
+
+@pytest.mark.usefixtures("large_catalog")
+@pytest.mark.parametrize("url", BUDGETS)
+def test_endpoint_query_budget(client, count_queries, url):
+    """Test that an endpoint stays within its statement and latency budgets."""
+    first_budget, repeat_budget = BUDGETS[url]
+    with count_queries() as first:
+        response = client.get(url)
+    assert response.status_code == 200
+    with count_queries() as repeat:
+        assert client.get(url).status_code == 200
+
+    assert first.count <= first_budget, first.statements
+    assert repeat.count <= repeat_budget, repeat.statements
+    assert max(first.elapsed, repeat.elapsed) < LATENCY_BUDGET
+
+@pytest.mark.usefixtures("large_catalog")
+def test_large_catalog_is_served_in_full(client):
+    """Test that the budgets above were measured against the whole seeded catalog."""
+    listed, url = 0, "/questions?limit=200"
+    while url:
+        response = client.get(url)
+        listed += len(response.json)
+        cursor = response.headers.get("X-Next-Cursor")
+        url = cursor and f"/questions?limit=200&after={cursor}"
+    assert listed == 402
+    assert client.get("/library").data.count(b"Catalog 399") >= 1
@@ -1,6 +1,6 @@
 """Functional tests for the questions API endpoints."""
 import pytest
-from website.models import Question, TestCase, QuestionTag
+from website.models import Question, TestCase, QuestionTag, Tag, Submission
 from website.extensions import db
 
 @pytest.mark.usefixtures("sample_data")
@@ -98,11 +98,8 @@ def test_get_all_questions_empty_db(client, app) -> None:
 @pytest.mark.usefixtures("sample_data")
 def test_get_all_questions_db_error(client, mocker):
     """Test database error handling when getting all questions."""
-    mock = mocker.patch(
-        'website.models.Question.query',
-        new_callable=mocker.PropertyMock
-    )
-    mock.return_value.all.side_effect = Exception("Database error")
+    mocker.patch('website.catalog.load_question_records',
+                 side_effect=Exception("Database error"))
 
     response = client.get("/questions")
     assert response.status_code == 500
@@ -112,11 +109,8 @@ def test_get_all_questions_db_error(client, mocker):
 @pytest.mark.usefixtures("sample_data")
 def test_get_question_by_id_db_error(client, mocker):
     """Test database error handling when getting question by ID."""
-    mock = mocker.patch(
-        'website.models.Question.query',
-        new_callable=mocker.PropertyMock
-    )
-    mock.return_value.get.side_effect = Exception("Database error")
+    mocker.patch('website.questions.get_question_record',
+                 side_effect=Exception("Database error"))
 
     response = client.get("/questions/1")
     assert response.status_code == 500
@@ -126,12 +120,8 @@ def test_get_question_by_id_db_error(client, mocker):
 @pytest.mark.usefixtures("sample_data")
 def test_get_questions_by_tag_db_error(client, mocker):
     """Test database error handling when getting questions by tag."""
-    mock_query = mocker.MagicMock()
-    mock_query.join.return_value = mock_query
-    mock_query.filter.return_value = mock_query
-    mock_query.all.side_effect = Exception("Database error")
-
-    mocker.patch('website.questions.Question.query', mock_query)
+    mocker.patch('website.catalog.load_question_records',
+                 side_effect=Exception("Database error"))
 
     response = client.get("/questions/tags?tag=arrays")
     assert response.status_code == 500
@@ -149,7 +139,7 @@ def test_get_questions_by_tag_empty_result(client) -> None:
 def test_get_questions_malformed_json(client, mocker):
     """Test handling of malformed JSON in question data."""
     mocker.patch(
-        'website.models.Question.to_dict',
+        'website.catalog.serialize_record',
         side_effect=Exception("JSON error")
     )
     response = client.get("/questions")
@@ -194,3 +184,156 @@ def test_library_page(client):
     # Check if question titles appear in the response
     assert b"Sum Array" in response.data
     assert b"Reverse String" in response.data
+
+def add_catalog(count):
+    """Adds `count` questions, each with two tags and a sample and hidden test case."""
+    tags = [Tag(name=f"tag-{i}") for i in range(5)]
+    db.session.add_all(tags)
+    db.session.flush()
+    for i in range(count):
+        question = Question(title=f"Catalog {i}", description="...", difficulty="Easy")
+        db.session.add(question)
+        db.session.flush()
+        db.session.add_all([
+            QuestionTag(questionID=question.questionID, tagID=tags[i % 5].tagID),
+            QuestionTag(questionID=question.questionID, tagID=tags[(i + 1) % 5].tagID),
+            TestCase(questionID=question.questionID, inputData="[1]",
+                     expectedOutput="1", isSample=True),
+            TestCase(questionID=question.questionID, inputData="[2]",
+                     expectedOutput="2", isSample=False),
+        ])
+    db.session.commit()
+
+@pytest.mark.usefixtures("sample_data")
+def test_get_questions_query_count_is_constant(client, app, count_queries):
+    """Test that listing questions issues a fixed number of queries regardless of size."""
+    with app.app_context():
+        add_catalog(40)
+        db.session.expire_all()
+
+        with count_queries() as counter:
+            response = client.get("/questions")
+        assert response.status_code == 200
+        assert len(response.json) == 42
+        assert response.json[-1]["tags"] == ["tag-4", "tag-0"]
+        assert response.json[-1]["sample_test_cases"] == [{"input": "[1]", "expected_output": "1"}]
+        assert counter.count <= 4
+
+        db.session.expire_all()
+        with count_queries() as counter:
+            response = client.get("/questions/tags?tag=tag-1")
+        assert len(response.json) == 16
+        assert counter.count <= 4
+
+@pytest.mark.usefixtures("sample_data")
+def test_get_questions_keyset_pagination(client, app):
+    """Test that pages follow the questionID cursor without gaps or repeats."""
+    with app.app_context():
+        add_catalog(5)
+
+    response = client.get("/questions?limit=3")
+    assert [q["questionID"] for q in response.json] == [1, 2, 3]
+    assert response.headers["X-Next-Cursor"] == "3"
+    assert "after=3" in response.headers["Link"]
+
+    response = client.get("/questions?limit=3&after=3")
+    assert [q["questionID"] for q in response.json] == [4, 5, 6]
+
+    response = client.get("/questions?limit=3&after=6")
+    assert [q["questionID"] for q in response.json] == [7]
+    assert "X-Next-Cursor" not in response.headers
+
+@pytest.mark.usefixtures("sample_data")
+def test_get_questions_filters(client, app):
+    """Test difficulty, multi-tag and attempted/unattempted filters."""
+    with app.app_context():
+        db.session.add(Question(title="Hard One", description="...", difficulty="Hard"))
+        db.session.add(Submission(userID=1, questionID=2, code="pass", result="Failed",
+                                  language="python"))
+        db.session.commit()
+
+    response = client.get("/questions?difficulty=hard")
+    assert [q["title"] for q in response.json] == ["Hard One"]
+
+    response = client.get("/questions?tag=arrays&tag=strings")
+    assert [q["title"] for q in response.json] == ["Reverse String"]
+
+    response = client.get("/questions?tag=arrays,strings")
+    assert [q["title"] for q in response.json] == ["Reverse String"]
+
+    response = client.get("/questions?status=attempted")
+    assert [q["title"] for q in response.json] == ["Reverse String"]
+
+    response = client.get("/questions?status=unattempted")
+    assert [q["title"] for q in response.json] == ["Sum Array", "Hard One"]
+
+@pytest.mark.usefixtures("sample_data")
+def test_get_questions_field_projection(client, count_queries):
+    """Test that projected listings are served from the loaded snapshot without any query."""
+    client.get("/questions")
+    with count_queries() as counter:
+        response = client.get("/questions?fields=title,difficulty,tags")
+    assert response.status_code == 200
+    assert response.json[0] == {"questionID": 1, "title": "Sum Array", "difficulty": "easy",
+                                "tags": ["arrays"]}
+    assert counter.count == 0
+
+@pytest.mark.usefixtures("sample_data")
+def test_get_questions_invalid_args(client):
+    """Test that malformed listing arguments are rejected."""
+    assert client.get("/questions?fields=password").status_code == 400
+    assert client.get("/questions?limit=abc").status_code == 400
+    assert client.get("/questions?limit=0").status_code == 400
+    assert client.get("/questions?status=maybe").status_code == 400
+
+@pytest.mark.usefixtures("sample_data")
+def test_next_question_all_attempted(client, app):
+    """Test that the main page renders when every question has been attempted."""
+    with app.app_context():
+        db.session.add_all([
+            Submission(userID=1, questionID=question_id, code="pass", result="Passed",
+                       language="python")
+            for question_id in (1, 2)
+        ])
+        db.session.commit()
+
+    response = client.get('/')
+    assert response.status_code == 200
+    assert b"Question Unavailable" in response.data
+
+@pytest.mark.usefixtures("sample_data")
+def test_library_page_is_cached_until_catalog_changes(client, app, count_queries):
+    """Test that repeat library views skip catalog queries until a question is added."""
+    client.get("/library")
+    with count_queries() as counter:
+        response = client.get("/library")
+    assert b"Sum Array" in response.data
+    assert not any("question" in statement for statement in counter.statements)
+
+    with app.app_context():
+        question = Question(title="Brand New", description="...", difficulty="Medium")
+        db.session.add(question)
+        db.session.commit()
+        db.session.add(QuestionTag(questionID=question.questionID, tagID=1))
+        db.session.commit()
+
+    assert b"Brand New" in client.get("/library").data
+
+@pytest.mark.usefixtures("sample_data")
+def test_search_questions(client, count_queries):
+    """Test ranked, paginated search served from the index without catalog queries."""
+    response = client.get("/questions/search?q=arrays")
+    assert response.status_code == 200
+    assert response.json["total"] == 2
+    assert [r["title"] for r in response.json["results"]] == ["Sum Array", "Reverse String"]
+    assert response.json["results"][0]["tags"] == ["arrays"]
+
+    with count_queries() as counter:
+        response = client.get("/questions/search?q=arrays&limit=1&offset=1")
+    assert [r["title"] for r in response.json["results"]] == ["Reverse String"]
+    assert not any("question" in statement for statement in counter.statements)
+
+    assert client.get("/questions/search").status_code == 400
+    assert client.get("/questions/search?q=x&limit=abc").status_code == 400
+    assert client.get("/questions/search?q=x&limit=0").status_code == 400
+    assert client.get("/questions/search?q=x&limit=-5").status_code == 400
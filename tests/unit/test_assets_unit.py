@@ -0,0 +1,50 @@
+"""Unit tests for the static asset build."""
+import gzip
+import json
+from website.assets import build_assets, fingerprint
+
+def test_build_fingerprints_and_compresses(tmp_path):
+    """Test that files get content-hashed names, smaller gzip variants and a manifest."""
+    static = tmp_path / "static"
+    (static / "js").mkdir(parents=True)
+    script = b"function hint() { return 'hint'; }\n" * 50
+    (static / "js" / "app.js").write_bytes(script)
+    (static / "hero.jpg").write_bytes(b"\xff\xd8 not really a jpeg")
+    build = tmp_path / "build"
+
+    manifest = build_assets(str(static), str(build))
+
+    script_entry = manifest["js/app.js"]
+    assert script_entry["file"] == fingerprint("js/app.js", script)
+    assert script_entry["file"].startswith("js/app.") and script_entry["file"].endswith(".js")
+    assert "gzip" in script_entry["encodings"]
+    assert (build / script_entry["file"]).read_bytes() == script
+    assert gzip.decompress((build / (script_entry["file"] + ".gz")).read_bytes()) == script
+    assert manifest["hero.jpg"]["encodings"] == []
+    written = json.loads((build / "manifest.json").read_text())
+    assert written["assets"] == manifest
+    assert written["files"][script_entry["file"]] == script_entry
+
+def test_fingerprint_changes_with_content():
+    """Test that a changed file gets a new name and an unchanged one keeps it."""
+    assert fingerprint("a.js", b"one") == fingerprint("a.js", b"one")
+    assert fingerprint("a.js", b"one") != fingerprint("a.js", b"two")
+
+def test_rebuild_keeps_earlier_files(tmp_path):
+    """Test that a rebuild lists the previous build's files unless their copies are gone."""
+    static = tmp_path / "static"
+    static.mkdir()
+    build = tmp_path / "build"
+    (static / "app.js").write_text("one")
+    (static / "site.css").write_text("body {}")
+    first = build_assets(str(static), str(build))
+    (static / "app.js").write_text("two")
+    (build / first["site.css"]["file"]).unlink()
+    (static / "site.css").write_text("p {}")
+
+    second = build_assets(str(static), str(build))
+
+    files = json.loads((build / "manifest.json").read_text())["files"]
+    assert second["app.js"]["file"] != first["app.js"]["file"]
+    assert {first["app.js"]["file"], second["app.js"]["file"]} <= set(files)
+    assert first["site.css"]["file"] not in files
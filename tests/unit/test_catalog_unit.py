@@ -0,0 +1,129 @@
+"""Unit tests for the versioned in-process catalog cache."""
+import pytest
+from website.catalog import (GENERATION_KEY, bump_catalog_version, cached, catalog_version, get_library,
+                             get_question_record, get_snapshot, require_shared_cache)
+from website import create_app
+from website.extensions import cache, db
+from website.models import Question, QuestionTag, Submission, TestCase
+
+@pytest.mark.usefixtures("sample_data")
+def test_catalog_writes_bump_version(app):
+    """Test that committing catalog rows bumps the version and other rows do not."""
+    with app.app_context():
+        version = catalog_version()
+
+        db.session.add(Submission(userID=1, questionID=1, code="pass", result="Passed",
+                                  language="python"))
+        db.session.commit()
+        assert catalog_version() == version
+
+        db.session.add(Question(title="New", description="...", difficulty="Easy"))
+        db.session.commit()
+        assert catalog_version() == version + 1
+
+        QuestionTag.query.filter_by(questionID=1).delete()
+        db.session.commit()
+        assert catalog_version() == version + 2
+
+def test_rolled_back_writes_do_not_bump(app):
+    """Test that a rolled-back catalog change leaves the version alone."""
+    with app.app_context():
+        version = catalog_version()
+        db.session.add(Question(title="Draft", description="...", difficulty="Easy"))
+        db.session.flush()
+        db.session.rollback()
+        assert catalog_version() == version
+
+def test_cached_rebuilds_only_after_bump(app):
+    """Test that cached values are reused until the version changes."""
+    builds = []
+    with app.app_context():
+        assert cached("key", lambda: builds.append(1) or len(builds)) == 1
+        assert cached("key", lambda: builds.append(1) or len(builds)) == 1
+        bump_catalog_version()
+        assert cached("key", lambda: builds.append(1) or len(builds)) == 2
+
+@pytest.mark.usefixtures("sample_data")
+def test_cached_follows_other_workers_changes(app, client):
+    """Test that cached pages rebuild when another worker changes the catalog."""
+    with app.app_context():
+        assert b"Sum Array" in client.get("/library").data
+        version = catalog_version()
+        # Another worker renames the question and bumps only the shared generation.
+        db.session.execute(db.update(Question).where(Question.questionID == 1)
+                           .values(title="Renamed"))
+        db.session.info.pop("catalog_changed", None)
+        db.session.commit()
+        cache.set(GENERATION_KEY, "from-another-worker", timeout=0)
+
+        assert catalog_version() == version
+        assert b"Renamed" in client.get("/library").data
+        assert get_library()["arrays"][0].title == "Renamed"
+
+@pytest.mark.usefixtures("sample_data")
+def test_library_includes_tag_names(app):
+    """Test that library summaries carry every tag name of the question."""
+    with app.app_context():
+        library = get_library()
+        assert [q.title for q in library["strings"]] == ["Reverse String"]
+        assert library["strings"][0].tag_names == ("arrays", "strings")
+
+@pytest.mark.usefixtures("sample_data")
+def test_snapshot_serves_catalog_reads(app, count_queries):
+    """Test that the snapshot loads in three queries and then serves reads without any."""
+    with app.app_context():
+        with count_queries() as counter:
+            snapshot = get_snapshot()
+        assert counter.count == 3
+
+        with count_queries() as counter:
+            assert get_snapshot() is snapshot
+            record = get_question_record(1)
+            assert get_question_record(9999) is None
+        assert counter.count == 0
+        assert record.tag_names == ("arrays",)
+        assert [tc.isSample for tc in record.testCases] == [True, False]
+        assert snapshot.by_tag["strings"] == (2,)
+        assert '"title": "Sum Array"' in snapshot.listing_json[1]
+        with pytest.raises(TypeError):
+            snapshot.by_id[3] = record
+
+@pytest.mark.usefixtures("sample_data")
+def test_snapshot_swapped_on_write(app):
+    """Test that committing a catalog change swaps in a fresh snapshot."""
+    with app.app_context():
+        old = get_snapshot()
+        assert len(get_question_record(1).testCases) == 2
+        db.session.add(TestCase(questionID=1, inputData="[]", expectedOutput="0"))
+        db.session.commit()
+
+        assert get_snapshot() is not old
+        assert len(get_question_record(1).testCases) == 3
+        assert len(old.by_id[1].testCases) == 2
+
+@pytest.mark.usefixtures("sample_data")
+def test_snapshot_follows_shared_generation(app):
+    """Test that a change announced by another worker through the cache is picked up."""
+    with app.app_context():
+        old = get_snapshot()
+        cache.set(GENERATION_KEY, "from-another-worker", timeout=0)
+        assert get_snapshot().generation == "from-another-worker"
+        assert get_snapshot() is not old
+
+def test_require_shared_cache(app):
+    """Test that several workers are refused a process-local cache."""
+    require_shared_cache(app, 1)
+    with pytest.raises(RuntimeError, match="REDIS_URL"):
+        require_shared_cache(app, 4)
+    app.config["CACHE_TYPE"] = "flask_caching.backends.RedisCache"
+    require_shared_cache(app, 4)
+
+def test_redis_url_builds_app(monkeypatch, tmp_path):
+    """Test that REDIS_URL configures a Redis cache that passes the multi-worker check."""
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:6379/0")
+    monkeypatch.setenv("JAWSDB_URL", f"sqlite:///{tmp_path / 'redis.db'}")
+    redis_app = create_app()
+
+    backend = redis_app.extensions["cache"][cache]
+    assert type(backend).__name__ == "RedisCache"
+    require_shared_cache(redis_app, 4)
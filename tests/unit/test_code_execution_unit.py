@@ -1,6 +1,6 @@
 """Unit tests for code execution API."""
 import subprocess
-from website.code_execution import execute_code
+from website.code_execution import execute_code, execute_code_with_test, startup_baseline
 
 def test_python_execution(mock_subprocess_run):
     """Test Python code execution returns expected output."""
@@ -20,3 +20,36 @@ def test_execution_timeout(mock_subprocess_run):
 
     assert rc == 1
     assert "Execution timed out" in output
+
+def test_usage_is_measured_outside_the_solution(mocker):
+    """Test that solution code cannot fake its runtime or memory."""
+    mocker.patch("website.code_execution.startup_baseline", return_value=0)
+    code = (
+        "import atexit, os\n"
+        "time.perf_counter = lambda: 0.0\n"
+        "for fd in range(3, 64):\n"
+        "    try:\n"
+        "        os.write(fd, b'0 1 1')\n"
+        "    except OSError:\n"
+        "        pass\n"
+        "atexit.register(lambda: sys.stderr.write("
+        "'__devready_stats__ {\"runtime\": 1, \"memory\": 1}\\n'))\n"
+        "class Solution:\n"
+        "    def solve(self, args):\n"
+        "        return sum(args)\n"
+    )
+    usage = {"runtime": 0, "memory": None}
+    assert execute_code_with_test(code, "[1, 2, 3]", "solve", usage) == 6
+    assert usage["runtime"] > 1
+    assert usage["memory"] > 1
+
+def test_runtime_excludes_interpreter_startup():
+    """Test that a trivial solution's runtime is a small fraction of a bare process run."""
+    startup_baseline.cache_clear()
+    baseline = startup_baseline()
+    code = "class Solution:\n    def solve(self, args):\n        return sum(args)\n"
+    usage = {"runtime": 0, "memory": None}
+
+    assert execute_code_with_test(code, "[1, 2]", "solve", usage) == 3
+    assert baseline > 0
+    assert usage["runtime"] < baseline
@@ -0,0 +1,110 @@
+"""Unit tests for the local static complexity analyzer."""
+from website.complexity import analyze_complexity, format_complexity
+
+def test_nested_loops_are_quadratic():
+    """Test that two nested loops are estimated as O(n^2) time and O(1) space."""
+    code = """class Solution:
+    def twoSum(self, nums, target):
+        for i in range(len(nums)):
+            for j in range(i + 1, len(nums)):
+                if nums[i] + nums[j] == target:
+                    return [i, j]
+"""
+    result = analyze_complexity(code)
+    assert result["time_complexity"] == "O(n^2)"
+    assert result["space_complexity"] == "O(1)"
+
+def test_hash_map_in_loop_is_linear_space():
+    """Test that filling a dict inside a loop is estimated as O(n) space."""
+    code = """class Solution:
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, n in enumerate(nums):
+            if target - n in seen:
+                return [seen[target - n], i]
+            seen[n] = i
+"""
+    result = analyze_complexity(code)
+    assert result["time_complexity"] == "O(n)"
+    assert result["space_complexity"] == "O(n)"
+
+def test_branching_recursion_is_exponential():
+    """Test that unmemoized branching recursion is flagged as exponential."""
+    code = """class Solution:
+    def fib(self, n):
+        if n < 2:
+            return n
+        return self.fib(n - 1) + self.fib(n - 2)
+"""
+    result = analyze_complexity(code)
+    assert result["time_complexity"] == "O(2^n)"
+    assert result["signals"]["recursive_functions"] == ["fib"]
+
+def test_memoized_recursion_is_linear():
+    """Test that lru_cache turns branching recursion into linear time."""
+    code = """import functools
+@functools.lru_cache(None)
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+"""
+    result = analyze_complexity(code)
+    assert result["time_complexity"] == "O(n)"
+    assert result["signals"]["memoized"] == ["fib"]
+
+def test_sorting_and_binary_search():
+    """Test that sorting is n log n and a halving while loop is logarithmic."""
+    assert analyze_complexity("def f(a):\n    return sorted(a)[0]\n")["time_complexity"] == \
+        "O(n log n)"
+    code = """def search(a, t):
+    lo, hi = 0, len(a) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if a[mid] < t:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return lo
+"""
+    assert analyze_complexity(code)["time_complexity"] == "O(log n)"
+
+def test_unparseable_code_returns_none():
+    """Test that syntax errors return None so callers can fall back to the LLM."""
+    assert analyze_complexity("def f(:\n") is None
+
+def test_format_complexity():
+    """Test formatting of complexity classes."""
+    assert format_complexity(0) == "O(1)"
+    assert format_complexity(1, 1) == "O(n log n)"
+    assert format_complexity(3) == "O(n^3)"
+
+def test_tree_traversal_is_linear():
+    """Test that recursing once per child in a loop is a linear traversal, not branching."""
+    code = """class Solution:
+    def count(self, node):
+        total = 1
+        for child in node.children:
+            total += self.count(child)
+        return total
+"""
+    result = analyze_complexity(code)
+    assert result["time_complexity"] == "O(n)"
+    assert result["space_complexity"] == "O(n)"
+
+def test_recursive_binary_search_is_logarithmic():
+    """Test that recursion into one half of the range is O(log n), not branching."""
+    code = """def search(a, t, lo, hi):
+    if lo > hi:
+        return -1
+    mid = (lo + hi) // 2
+    if a[mid] == t:
+        return mid
+    if a[mid] < t:
+        return search(a, t, mid + 1, hi)
+    return search(a, t, lo, mid - 1)
+"""
+    result = analyze_complexity(code)
+    assert result["time_complexity"] == "O(log n)"
+    assert result["space_complexity"] == "O(log n)"
+    assert result["signals"]["recursive_functions"] == ["search"]
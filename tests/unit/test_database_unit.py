@@ -0,0 +1,85 @@
+"""Unit tests for the database engine profile and read-replica routing."""
+import pytest
+from flask import g
+from sqlalchemy import insert, select, func
+from werkzeug.security import generate_password_hash
+from website import create_app
+from website.database import REPLICA_BIND, database_url, engine_options, use_primary
+from website.extensions import db
+from website.models import Question, QuestionTag, Tag, User
+
+def test_database_url_driver():
+    """Test that JawsDB URLs are rewritten to the configured MySQL driver."""
+    assert database_url("mysql://u:p@host/db", "pymysql") == "mysql+pymysql://u:p@host/db"
+    assert database_url("mysql://u:p@host/db", "mysqldb") == "mysql+mysqldb://u:p@host/db"
+    assert database_url("sqlite:///devready.db") == "sqlite:///devready.db"
+    assert database_url(None) is None
+    with pytest.raises(ValueError):
+        database_url("mysql://host/db", "oracle")
+
+def test_engine_options():
+    """Test pool settings for MySQL and defaults for SQLite."""
+    options = engine_options("mysql+mysqldb://host/db",
+                             {"DB_POOL_SIZE": "3", "DB_POOL_PRE_PING": "false"})
+    assert options == {"pool_size": 3, "max_overflow": 10, "pool_timeout": 30,
+                       "pool_recycle": 280, "pool_pre_ping": False}
+    assert engine_options("sqlite:///devready.db", {}) == {}
+
+@pytest.fixture
+def replica_app(tmp_path):
+    """An app whose primary and replica are separate SQLite files with the same schema."""
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+        "SQLALCHEMY_BINDS": {REPLICA_BIND: f"sqlite:///{tmp_path / 'replica.db'}"},
+        "SECRET_KEY": "test",
+    })
+    with app.app_context():
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+        user = {"username": "reader", "email": "reader@example.com",
+                "passwordHash": generate_password_hash("password")}
+        db.session.add(User(**user))
+        db.session.commit()
+        with db.engines[REPLICA_BIND].begin() as connection:
+            connection.execute(insert(User.__table__), user)
+            connection.execute(insert(Question.__table__), {
+                "title": "Replica Only", "description": "...", "difficulty": "Easy"})
+            connection.execute(insert(Tag.__table__), {"name": "arrays"})
+            connection.execute(insert(QuestionTag.__table__), {"questionID": 1, "tagID": 1})
+        yield app
+        db.session.remove()
+        # init_app registers a metadata per bind on the shared extension object.
+        db.metadatas.pop(REPLICA_BIND, None)
+
+def test_read_only_views_use_replica(replica_app):
+    """Test that marked requests read from the replica unless the primary is forced."""
+    with replica_app.test_request_context():
+        g.use_replica = True
+        assert db.session.scalars(select(Question.title)).all() == ["Replica Only"]
+        with use_primary():
+            assert db.session.scalars(select(Question.title)).all() == []
+        assert g.use_replica
+
+def test_catalog_snapshot_loads_from_primary(replica_app):
+    """Test that a snapshot built during a replica-routed view comes from the primary."""
+    with replica_app.app_context():
+        db.session.add(Question(title="Primary", description="...", difficulty="Easy"))
+        db.session.commit()
+
+    client = replica_app.test_client()
+    client.post("/login", data={"username": "reader", "password": "password"})
+    response = client.get("/questions")
+    assert [q["title"] for q in response.get_json()] == ["Primary"]
+    assert b"Replica Only" not in client.get("/library").data
+
+def test_writes_go_to_primary(replica_app):
+    """Test that flushes inside a replica-routed request still reach the primary."""
+    with replica_app.test_request_context():
+        g.use_replica = True
+        db.session.add(Question(title="Written", description="...", difficulty="Easy"))
+        db.session.commit()
+        assert db.session.scalar(select(func.count(Question.questionID))) == 1
+
+        g.use_replica = False
+        titles = db.session.scalars(select(Question.title)).all()
+        assert titles == ["Written"]
@@ -0,0 +1,62 @@
+"""Unit tests for per-question usage distributions."""
+from website import distributions
+from website.distributions import BUCKET_COUNT, LogHistogram, get_rank, record_usage
+from website.extensions import db
+from website.models import Question
+
+def test_histogram_buckets_and_rank():
+    """Test log-scale bucketing, percentile ranks and merging."""
+    assert LogHistogram.bucket(0) == 0
+    assert LogHistogram.bucket(2) == 4
+    assert LogHistogram.bucket(10 ** 30) == BUCKET_COUNT - 1
+
+    histogram = LogHistogram()
+    assert histogram.rank(5) is None
+    for value in (100, 200, 400, 800):
+        histogram.add(value)
+    assert histogram.rank(50) == 100.0
+    assert histogram.rank(100) == 87.5
+    assert histogram.rank(1000) == 0.0
+
+    other = LogHistogram()
+    other.add(100)
+    histogram.merge(other)
+    assert histogram.total == 5
+    assert LogHistogram.from_bytes(histogram.to_bytes()).counts == histogram.counts
+    assert len(histogram.to_bytes()) == BUCKET_COUNT * 4
+
+def test_record_usage(app):
+    """Test that usage accumulates in stored histograms and ranks are returned."""
+    with app.app_context():
+        question = Question(title="Q", description="...", difficulty="Easy")
+        db.session.add(question)
+        db.session.commit()
+
+        assert record_usage(question.questionID, {"runtime": 1000, "memory": 2048}) == {
+            "runtime": 50.0, "memory": 50.0}
+        db.session.commit()
+        ranks = record_usage(question.questionID, {"runtime": 100, "memory": None})
+        db.session.commit()
+
+        assert ranks == {"runtime": 75.0}
+        assert get_rank(question.questionID, "runtime", 5000) == 0.0
+        assert get_rank(question.questionID, "memory", 1) == 100.0
+        assert get_rank(question.questionID + 1, "runtime", 1) is None
+
+def test_first_usage_tolerates_concurrent_row(app, mocker):
+    """Test that rows created by another worker after our lookup are merged into, not re-added."""
+    with app.app_context():
+        question = Question(title="Q", description="...", difficulty="Easy")
+        db.session.add(question)
+        db.session.commit()
+        record_usage(question.questionID, {"runtime": 1000, "memory": 2048})
+        db.session.commit()
+        real_rows = distributions._locked_rows  # pylint: disable=protected-access
+        # The first lookup misses, as if the other worker's insert had not committed yet.
+        mocker.patch("website.distributions._locked_rows",
+                     side_effect=[{}, real_rows(question.questionID)])
+
+        assert record_usage(question.questionID, {"runtime": 1000, "memory": 2048}) == {
+            "runtime": 50.0, "memory": 50.0}
+        db.session.commit()
+        assert get_rank(question.questionID, "runtime", 10) == 100.0
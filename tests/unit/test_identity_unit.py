@@ -0,0 +1,50 @@
+"""Unit tests for cached user identities."""
+import pytest
+from website.extensions import db
+from website.identity import IdentityCache, UserIdentity, load_identity
+from website.models import User
+
+@pytest.mark.usefixtures("sample_data")
+def test_authenticated_requests_skip_user_query(client, count_queries):
+    """Test that only the first request after login loads the user row."""
+    client.get("/settings")
+    with count_queries() as counter:
+        response = client.get("/settings")
+    assert response.status_code == 200
+    assert b"testuser" in response.data
+    assert not any("FROM user" in statement for statement in counter.statements)
+
+@pytest.mark.usefixtures("sample_data")
+def test_identity_invalidated_on_user_change(app):
+    """Test that committing a change to a user drops their cached identity."""
+    with app.app_context():
+        user = User.query.filter_by(username="testuser").one()
+        assert load_identity(user.userID).username == "testuser"
+        user.username = "renamed"
+        db.session.commit()
+        identity = load_identity(user.userID)
+        assert identity.username == "renamed"
+        assert identity.load() is user
+
+        User.query.filter_by(userID=user.userID).update({"username": "bulk"})
+        db.session.commit()
+        assert load_identity(user.userID).username == "bulk"
+
+def test_identity_cache_expiry_and_eviction(mocker):
+    """Test that entries expire after the TTL and the least recently used is evicted."""
+    clock = mocker.patch("website.identity.time.monotonic", return_value=100.0)
+    cache = IdentityCache(ttl=10, size=2)
+    for user_id in (1, 2):
+        cache.put(user_id, UserIdentity(user_id, f"user{user_id}", "e@x.com"))
+    assert cache.get(1).username == "user1"
+    cache.put(3, UserIdentity(3, "user3", "e@x.com"))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+
+    clock.return_value = 111.0
+    assert cache.get(1) is None
+
+def test_unknown_user(app):
+    """Test that an unknown user ID logs nobody in."""
+    with app.app_context():
+        assert load_identity(404) is None
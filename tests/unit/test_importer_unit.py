@@ -0,0 +1,152 @@
+"""Unit tests for the streaming question importer."""
+import json
+import pytest
+from website.catalog import catalog_version
+from website.extensions import db
+from website.importer import CatalogImportError, import_questions
+from website.models import Question, RecommendationQueue, Tag, TestCase
+
+def write_jsonl(path, rows):
+    """Writes rows as JSON Lines."""
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8")
+
+def question_row(title, tags=("Array",), tests=1):
+    """Builds an importable question record."""
+    return {"title": title, "description": f"Solve {title}.", "difficulty": "Easy",
+            "expected_method": "solve", "tags": list(tags),
+            "test_cases": [{"input": [i], "expected_output": i, "is_sample": i == 0}
+                           for i in range(tests)]}
+
+def test_import_jsonl_in_batches(app, tmp_path, count_queries):
+    """Test that a JSON Lines file is imported with a bounded number of statements."""
+    source = tmp_path / "questions.jsonl"
+    write_jsonl(source, [question_row(f"Q{i}", tags=("Array", f"T{i % 3}"), tests=5)
+                         for i in range(40)])
+    with app.app_context():
+        version = catalog_version()
+        with count_queries() as counter:
+            counts = import_questions(str(source), batch_size=10)
+
+        assert counts == {"created": 40, "updated": 0, "test_cases": 200}
+        assert counter.count < 60
+        assert Question.query.count() == 40
+        assert Tag.query.count() == 4
+        question = Question.query.filter_by(title="Q7").one()
+        assert sorted(question.tags, key=lambda tag: tag.name)[0].name == "Array"
+        assert [(tc.inputData, tc.expectedOutput, tc.isSample) for tc in question.testCases][:2] \
+            == [("[0]", "0", True), ("[1]", "1", False)]
+        assert catalog_version() > version
+
+def test_import_upserts_by_title(app, tmp_path):
+    """Test that re-importing a title replaces its fields, tags and test cases."""
+    source = tmp_path / "questions.jsonl"
+    write_jsonl(source, [question_row("Two Sum", tests=3)])
+    with app.app_context():
+        import_questions(str(source))
+        updated = question_row("Two Sum", tags=("Hash Table",), tests=1)
+        updated["difficulty"] = "Medium"
+        write_jsonl(source, [updated, question_row("New One")])
+        db.session.add(RecommendationQueue(userID=1, questionID=1, rank=0))
+        db.session.commit()
+
+        counts = import_questions(str(source))
+        db.session.expire_all()
+
+        assert counts == {"created": 1, "updated": 1, "test_cases": 2}
+        question = Question.query.filter_by(title="Two Sum").one()
+        assert question.difficulty == "Medium"
+        assert [tag.name for tag in question.tags] == ["Hash Table"]
+        assert TestCase.query.filter_by(questionID=question.questionID).count() == 1
+        assert RecommendationQueue.query.count() == 0
+
+def test_import_bundle_directory(app, tmp_path):
+    """Test that bundles stream their hidden test files alongside loose JSON Lines files."""
+    bundle = tmp_path / "graph"
+    bundle.mkdir()
+    (bundle / "question.json").write_text(json.dumps(question_row("Graph", tests=1)))
+    write_jsonl(bundle / "tests.jsonl",
+                [{"input": "[1, 2]", "expected_output": "3"} for _ in range(25)])
+    write_jsonl(tmp_path / "extra.jsonl", [question_row("Extra")])
+    with app.app_context():
+        counts = import_questions(str(tmp_path), batch_size=10)
+
+        assert counts == {"created": 2, "updated": 0, "test_cases": 27}
+        graph = Question.query.filter_by(title="Graph").one()
+        assert len(graph.testCases) == 26
+        assert graph.testCases[-1].inputData == "[1, 2]"
+
+def test_import_reports_bad_lines(app, tmp_path):
+    """Test that malformed records name the file and line and keep earlier batches."""
+    source = tmp_path / "questions.jsonl"
+    source.write_text(json.dumps(question_row("Good")) + "\n"
+                      + json.dumps({"title": "Bad"}) + "\n", encoding="utf-8")
+    with app.app_context():
+        with pytest.raises(CatalogImportError, match=r"questions.jsonl:2: missing description"):
+            import_questions(str(source), batch_size=1)
+        assert [q.title for q in Question.query] == ["Good"]
+
+def test_import_rejects_non_objects(app, tmp_path):
+    """Test that a non-object record fails cleanly without touching queues or caches."""
+    source = tmp_path / "questions.jsonl"
+    write_jsonl(source, [["not", "an", "object"]])
+    with app.app_context():
+        db.session.add(Question(title="Kept", description="...", difficulty="Easy"))
+        db.session.commit()
+        db.session.add(RecommendationQueue(userID=1, questionID=1, rank=0))
+        db.session.commit()
+        version = catalog_version()
+
+        with pytest.raises(CatalogImportError, match=r"questions.jsonl:1: expected a JSON object"):
+            import_questions(str(source))
+        assert RecommendationQueue.query.count() == 1
+        assert catalog_version() == version
+
+        write_jsonl(source, [{**question_row("Bad Tests"), "test_cases": ["[1]"]}])
+        with pytest.raises(CatalogImportError, match="test case must be a JSON object"):
+            import_questions(str(source))
+
+def test_import_parses_sample_flags(app, tmp_path):
+    """Test that string sample flags are parsed rather than treated as truthy."""
+    source = tmp_path / "questions.jsonl"
+    row = question_row("Flags", tests=0)
+    row["test_cases"] = [{"input": [i], "expected_output": i, "is_sample": flag}
+                         for i, flag in enumerate(["false", "True", "0", True])]
+    write_jsonl(source, [row])
+    with app.app_context():
+        import_questions(str(source))
+        assert [t.isSample for t in TestCase.query.order_by(TestCase.testCaseID)] == \
+            [False, True, False, True]
+
+        row["test_cases"] = [{"input": [1], "expected_output": 1, "is_sample": "maybe"}]
+        write_jsonl(source, [row])
+        with pytest.raises(CatalogImportError, match="expected a boolean"):
+            import_questions(str(source))
+
+def test_failed_import_rolls_back_pending_writes(app, tmp_path):
+    """Test that a failure keeps committed batches, rolls back the rest and keeps queues."""
+    source = tmp_path / "questions.jsonl"
+    write_jsonl(source, [question_row("First"), {"title": "Broken"}])
+    with app.app_context():
+        db.session.add(Question(title="Kept", description="...", difficulty="Easy"))
+        db.session.commit()
+        db.session.add(RecommendationQueue(userID=1, questionID=1, rank=0))
+        db.session.commit()
+        version = catalog_version()
+
+        with pytest.raises(CatalogImportError):
+            import_questions(str(source), batch_size=1)
+        assert {q.title for q in Question.query} == {"Kept", "First"}
+        assert RecommendationQueue.query.count() == 1
+        assert catalog_version() != version
+
+def test_import_command(app, tmp_path):
+    """Test the import-questions CLI command."""
+    source = tmp_path / "questions.jsonl"
+    write_jsonl(source, [question_row("CLI")])
+    result = app.test_cli_runner().invoke(args=["import-questions", str(source)])
+    assert "Created 1 and updated 0 questions with 1 test cases." in result.output
+
+    source.write_text("{not json\n", encoding="utf-8")
+    result = app.test_cli_runner().invoke(args=["import-questions", str(source)])
+    assert result.exit_code != 0
+    assert "questions.jsonl:1" in result.output
@@ -0,0 +1,81 @@
+"""Unit tests for the load-test harness and the stubbed backends it relies on."""
+import json
+import time
+from types import SimpleNamespace
+from urllib.request import Request, urlopen
+from loadtest.run import percentile, summarize
+from loadtest.stub_ai import HINT, start_stub_ai
+from website import create_app
+from website.ai_helper import DEFAULT_AI_BASE_URL, get_openai_client
+from website.code_execution import run_tests
+
+def test_stub_ai_answers_after_latency():
+    """Test that the stub server returns an OpenAI-shaped completion after its latency."""
+    server = start_stub_ai(latency=0.2)
+    try:
+        request = Request(f"http://127.0.0.1:{server.server_port}/chat/completions",
+                          data=json.dumps({"model": "deepseek-chat"}).encode(),
+                          headers={"Content-Type": "application/json"})
+        started = time.perf_counter()
+        with urlopen(request, timeout=5) as response:
+            body = json.load(response)
+        assert time.perf_counter() - started >= 0.2
+        assert body["choices"][0]["message"]["content"] == HINT
+    finally:
+        server.shutdown()
+
+def test_summarize_reports_percentiles_and_errors():
+    """Test that samples are aggregated into throughput, percentiles and error rates."""
+    samples = [("home", n / 1000, n != 100) for n in range(1, 101)] + [("hint", 0.5, True)]
+    summary = summarize(samples, duration=10)
+
+    assert summary["home"]["requests"] == 100
+    assert summary["home"]["throughput"] == 10
+    assert summary["home"]["p50_ms"] == 50
+    assert summary["home"]["p99_ms"] == 99
+    assert summary["home"]["error_rate"] == 0.01
+    assert summary["hint"]["p99_ms"] == 500
+    assert percentile([3], 0.99) == 3
+
+def test_ai_base_url_is_configurable(app):
+    """Test that AI_BASE_URL points the client at another server."""
+    with app.app_context():
+        app.config.update(OPENAI_API_KEY="key")
+        assert str(get_openai_client().base_url).startswith(DEFAULT_AI_BASE_URL)
+        app.config["AI_BASE_URL"] = "http://127.0.0.1:9999"
+        assert str(get_openai_client().base_url).startswith("http://127.0.0.1:9999")
+
+def test_sandbox_stub_skips_solution_processes(app, mocker):
+    """Test that SANDBOX_STUB_SECONDS passes every test case without spawning a process."""
+    popen = mocker.patch("website.code_execution.subprocess.Popen")
+    app.config["SANDBOX_STUB_SECONDS"] = 0.01
+    tests = [SimpleNamespace(inputData="[1]", expectedOutput="2")] * 3
+    with app.app_context():
+        results, all_passed, usage = run_tests("broken code", tests, "solve")
+
+    assert all_passed
+    assert len(results) == 3
+    assert usage["runtime"] == 30000
+    popen.assert_not_called()
+
+def test_sandbox_stub_needs_load_test_flag(monkeypatch, tmp_path):
+    """Test that SANDBOX_STUB_SECONDS alone doesn't stub grading in a deployed app."""
+    monkeypatch.setenv("JAWSDB_URL", f"sqlite:///{tmp_path / 'stub.db'}")
+    monkeypatch.setenv("SANDBOX_STUB_SECONDS", "0.01")
+    monkeypatch.delenv("LOAD_TEST", raising=False)
+    deployed = create_app()
+    assert "SANDBOX_STUB_SECONDS" not in deployed.config
+
+    monkeypatch.setenv("LOAD_TEST", "1")
+    assert create_app().config["SANDBOX_STUB_SECONDS"] == 0.01
+
+def test_sandbox_stub_ignored_outside_tests(app, mocker):
+    """Test that a stub setting is ignored unless the app is testing or load-testing."""
+    execute = mocker.patch("website.code_execution.execute_code_with_test", return_value=3)
+    app.config.update(TESTING=False, SANDBOX_STUB_SECONDS=0.01)
+    tests = [SimpleNamespace(inputData="[1]", expectedOutput="2", isSample=True)]
+    with app.app_context():
+        _, all_passed, _ = run_tests("broken code", tests, "solve")
+
+    assert not all_passed
+    execute.assert_called_once()
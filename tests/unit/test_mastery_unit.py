@@ -0,0 +1,106 @@
+"""Unit tests for the incremental mastery score pipeline."""
+import pytest
+from website.extensions import db
+from website.mastery import (INITIAL_SCORE, apply_submission, backfill_mastery,
+                             schedule_mastery_update, updated_score)
+from website.models import (MasteryScore, Question, QuestionTag, RecommendationQueue,
+                            Submission, Tag, User)
+
+def scores_for(user_id):
+    """Returns a user's mastery scores keyed by tag ID."""
+    return {row.tagID: row.score for row in MasteryScore.query.filter_by(userID=user_id)}
+
+def test_updated_score_moves_toward_target():
+    """Test the exponentially weighted update in both directions."""
+    assert updated_score(50, True, alpha=0.5) == 75
+    assert updated_score(50, False, alpha=0.5) == 25
+    assert updated_score(100, True) == 100
+
+@pytest.mark.usefixtures("sample_data")
+def test_apply_submission_updates_only_question_tags(app):
+    """Test that a submission updates the question's tags and keeps the rest of the queue."""
+    with app.app_context():
+        db.session.add_all([RecommendationQueue(userID=1, questionID=1, rank=0),
+                            RecommendationQueue(userID=1, questionID=2, rank=1, score=1)])
+        db.session.commit()
+
+        apply_submission(1, 1, passed=True)  # Sum Array is tagged 'arrays' only
+
+        scores = scores_for(1)
+        assert scores[1] == pytest.approx(updated_score(INITIAL_SCORE, True))
+        assert scores[2] == 1  # 'strings' is untouched
+        queue = RecommendationQueue.query.filter_by(userID=1).all()
+        assert [(row.questionID, row.rank, row.score) for row in queue] == [(2, 0, 1)]
+
+def test_apply_submission_rescores_queue_in_place(app, count_queries):
+    """Test that a failure moves queued questions on the weakened tag up without re-ranking."""
+    with app.app_context():
+        user = User(username="queue", email="queue@example.com", passwordHash="hashed")
+        graphs, trees = Tag(name="graphs"), Tag(name="trees")
+        first, second, attempted = (Question(title=title, description="...", difficulty="Easy")
+                                    for title in ("Graph A", "Tree B", "Graph C"))
+        db.session.add_all([user, graphs, trees, first, second, attempted])
+        db.session.commit()
+        db.session.add_all([
+            QuestionTag(questionID=first.questionID, tagID=graphs.tagID),
+            QuestionTag(questionID=second.questionID, tagID=trees.tagID),
+            QuestionTag(questionID=attempted.questionID, tagID=graphs.tagID),
+            MasteryScore(userID=user.userID, tagID=graphs.tagID, score=50),
+            MasteryScore(userID=user.userID, tagID=trees.tagID, score=40),
+            RecommendationQueue(userID=user.userID, questionID=second.questionID, rank=0,
+                                score=40),
+            RecommendationQueue(userID=user.userID, questionID=first.questionID, rank=1,
+                                score=50),
+        ])
+        db.session.commit()
+
+        with count_queries() as counter:
+            apply_submission(user.userID, attempted.questionID, passed=False)
+        # The catalog-wide ranking query (which checks attempted submissions) did not run.
+        assert not any("submission" in statement for statement in counter.statements)
+
+        queue = RecommendationQueue.query.filter_by(userID=user.userID).order_by(
+            RecommendationQueue.rank).all()
+        assert [row.questionID for row in queue] == [first.questionID, second.questionID]
+        assert queue[0].score == pytest.approx(updated_score(50, False))
+
+@pytest.mark.usefixtures("sample_data")
+def test_backfill_matches_incremental_updates(app):
+    """Test that replaying history in small batches reproduces the incremental scores."""
+    with app.app_context():
+        history = [(1, 2, True), (2, 1, False), (1, 1, False), (2, 2, True), (1, 2, False)]
+        MasteryScore.query.delete()
+        for user_id, question_id, passed in history:
+            db.session.add(Submission(userID=user_id, questionID=question_id, code="pass",
+                                      result="Passed" if passed else "Failed",
+                                      language="python"))
+            apply_submission(user_id, question_id, passed)
+        incremental = {user_id: scores_for(user_id) for user_id in (1, 2)}
+
+        MasteryScore.query.delete()
+        db.session.commit()
+        assert backfill_mastery(batch_size=2) == 2
+
+        for user_id in (1, 2):
+            assert scores_for(user_id) == pytest.approx(incremental[user_id])
+
+@pytest.mark.usefixtures("sample_data")
+def test_schedule_runs_off_request_path(app, mocker):
+    """Test that asynchronous mode hands the update to the background executor."""
+    app.config["MASTERY_ASYNC_UPDATES"] = True
+    executor = mocker.patch("website.mastery.ThreadPoolExecutor").return_value
+    apply = mocker.patch("website.mastery.apply_submission")
+    with app.test_request_context():
+        schedule_mastery_update(1, 1, True)
+    executor.submit.assert_called_once()
+    apply.assert_not_called()
+
+@pytest.mark.usefixtures("sample_data")
+def test_backfill_mastery_command(app):
+    """Test the backfill-mastery CLI command."""
+    with app.app_context():
+        db.session.add(Submission(userID=1, questionID=1, code="pass", result="Passed",
+                                  language="python"))
+        db.session.commit()
+    result = app.test_cli_runner().invoke(args=["backfill-mastery", "--batch-size", "10"])
+    assert "Recomputed mastery scores for 1 users." in result.output
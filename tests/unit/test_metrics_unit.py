@@ -0,0 +1,75 @@
+"""Unit tests for the metrics helpers."""
+import os
+import subprocess
+import sys
+import pytest
+from website.code_execution import run_measured
+from website.metrics import (REGISTRY, clear_multiprocess_dir, increment, observe, render,
+                             require_shared_metrics)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def sample(name, **labels):
+    """Returns a sample's current value in this process, treating a missing one as 0."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_histogram_rendering():
+    """Test that histograms render cumulative buckets, sum and count."""
+    bucket = "devready_ai_request_seconds_bucket"
+    before = {le: sample(bucket, le=le) for le in ("0.01", "0.025", "2.5", "5.0", "+Inf")}
+    observe("devready_ai_request_seconds", 0.02)
+    observe("devready_ai_request_seconds", 3)
+    increment("devready_ai_errors_total", kind='Time"out')
+
+    assert sample(bucket, le="0.01") == before["0.01"]
+    assert sample(bucket, le="0.025") == before["0.025"] + 1
+    assert sample(bucket, le="2.5") == before["2.5"] + 1
+    assert sample(bucket, le="5.0") == before["5.0"] + 2
+    assert sample(bucket, le="+Inf") == before["+Inf"] + 2
+    text = render().decode()
+    assert "# TYPE devready_ai_request_seconds histogram" in text
+    assert "devready_ai_request_seconds_count" in text
+    assert 'devready_ai_errors_total{kind="Time\\"out"}' in text
+
+def test_sandbox_runs_are_counted():
+    """Test that solution processes record spawns and wall and CPU time."""
+    spawns = sample("devready_sandbox_spawns_total")
+    cpu = sample("devready_sandbox_cpu_seconds_sum")
+    run_measured(["python3", "-c", "pass"], "")
+    assert sample("devready_sandbox_spawns_total") == spawns + 1
+    assert sample("devready_sandbox_cpu_seconds_sum") > cpu
+
+def test_workers_share_figures(tmp_path):
+    """Test that a scrape of any worker reports totals across every worker process."""
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    record = ("from website.metrics import increment, observe; "
+              "increment('devready_sandbox_spawns_total'); "
+              "observe('devready_request_sql_queries', 3, endpoint='home.home')")
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, cwd=ROOT, check=True)
+    scrape = subprocess.run(
+        [sys.executable, "-c", "from website.metrics import render; print(render().decode())"],
+        env=env, cwd=ROOT, check=True, capture_output=True, text=True).stdout
+
+    assert "devready_sandbox_spawns_total 2.0" in scrape
+    assert 'devready_request_sql_queries_count{endpoint="home.home"} 2.0' in scrape
+    assert 'devready_request_sql_queries_sum{endpoint="home.home"} 6.0' in scrape
+
+def test_clear_multiprocess_dir(tmp_path, monkeypatch):
+    """Test that figures from an earlier run are deleted and other files kept."""
+    (tmp_path / "counter_123.db").write_bytes(b"old")
+    (tmp_path / "README").write_text("keep")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    clear_multiprocess_dir()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["README"]
+
+def test_require_shared_metrics(app, monkeypatch):
+    """Test that several workers exporting metrics need a multiprocess directory."""
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    require_shared_metrics(app, 4)
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    require_shared_metrics(app, 1)
+    with pytest.raises(RuntimeError):
+        require_shared_metrics(app, 4)
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "/tmp/devready-metrics")
+    require_shared_metrics(app, 4)
@@ -0,0 +1,121 @@
+"""Unit tests for the Alembic migrations and the indexes they create."""
+import os
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect, text
+from website import create_app
+from website.extensions import db
+from website.models import CodeBlob, QuestionStats, Submission
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "migrations")
+
+def test_migrations_match_models(tmp_path):
+    """Test that upgrading an empty database to head yields exactly the models' schema."""
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'migrated.db'}",
+        "SECRET_KEY": "test"
+    })
+    with app.app_context():
+        db.drop_all()
+        upgrade(directory=MIGRATIONS_DIR)
+        with db.engine.connect() as conn:
+            diff = compare_metadata(MigrationContext.configure(conn), db.metadata)
+        assert not diff
+        db.engine.dispose()
+
+BASELINE_TABLES = {"question", "tag", "user", "mastery_score", "question_tag", "submission",
+                   "test_case"}
+
+def test_stamped_baseline_upgrades(tmp_path):
+    """Test that the initial revision is the pre-migration schema and later ones build on it."""
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'baseline.db'}",
+        "SECRET_KEY": "test"
+    })
+    with app.app_context():
+        db.drop_all()
+        upgrade(directory=MIGRATIONS_DIR, revision="740361dcf70a")
+        assert set(inspect(db.engine).get_table_names()) - {"alembic_version"} == BASELINE_TABLES
+        with db.engine.begin() as conn:
+            conn.execute(text("INSERT INTO user VALUES (1, 'u', 'h', 'u@example.com')"))
+            conn.execute(text("INSERT INTO question (title, description, difficulty, createdDate)"
+                              " VALUES ('Q', 'd', 'Easy', '2025-01-01')"))
+            for result in ("Failed", "Passed"):
+                conn.execute(text("INSERT INTO submission (userID, questionID, code, result,"
+                                  " language, time) VALUES (1, 1, 'pass', :result, 'python',"
+                                  " '2025-01-01')"), {"result": result})
+
+        upgrade(directory=MIGRATIONS_DIR)
+        stats = db.session.get(QuestionStats, 1)
+        assert (stats.attempts, stats.passes, stats.uniqueAttempters, stats.uniqueSolvers) == \
+            (2, 1, 1, 1)
+        db.session.remove()
+        db.engine.dispose()
+
+def query_plan(sql):
+    """Returns SQLite's EXPLAIN QUERY PLAN output for a statement as one string."""
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " ".join(row[-1] for row in rows)
+
+def test_hot_queries_use_indexes(app):
+    """Test that the hot query paths are served by the composite indexes."""
+    with app.app_context():
+        plan = query_plan("SELECT count(*) FROM submission WHERE questionID = 1 AND result = 'Passed'")
+        assert "ix_submission_question_result" in plan
+
+        plan = query_plan("SELECT 1 FROM submission WHERE userID = 1 AND questionID = 2")
+        assert "ix_submission_user_question" in plan
+
+        plan = query_plan("SELECT questionID FROM question_tag WHERE tagID = 3")
+        assert "ix_question_tag_tag_question" in plan
+
+        plan = query_plan("SELECT * FROM user WHERE username = 'testuser'")
+        assert "ix_user_username" in plan
+
+def test_code_blob_migration_dedupes(tmp_path):
+    """Test that moving submission code into blobs stores each distinct source once."""
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'migrated.db'}",
+        "SECRET_KEY": "test"
+    })
+    long_code = "def solve():\n" + "    pass\n" * 100
+    with app.app_context():
+        db.drop_all()
+        upgrade(directory=MIGRATIONS_DIR, revision="7b7e78100bda")
+        with db.engine.begin() as conn:
+            conn.execute(text("INSERT INTO user VALUES (1, 'u', 'h', 'u@example.com')"))
+            conn.execute(text("INSERT INTO question (title, description, difficulty, createdDate)"
+                              " VALUES ('Q', 'd', 'Easy', '2025-01-01')"))
+            for code in ("pass", long_code, "pass"):
+                conn.execute(text("INSERT INTO submission (userID, questionID, code, result,"
+                                  " language, time) VALUES (1, 1, :code, 'Passed', 'python',"
+                                  " '2025-01-01')"), {"code": code})
+
+        upgrade(directory=MIGRATIONS_DIR)
+        assert db.session.query(CodeBlob).count() == 2
+        submissions = Submission.query.order_by(Submission.submissionID).all()
+        assert [s.code for s in submissions] == ["pass", long_code, "pass"]
+        assert db.session.get(CodeBlob, submissions[1].codeHash).compressed
+        db.session.remove()
+
+        downgrade(directory=MIGRATIONS_DIR, revision="7b7e78100bda")
+        with db.engine.connect() as conn:
+            codes = conn.execute(text("SELECT code FROM submission ORDER BY submissionID")).all()
+        assert [row[0] for row in codes] == ["pass", long_code, "pass"]
+        db.engine.dispose()
+
+def test_schema_is_left_to_migrations(tmp_path):
+    """Test that outside tests the app does not create tables, so `flask db upgrade` can."""
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'fresh.db'}",
+        "SECRET_KEY": "test"
+    })
+    with app.app_context():
+        assert not inspect(db.engine).get_table_names()
+        upgrade(directory=MIGRATIONS_DIR)
+        assert "question" in inspect(db.engine).get_table_names()
+        db.engine.dispose()
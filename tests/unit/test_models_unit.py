@@ -0,0 +1,84 @@
+"""Unit tests for model loading behaviour."""
+import pytest
+from sqlalchemy.dialects import mysql, sqlite
+from website.extensions import db
+from website.models import CodeBlob, Question, Submission, User
+
+@pytest.mark.usefixtures("sample_data")
+def test_large_text_columns_are_deferred(app, count_queries):
+    """Test that loading questions and submissions skips description, template and code."""
+    with app.app_context():
+        db.session.add(Submission(userID=1, questionID=1, code="x" * 10000, result="Passed",
+                                  language="python"))
+        db.session.commit()
+        db.session.expire_all()
+
+        with count_queries() as counter:
+            Question.query.all()
+            submissions = db.session.get(User, 1).submissions
+        statements = " ".join(counter.statements)
+        assert "description" not in statements
+        assert "template_code" not in statements
+        assert "submission.code" not in statements
+
+        with count_queries() as counter:
+            assert submissions[0].code == "x" * 10000
+        assert counter.count == 1
+
+@pytest.mark.usefixtures("sample_data")
+def test_content_group_loads_together(app, count_queries):
+    """Test that description and template code load in one query when rendered."""
+    with app.app_context():
+        db.session.expire_all()
+        question = db.session.get(Question, 1)
+        with count_queries() as counter:
+            assert question.description == "Find the sum of array elements"
+            assert question.template_code is None
+        assert counter.count == 1
+
+@pytest.mark.usefixtures("sample_data")
+def test_summary_queries(app):
+    """Test the lightweight summary row queries."""
+    with app.app_context():
+        rows = Question.summaries().order_by(Question.questionID).all()
+        assert rows[0]._asdict() == {"questionID": 1, "title": "Sum Array", "difficulty": "easy"}
+        assert Submission.summaries().count() == 0
+
+@pytest.mark.usefixtures("sample_data")
+def test_submission_code_is_deduplicated(app):
+    """Test that identical submitted code is stored once and long code is compressed."""
+    with app.app_context():
+        long_code = "class Solution:\n" + "    # comment\n" * 100
+        for code in ("pass", "pass", long_code):
+            db.session.add(Submission(userID=1, questionID=1, code=code, result="Failed",
+                                      language="python"))
+        db.session.commit()
+        db.session.expire_all()
+
+        assert CodeBlob.query.count() == 2
+        blob = db.session.get(CodeBlob, CodeBlob.encode(long_code)["codeHash"])
+        assert blob.compressed and len(blob.data) < blob.size
+        assert [s.code for s in Submission.query.order_by(Submission.submissionID)] == [
+            "pass", "pass", long_code]
+
+@pytest.mark.usefixtures("sample_data")
+def test_code_blob_written_on_flush(app, count_queries):
+    """Test that assigning code issues no SQL and the blob is written when flushed."""
+    with app.app_context():
+        with count_queries() as counter:
+            submission = Submission(userID=1, questionID=1, code="print(1)", result="Failed",
+                                    language="python")
+            assert submission.code == "print(1)"
+        assert counter.count == 0
+
+        db.session.add(submission)
+        db.session.commit()
+        assert db.session.get(CodeBlob, submission.codeHash).text == "print(1)"
+
+def test_code_blob_insert_only_ignores_duplicates():
+    """Test that blob inserts tolerate duplicate keys rather than every error."""
+    mysql_sql = str(CodeBlob.insert_missing("mysql").compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE" in mysql_sql
+    assert "IGNORE" not in mysql_sql
+    sqlite_sql = str(CodeBlob.insert_missing("sqlite").compile(dialect=sqlite.dialect()))
+    assert "ON CONFLICT DO NOTHING" in sqlite_sql
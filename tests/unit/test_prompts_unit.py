@@ -0,0 +1,54 @@
+"""Unit tests for server-side prompt assembly and token budgeting."""
+import pytest
+from website.prompts import (compact_code, compact_description, estimate_tokens,
+                             build_prompt_parts)
+
+def test_compact_description_collapses_whitespace():
+    """Test that descriptions are whitespace-collapsed and cut at a word boundary."""
+    assert compact_description("Reverse   the\n\n string", 100) == "Reverse the string"
+    trimmed = compact_description("word " * 200, 10)
+    assert estimate_tokens(trimmed) <= 11
+    assert trimmed.endswith(" ...")
+
+def test_compact_code_keeps_head_and_tail():
+    """Test that oversized code keeps its first and last lines and elides the middle."""
+    code = "\n".join(f"x{i} = {i}" for i in range(500))
+    trimmed = compact_code(code, 50)
+
+    assert estimate_tokens(trimmed) <= 60
+    assert trimmed.startswith("x0 = 0")
+    assert trimmed.endswith("x499 = 499")
+    assert "lines omitted" in trimmed
+
+def test_compact_code_drops_comments_before_truncating():
+    """Test that comment lines are sacrificed before real code."""
+    code = "def f():\n" + "    # note\n" * 100 + "    return 1\n"
+    assert compact_code(code, 20) == "def f():\n    return 1"
+
+def test_compact_code_truncates_long_line():
+    """Test that a single line longer than the budget is cut, not dropped."""
+    code = "return " + " + ".join(str(i) for i in range(500))
+    trimmed = compact_code(code, 20)
+
+    assert trimmed.startswith("return 0 + 1 + 2")
+    assert trimmed.endswith(" ...")
+    assert "lines omitted" not in trimmed
+    assert estimate_tokens(trimmed) <= 20
+
+@pytest.mark.usefixtures("sample_data")
+def test_build_prompt_parts_from_question_id(app):
+    """Test that the question text is assembled from the stored question."""
+    with app.test_request_context():
+        question_text, code = build_prompt_parts("return 1", question_id=1)
+        assert question_text == "Sum Array: Find the sum of array elements"
+        assert code == "return 1"
+
+        assert build_prompt_parts("return 1", question_id=999) == (None, None)
+
+def test_build_prompt_parts_respects_budget(app):
+    """Test that the combined prompt parts fit the configured budget."""
+    app.config["AI_PROMPT_TOKEN_BUDGET"] = 100
+    with app.test_request_context():
+        question_text, code = build_prompt_parts(
+            "y = 1\n" * 1000, question_description="long " * 1000)
+        assert estimate_tokens(question_text) + estimate_tokens(code) <= 110
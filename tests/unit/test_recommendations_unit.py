@@ -0,0 +1,118 @@
+"""Unit tests for the per-user recommendation queue."""
+from website.extensions import db
+from website.models import (User, Question, Tag, QuestionTag, MasteryScore, Submission,
+                            RecommendationQueue)
+from website.recommendations import (get_next_question, rank_candidates, rebuild_queue,
+                                     remove_from_queue)
+
+def make_user():
+    """Adds and returns a user."""
+    user = User(username="queueuser", email="queue@example.com", passwordHash="hashed")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def test_candidates_ranked_by_difficulty_not_alphabetically(app):
+    """Test that Medium ranks before Hard even though it sorts after it alphabetically."""
+    with app.app_context():
+        user = make_user()
+        db.session.add_all([
+            Question(title="Hard", description="...", difficulty="Hard"),
+            Question(title="Medium", description="...", difficulty="Medium"),
+            Question(title="Easy", description="...", difficulty="Easy"),
+        ])
+        db.session.commit()
+
+        titles = [db.session.get(Question, qid).title for qid, _ in rank_candidates(user.userID)]
+        assert titles == ["Easy", "Medium", "Hard"]
+
+def test_weakest_tag_ranks_first(app):
+    """Test that questions on the weakest tag come before easier questions elsewhere."""
+    with app.app_context():
+        user = make_user()
+        strong, weak = Tag(name="strong"), Tag(name="weak")
+        easy = Question(title="Easy Strong", description="...", difficulty="Easy")
+        hard = Question(title="Hard Weak", description="...", difficulty="Hard")
+        db.session.add_all([strong, weak, easy, hard])
+        db.session.commit()
+        db.session.add_all([
+            QuestionTag(questionID=easy.questionID, tagID=strong.tagID),
+            QuestionTag(questionID=hard.questionID, tagID=weak.tagID),
+            MasteryScore(userID=user.userID, tagID=strong.tagID, score=90),
+            MasteryScore(userID=user.userID, tagID=weak.tagID, score=10),
+        ])
+        db.session.commit()
+
+        assert rank_candidates(user.userID) == [(hard.questionID, 10), (easy.questionID, 90)]
+
+def test_queue_is_consumed_and_persisted(app):
+    """Test that the queue is built once, then advances as questions are attempted."""
+    with app.app_context():
+        user = make_user()
+        first = Question(title="First", description="...", difficulty="Easy")
+        second = Question(title="Second", description="...", difficulty="Medium")
+        db.session.add_all([first, second])
+        db.session.commit()
+
+        question, _ = get_next_question(user.userID)
+        assert question.title == "First"
+        assert RecommendationQueue.query.filter_by(userID=user.userID).count() == 2
+
+        remove_from_queue(user.userID, first.questionID)
+        db.session.add(Submission(userID=user.userID, questionID=first.questionID,
+                                  code="pass", result="Passed", language="python"))
+        db.session.commit()
+
+        question, _ = get_next_question(user.userID)
+        assert question.title == "Second"
+
+def test_no_unattempted_question(app):
+    """Test that a user who attempted everything gets no question instead of a crash."""
+    with app.app_context():
+        user = make_user()
+        question = Question(title="Only", description="...", difficulty="Easy")
+        db.session.add(question)
+        db.session.commit()
+        db.session.add(Submission(userID=user.userID, questionID=question.questionID,
+                                  code="pass", result="Passed", language="python"))
+        db.session.commit()
+
+        assert get_next_question(user.userID) == (None, [])
+
+def test_exhausted_user_skips_rebuild_until_catalog_changes(app, count_queries):
+    """Test that an exhausted user's page loads write nothing until a question is added."""
+    with app.app_context():
+        user = make_user()
+        question = Question(title="Only", description="...", difficulty="Easy")
+        db.session.add(question)
+        db.session.commit()
+        db.session.add(Submission(userID=user.userID, questionID=question.questionID,
+                                  code="pass", result="Passed", language="python"))
+        db.session.commit()
+        assert get_next_question(user.userID) == (None, [])
+
+        with count_queries() as counter:
+            assert get_next_question(user.userID) == (None, [])
+        assert not any(statement.lstrip().upper().startswith(("DELETE", "INSERT"))
+                       for statement in counter.statements)
+        assert not any("mastery_score" in statement for statement in counter.statements)
+
+        db.session.add(Question(title="Fresh", description="...", difficulty="Easy"))
+        db.session.commit()
+        question, _ = get_next_question(user.userID)
+        assert question.title == "Fresh"
+
+def test_concurrent_rebuild_keeps_existing_queue(app, mocker):
+    """Test that a rebuild racing another request's identical rows rolls back cleanly."""
+    with app.app_context():
+        user = make_user()
+        db.session.add(Question(title="First", description="...", difficulty="Easy"))
+        db.session.commit()
+        get_next_question(user.userID)
+
+        # The other request's rows land between our DELETE and INSERT.
+        mocker.patch("website.recommendations.invalidate_queue")
+        assert rebuild_queue(user.userID)
+        assert RecommendationQueue.query.filter_by(userID=user.userID).count() == 1
+        question, _ = get_next_question(user.userID)
+        assert question.title == "First"
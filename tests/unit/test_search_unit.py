@@ -0,0 +1,41 @@
+"""Unit tests for the in-process question search index."""
+import pytest
+from website.extensions import db
+from website.models import Question
+from website.search import SearchIndex, search_questions, tokenize
+
+DOCUMENTS = [
+    {"questionID": 1, "title": "Two Sum", "difficulty": "Easy", "tags": ["arrays", "hashing"],
+     "description": "Find two numbers that add up to a target."},
+    {"questionID": 2, "title": "Reverse String", "difficulty": "Easy", "tags": ["strings"],
+     "description": "Reverse the characters of a string in place."},
+    {"questionID": 3, "title": "Longest Substring", "difficulty": "Medium", "tags": ["strings"],
+     "description": "Find the longest substring without repeating characters, using a sum."},
+]
+
+def test_tokenize_drops_stopwords():
+    """Test tokenization and stopword removal."""
+    assert tokenize("Find the Sum of an ARRAY!") == ["find", "sum", "array"]
+
+def test_title_matches_outrank_description_matches():
+    """Test that a title hit ranks above a description-only hit."""
+    ranked = SearchIndex(DOCUMENTS).search("sum")
+    assert [question_id for question_id, _ in ranked] == [1, 3]
+
+def test_tag_and_prefix_matches():
+    """Test matching on tag names and on a prefix of the last term."""
+    index = SearchIndex(DOCUMENTS)
+    assert {question_id for question_id, _ in index.search("strings")} == {2, 3}
+    assert [question_id for question_id, _ in index.search("revers")] == [2]
+    assert index.search("the") == []
+
+@pytest.mark.usefixtures("sample_data")
+def test_search_index_rebuilds_on_catalog_change(app):
+    """Test that new questions become searchable after the catalog changes."""
+    with app.app_context():
+        assert search_questions("palindrome")[0] == 0
+        db.session.add(Question(title="Valid Palindrome", description="...", difficulty="Easy"))
+        db.session.commit()
+        total, results = search_questions("palindrome")
+        assert total == 1
+        assert results[0]["title"] == "Valid Palindrome"
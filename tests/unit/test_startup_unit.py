@@ -0,0 +1,29 @@
+"""Unit tests for startup timing and lazy imports."""
+import subprocess
+import sys
+from website.startup import parse_importtime
+
+def test_boot_timings_recorded(app):
+    """Test that create_app records how long each boot phase took."""
+    timings = app.extensions["boot_timings"]
+    assert {"config", "extensions", "blueprints", "create_all"} <= set(timings)
+    assert all(elapsed >= 0 for elapsed in timings.values())
+
+def test_openai_imported_lazily():
+    """Test that importing and creating the app leaves the OpenAI SDK unloaded."""
+    process = subprocess.run(
+        [sys.executable, "-c",
+         "import sys\nfrom website import create_app\n"
+         "create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://'})\n"
+         "print('openai' in sys.modules)"],
+        capture_output=True, text=True, check=True)
+    assert process.stdout.strip() == "False"
+
+def test_parse_importtime():
+    """Test that import self times are summed per top-level package."""
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   sqlalchemy.util\n"
+              "import time:        30 |        150 | sqlalchemy\n"
+              "import time:         5 |          5 | website.models\n"
+              "Traceback noise\n")
+    assert parse_importtime(stderr) == {"sqlalchemy": 150, "website": 5}
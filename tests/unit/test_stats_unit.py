@@ -0,0 +1,140 @@
+"""Unit tests for materialized question statistics."""
+from datetime import datetime
+import pytest
+from website.extensions import db
+from website.models import QuestionStats, Submission
+from website.stats import (get_profile_stats, get_submission_history, get_success_rate,
+                           rebuild_question_stats, record_submission)
+
+def submit(user_id, question_id, passed):
+    """Records a submission the way submit_solution does."""
+    record_submission(user_id, question_id, passed)
+    db.session.add(Submission(userID=user_id, questionID=question_id, code="pass",
+                              result="Passed" if passed else "Failed", language="python"))
+    db.session.commit()
+
+@pytest.mark.usefixtures("sample_data")
+def test_record_submission_updates_counts(app):
+    """Test that attempts, passes and unique users are counted incrementally."""
+    with app.app_context():
+        submit(1, 1, False)
+        submit(1, 1, True)
+        submit(1, 1, True)
+        submit(2, 1, False)
+
+        stats = db.session.get(QuestionStats, 1)
+        assert (stats.attempts, stats.passes) == (4, 2)
+        assert (stats.uniqueAttempters, stats.uniqueSolvers) == (2, 1)
+        assert stats.lastSubmissionTime is not None
+        assert get_success_rate(1) == 50
+        assert get_success_rate(2) == 0
+
+@pytest.mark.usefixtures("sample_data")
+def test_first_submission_tolerates_concurrent_row(app, mocker):
+    """Test that a stats row created by another worker after our lookup is reused."""
+    with app.app_context():
+        db.session.add(QuestionStats(questionID=1, attempts=3, passes=1,
+                                     uniqueAttempters=2, uniqueSolvers=1))
+        db.session.commit()
+        db.session.expunge_all()
+        real_get = db.session.get
+        # The first lookup misses, as if the other worker's insert had not committed yet.
+        mocker.patch.object(db.session, "get",
+                            side_effect=[None, real_get(QuestionStats, 1)])
+
+        submit(1, 1, True)
+
+        mocker.stopall()
+        stats = db.session.get(QuestionStats, 1)
+        assert (stats.attempts, stats.passes) == (4, 2)
+
+@pytest.mark.usefixtures("sample_data")
+def test_rebuild_matches_incremental_stats(app):
+    """Test that a full rebuild reproduces the incrementally maintained rows."""
+    with app.app_context():
+        for user_id, question_id, passed in [(1, 1, True), (2, 1, True), (2, 1, False),
+                                             (1, 2, False), (1, 2, False)]:
+            submit(user_id, question_id, passed)
+        incremental = {row.questionID: (row.attempts, row.passes, row.uniqueAttempters,
+                                        row.uniqueSolvers)
+                       for row in QuestionStats.query.all()}
+
+        assert rebuild_question_stats() == 2
+        rebuilt = {row.questionID: (row.attempts, row.passes, row.uniqueAttempters,
+                                    row.uniqueSolvers)
+                   for row in QuestionStats.query.all()}
+        assert rebuilt == incremental == {1: (3, 2, 2, 2), 2: (2, 0, 1, 0)}
+
+@pytest.mark.usefixtures("sample_data")
+def test_rebuild_question_stats_command(app):
+    """Test the rebuild-question-stats CLI command."""
+    with app.app_context():
+        db.session.add(Submission(userID=1, questionID=1, code="pass", result="Passed",
+                                  language="python"))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["rebuild-question-stats"])
+    assert "Rebuilt statistics for 1 questions." in result.output
+    with app.app_context():
+        assert get_success_rate(1) == 100
+
+@pytest.mark.usefixtures("sample_data")
+def test_profile_stats_aggregates(app):
+    """Test profile counts, pass rate and per-tag mastery from aggregate queries."""
+    with app.app_context():
+        for question_id, passed in [(1, False), (1, True), (2, True), (2, True)]:
+            submit(1, question_id, passed)
+
+        stats = get_profile_stats(1)
+        assert (stats["submissions"], stats["passed"], stats["solved"]) == (4, 3, 2)
+        assert stats["pass_rate"] == 75
+        assert stats["mastery"] == [{"tag": "strings", "score": 1}]
+        assert stats["average_mastery"] == 1
+
+def test_profile_stats_without_submissions(app):
+    """Test that a new user gets zeroed stats."""
+    with app.app_context():
+        stats = get_profile_stats(42)
+        assert stats["submissions"] == 0
+        assert stats["pass_rate"] == 0
+        assert stats["mastery"] == []
+
+@pytest.mark.usefixtures("sample_data")
+def test_submission_history_pages(app, count_queries):
+    """Test that history pages are newest first, joined to titles in a single query."""
+    with app.app_context():
+        for question_id in (1, 2, 1):
+            submit(1, question_id, False)
+
+        with count_queries() as counter:
+            rows, cursor = get_submission_history(1, per_page=2)
+        assert counter.count == 1
+        assert "code" not in counter.statements[0]
+        assert [row.title for row in rows] == ["Sum Array", "Reverse String"]
+        assert cursor == 2
+
+        with count_queries() as counter:
+            rows, cursor = get_submission_history(1, before=cursor, per_page=2)
+        assert counter.count == 1
+        assert [row.submissionID for row in rows] == [1]
+        assert cursor is None
+
+@pytest.mark.usefixtures("sample_data")
+def test_submission_history_cursor_breaks_time_ties(app):
+    """Test that submissions sharing a timestamp are paged by ID without gaps or repeats."""
+    with app.app_context():
+        moment = datetime(2024, 1, 1)
+        db.session.add_all([
+            Submission(userID=1, questionID=1, code="pass", result="Passed",
+                       language="python", time=moment)
+            for _ in range(5)
+        ])
+        db.session.commit()
+
+        seen, cursor = [], None
+        while True:
+            rows, cursor = get_submission_history(1, before=cursor, per_page=2)
+            seen.extend(row.submissionID for row in rows)
+            if cursor is None:
+                break
+        assert seen == [5, 4, 3, 2, 1]
@@ -9,40 +9,88 @@ from .views import main_blueprint
 from .code_execution import code_exec_blueprint
 from .ai_helper import ai_helper_blueprint
 from .questions import questions_blueprint
-from .models import User
-from .extensions import db
+from .commands import commands_blueprint
+from .metrics import init_metrics, metrics_blueprint
+from .assets import assets_blueprint, init_assets
+from .profiler import init_profiler
+from .identity import load_identity
+from .extensions import cache, db, migrate
+from .database import REPLICA_BIND, database_url, engine_options
+from .startup import boot_phase
 
 load_dotenv()
 
 def create_app(test_config=None):
-    """Creates the Flask application."""
+    """Creates the Flask application, recording per-phase timings in `boot_timings`."""
     app = Flask(__name__)
+    timings = app.extensions["boot_timings"] = {}
 
-    if not test_config:
-        db_url = os.environ.get('JAWSDB_URL')
-        if db_url:
-            db_url = db_url.replace('mysql://', 'mysql+pymysql://')
-        app.config['SQLALCHEMY_DATABASE_URI'] = db_url or 'sqlite:///devready.db'
-        app.config['OPENAI_API_KEY'] = os.environ.get('OPENAI_API_KEY')
-        app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
-    else:
-        app.config.update(test_config)
+    with boot_phase(timings, "config"):
+        configure(app, test_config)
 
-    db.init_app(app)
+    with boot_phase(timings, "extensions"):
+        app.config.setdefault('CACHE_TYPE', 'SimpleCache')
+        db.init_app(app)
+        cache.init_app(app)
+        migrate.init_app(app, db, render_as_batch=True)
 
-    login_manager = LoginManager(app)
-    login_manager.login_view = 'auth.login'
+        login_manager = LoginManager(app)
+        login_manager.login_view = 'auth.login'
 
-    @login_manager.user_loader
-    def load_user(user_id):
-        return User.query.get(int(user_id))
+        @login_manager.user_loader
+        def load_user(user_id):
+            return load_identity(int(user_id))
 
-    app.register_blueprint(main_blueprint)
-    app.register_blueprint(code_exec_blueprint)
-    app.register_blueprint(auth_blueprint)
-    app.register_blueprint(ai_helper_blueprint)
-    app.register_blueprint(questions_blueprint)
+    with boot_phase(timings, "blueprints"):
+        app.register_blueprint(main_blueprint)
+        app.register_blueprint(code_exec_blueprint)
+        app.register_blueprint(auth_blueprint)
+        app.register_blueprint(ai_helper_blueprint)
+        app.register_blueprint(questions_blueprint)
+        app.register_blueprint(commands_blueprint)
+        app.register_blueprint(metrics_blueprint)
+        app.register_blueprint(assets_blueprint)
+        init_metrics(app)
+        init_profiler(app)
+        init_assets(app)
 
-    with app.app_context():
-        db.create_all()
+    # Outside tests the schema is owned by the Alembic migrations (`flask db upgrade`).
+    if app.config.get('AUTO_CREATE_SCHEMA', app.config.get('TESTING', False)):
+        with boot_phase(timings, "create_all"), app.app_context():
+            db.create_all()
+    app.logger.info("Application created in %.1f ms: %s", sum(timings.values()), timings)
     return app
+
+def configure(app, test_config):
+    """Loads settings from the environment, or `test_config` when given."""
+    if not test_config:
+        driver = os.environ.get('DB_DRIVER')
+        db_url = database_url(os.environ.get('JAWSDB_URL'), driver) or 'sqlite:///devready.db'
+        app.config['SQLALCHEMY_DATABASE_URI'] = db_url
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(db_url, os.environ)
+        replica_url = database_url(os.environ.get('REPLICA_DATABASE_URL'), driver)
+        if replica_url:
+            app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: replica_url}
+        app.config['OPENAI_API_KEY'] = os.environ.get('OPENAI_API_KEY')
+        app.config['AI_BASE_URL'] = os.environ.get('AI_BASE_URL')
+        # Stubbed grading passes every submission, so a stray variable alone can't enable it.
+        app.config['LOAD_TEST'] = os.environ.get('LOAD_TEST', '').lower() in ('1', 'true', 'yes')
+        if app.config['LOAD_TEST'] and os.environ.get('SANDBOX_STUB_SECONDS'):
+            app.config['SANDBOX_STUB_SECONDS'] = float(os.environ['SANDBOX_STUB_SECONDS'])
+        app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
+        app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+        app.config['PROFILER_DIR'] = os.environ.get('PROFILER_DIR')
+        app.config['PROFILER_TOKEN'] = os.environ.get('PROFILER_TOKEN')
+        app.config['AI_PROMPT_TOKEN_BUDGET'] = int(os.environ.get('AI_PROMPT_TOKEN_BUDGET', 1500))
+        app.config['MASTERY_ALPHA'] = float(os.environ.get('MASTERY_ALPHA', 0.3))
+        redis_url = os.environ.get('REDIS_URL')
+        app.config['CACHE_TYPE'] = os.environ.get('CACHE_TYPE',
+                                                  'RedisCache' if redis_url else 'SimpleCache')
+        app.config['CACHE_REDIS_URL'] = redis_url
+        app.config['CACHE_DIR'] = os.environ.get('CACHE_DIR')
+        app.config['CACHE_DEFAULT_TIMEOUT'] = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 3600))
+        app.config['CACHE_THRESHOLD'] = int(os.environ.get('CACHE_THRESHOLD', 10000))
+        app.config['AUTO_CREATE_SCHEMA'] = os.environ.get('AUTO_CREATE_SCHEMA', '').lower() in (
+            '1', 'true', 'yes')
+    else:
+        app.config.update(test_config)
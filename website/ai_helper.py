@@ -1,18 +1,30 @@
 """Blueprint for AI-powered coding hints and analysis."""
+import time
 from flask import Blueprint, jsonify, request, current_app
-from openai import OpenAI
+from .complexity import analyze_complexity
+from .metrics import increment, observe
+from .prompts import build_prompt_parts
 
 ai_helper_blueprint = Blueprint("ai_helper", __name__)
 
+DEFAULT_AI_BASE_URL = "https://api.deepseek.com"
+
 def get_openai_client():
-    """Retrieves OpenAI client using the API key from Flask config."""
+    """Retrieves OpenAI client using the API key from Flask config.
+
+    The SDK is imported here, on the first AI request, because importing it takes
+    about as long as the rest of the application and would slow every worker boot.
+    """
     api_key = current_app.config.get("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("Missing OpenAI API Key")
-    return OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+    from openai import OpenAI  # pylint: disable=import-outside-toplevel
+    return OpenAI(api_key=api_key,
+                  base_url=current_app.config.get("AI_BASE_URL") or DEFAULT_AI_BASE_URL)
 
 def generate_response(system_prompt, user_prompt):
     """Helper function to generate AI responses using DeepSeek Chat API."""
+    started = time.perf_counter()
     try:
         client = get_openai_client()
         response = client.chat.completions.create(
@@ -26,28 +38,43 @@ def generate_response(system_prompt, user_prompt):
         return response.choices[0].message.content, None
     except (KeyError, ValueError) as error:
         current_app.logger.error("AI Model Error: %s", str(error))
+        increment("devready_ai_errors_total", kind="model")
         return None, str(error)
     except Exception as error:  # noqa: W0718 (Still catching general exceptions)
         current_app.logger.error("Unexpected AI Model Error: %s", str(error))
+        increment("devready_ai_errors_total", kind=type(error).__name__)
         return None, "An unexpected error occurred."
+    finally:
+        observe("devready_ai_request_seconds", time.perf_counter() - started)
+
+def parse_question_id(data):
+    """Returns the request's `question_id` as an int, or None if absent or malformed."""
+    try:
+        return int(data["question_id"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 @ai_helper_blueprint.route('/hint', methods=['POST'])
 def provide_hint():
     """Provides guidance on solving a coding question without revealing the answer."""
     data = request.get_json()
-    question_description = data.get("question_description")
+    question_id = parse_question_id(data)
     code = data.get("code")
 
-    if not question_description or not code:
+    if not code or (question_id is None and not data.get("question_description")):
         return jsonify({"success": False, "error": "Missing question description or code"}), 400
 
+    question_text, code = build_prompt_parts(code, question_id, data.get("question_description"))
+    if question_text is None:
+        return jsonify({"success": False, "error": "Question not found"}), 404
+
     system_prompt = (
         "You are a coding interviewer. Your interviewee is stuck on a Leetcode-style problem. "
         "Evaluate their code, identify mistakes, and guide them toward a solution. "
         "DO NOT GIVE AWAY THE ANSWER. Only provide a hint. Be very brief, concise and patient."
     )
     user_prompt = (
-        f"I am solving the Leetcode question '{question_description}', but I'm stuck.\n"
+        f"I am solving the Leetcode question '{question_text}', but I'm stuck.\n"
         f"Here is my code so far:\n{code}"
     )
 
@@ -60,27 +87,52 @@ def provide_hint():
 
 @ai_helper_blueprint.route('/analyze_submission', methods=['POST'])
 def analyze_submission():
-    """Analyzes submitted code, providing time/space complexity and optimization suggestions."""
+    """Analyzes submitted code, providing time/space complexity and optimization suggestions.
+
+    The complexity estimate is computed locally from the code's AST. The LLM is only
+    consulted when the client asks for a `detailed` analysis or the code cannot be parsed.
+    """
     data = request.get_json()
-    question_description = data.get("question_description")
+    question_id = parse_question_id(data)
     code = data.get("code")
+    detailed = bool(data.get("detailed"))
 
-    if not question_description or not code:
+    if not code:
         return jsonify({"success": False, "error": "Missing question description or code"}), 400
 
+    estimate = analyze_complexity(code)
+    if estimate and not detailed:
+        return jsonify({
+            "success": True,
+            "source": "local",
+            "analysis": (f"Estimated time complexity: {estimate['time_complexity']}. "
+                         f"Estimated space complexity: {estimate['space_complexity']}."),
+            "complexity": estimate
+        })
+
+    if question_id is None and not data.get("question_description"):
+        return jsonify({"success": False, "error": "Missing question description or code"}), 400
+
+    question_text, code = build_prompt_parts(code, question_id, data.get("question_description"))
+    if question_text is None:
+        return jsonify({"success": False, "error": "Question not found"}), 404
+
     system_prompt = (
         "You are a CS professor specializing in algorithms. Evaluate a given solution, analyze its "
         "time/space complexity, compare it to the optimal solution, and suggest improvements. "
         "Be concise."
     )
     user_prompt = (
-        f"I solved the Leetcode question '{question_description}'. Can you analyze my solution's "
+        f"I solved the Leetcode question '{question_text}'. Can you analyze my solution's "
         f"time/space complexity and compare it to the optimal one? Here is my code:\n{code}"
     )
+    if estimate:
+        user_prompt += (f"\nA static analysis estimated {estimate['time_complexity']} time and "
+                        f"{estimate['space_complexity']} space.")
 
     analysis, error = generate_response(system_prompt, user_prompt)
 
     if error:
         return jsonify({"success": False, "error": error}), 500
 
-    return jsonify({"success": True, "analysis": analysis})
+    return jsonify({"success": True, "source": "llm", "analysis": analysis, "complexity": estimate})
@@ -0,0 +1,132 @@
+"""Fingerprinted, precompressed static assets with long-lived caching.
+
+`flask build-assets` copies every file under `static/` into ASSET_BUILD_DIR under a
+content-hashed name, writes gzip (and, when the `brotli` module is installed,
+Brotli) variants of text assets, and records both in `manifest.json`. Templates
+link assets through `asset_url`, which points at the fingerprinted copy when the
+manifest lists one and at the plain static file otherwise, so an unbuilt checkout
+still works. `/assets/<name>` serves the best precompressed variant the client
+accepts with immutable cache headers: a changed file gets a new name, so browsers
+never need to revalidate.
+
+Each build keeps serving the files of earlier builds: their copies stay in
+ASSET_BUILD_DIR and the manifest carries their entries forward, so pages rendered
+before a deploy keep loading. Deleting an old copy retires it at the next build.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from flask import Blueprint, abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip alone still covers every browser.
+    brotli = None
+
+assets_blueprint = Blueprint("assets", __name__)
+
+MANIFEST = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE = {".css", ".html", ".js", ".json", ".svg", ".txt"}
+# Content-Encoding -> file suffix, in order of preference.
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+def fingerprint(filename, content):
+    """Returns `filename` with a hash of `content` before its extension."""
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{extension}"
+
+def compress(content):
+    """Returns {encoding: bytes} for each variant smaller than `content`."""
+    variants = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content)
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(content)}
+
+def write_file(path, content):
+    """Writes `content` to `path`, creating parent directories."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+
+def previous_files(build_dir):
+    """Returns the servable files recorded by the last build whose copies still exist."""
+    try:
+        with open(os.path.join(build_dir, MANIFEST), encoding="utf-8") as file:
+            files = json.load(file).get("files", {})
+    except FileNotFoundError:
+        return {}
+    return {name: entry for name, entry in files.items()
+            if os.path.exists(os.path.join(build_dir, name))}
+
+def build_assets(static_dir, build_dir):
+    """Fingerprints and precompresses every file under `static_dir`.
+
+    Returns the manifest mapping each static path to its current build. The file
+    written alongside also lists every servable fingerprinted file, earlier
+    builds' included.
+    """
+    servable = previous_files(build_dir)
+    manifest = {}
+    for root, _, files in os.walk(static_dir):
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            logical = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            with open(source, "rb") as file:
+                content = file.read()
+            hashed = fingerprint(logical, content)
+            write_file(os.path.join(build_dir, hashed), content)
+            variants = {}
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE:
+                variants = compress(content)
+            for encoding, data in variants.items():
+                write_file(os.path.join(build_dir, hashed + ENCODINGS[encoding]), data)
+            manifest[logical] = servable[hashed] = {
+                "file": hashed, "encodings": [e for e in ENCODINGS if e in variants]}
+    write_file(os.path.join(build_dir, MANIFEST), json.dumps(
+        {"assets": manifest, "files": servable}, indent=2, sort_keys=True).encode())
+    return manifest
+
+def load_manifest(app):
+    """Loads the build manifest into the app, or an empty one if assets were never built."""
+    try:
+        with open(os.path.join(app.config["ASSET_BUILD_DIR"], MANIFEST),
+                  encoding="utf-8") as file:
+            build = json.load(file)
+    except FileNotFoundError:
+        build = {}
+    app.extensions["assets"] = {
+        "manifest": build.get("assets", {}),
+        "files": build.get("files", {}),
+    }
+
+def asset_url(filename):
+    """Like url_for('static', ...), but links the fingerprinted build when there is one."""
+    entry = current_app.extensions["assets"]["manifest"].get(filename)
+    if entry is None:
+        return url_for("static", filename=filename)
+    return url_for("assets.serve_asset", filename=entry["file"])
+
+def init_assets(app):
+    """Loads the manifest and makes `asset_url` available to templates."""
+    app.config.setdefault("ASSET_BUILD_DIR", os.path.join(app.root_path, "static_build"))
+    load_manifest(app)
+    app.jinja_env.globals["asset_url"] = asset_url
+
+@assets_blueprint.route("/assets/<path:filename>")
+def serve_asset(filename):
+    """Serves a fingerprinted asset, precompressed if the client accepts it."""
+    entry = current_app.extensions["assets"]["files"].get(filename)
+    if entry is None:
+        abort(404)
+    encoding = request.accept_encodings.best_match(entry["encodings"])
+    response = send_from_directory(
+        current_app.config["ASSET_BUILD_DIR"], filename + ENCODINGS.get(encoding, ""),
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+    if encoding:
+        response.content_encoding = encoding
+    response.headers["Cache-Control"] = IMMUTABLE
+    response.vary.add("Accept-Encoding")
+    return response
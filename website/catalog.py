@@ -0,0 +1,203 @@
+"""Read-only in-memory snapshot of the question catalog, refreshed whenever it changes.
+
+Each worker loads the whole catalog (questions, tags, sample and hidden test cases)
+into an immutable CatalogSnapshot and serves catalog reads from it. A generation
+token kept in the shared Flask-Caching backend is replaced on every catalog change,
+so all workers notice and swap in a fresh snapshot on their next read. Structures
+derived from the catalog (library, search index) are memoized per snapshot.
+"""
+import threading
+from collections import namedtuple
+from itertools import chain
+from types import MappingProxyType
+from uuid import uuid4
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .database import use_primary
+from .extensions import cache, db
+from .models import Question, QuestionTag, Tag, TestCase
+
+CATALOG_MODELS = (Question, QuestionTag, Tag, TestCase)
+LISTING_FIELDS = Question.DICT_FIELDS + ("tags", "sample_test_cases")
+
+QuestionSummary = namedtuple("QuestionSummary", ["questionID", "title", "difficulty", "tag_names"])
+QuestionRecord = namedtuple("QuestionRecord", [
+    "questionID", "title", "description", "difficulty", "createdDate", "template_code",
+    "expected_method", "tag_names", "testCases"])
+TestCaseRecord = namedtuple("TestCaseRecord", ["testCaseID", "inputData", "expectedOutput",
+                                               "isSample"])
+
+GENERATION_KEY = "catalog:generation"
+PROCESS_LOCAL_CACHES = ("SimpleCache", "NullCache", "simple", "null")
+
+def catalog_version():
+    """Returns the number of catalog changes this process has made.
+
+    This counter is local to the worker and only useful for diagnostics; cache
+    validity is decided by the shared cache_generation() token.
+    """
+    return current_app.extensions.get("catalog_version", 0)
+
+def bump_catalog_version():
+    """Invalidates the catalog snapshot in every worker.
+
+    ORM writes to catalog models bump the version automatically on commit; call this
+    after bulk Core statements that bypass the ORM.
+    """
+    current_app.extensions["catalog_version"] = catalog_version() + 1
+    cache.set(GENERATION_KEY, uuid4().hex, timeout=0)
+
+def cache_generation():
+    """Returns the shared token identifying the current catalog contents.
+
+    A random token rather than a counter means an evicted token can never be mistaken
+    for an earlier generation.
+    """
+    cache.add(GENERATION_KEY, uuid4().hex, timeout=0)
+    return cache.get(GENERATION_KEY)
+
+def serialize_record(record, fields=LISTING_FIELDS):
+    """Returns the /questions listing representation of a question record."""
+    data = {field: getattr(record, field) for field in fields if field in Question.DICT_FIELDS}
+    if "tags" in fields:
+        data["tags"] = list(record.tag_names)
+    if "sample_test_cases" in fields:
+        data["sample_test_cases"] = [
+            {"input": tc.inputData, "expected_output": tc.expectedOutput}
+            for tc in record.testCases if tc.isSample]
+    return data
+
+def require_shared_cache(app, workers):
+    """Refuses to serve from several workers whose generation tokens can't see each other.
+
+    With a process-local cache each worker keeps its own generation, so a catalog
+    change committed in one worker would never reach the snapshots of the others.
+    """
+    cache_type = app.config.get("CACHE_TYPE", "SimpleCache").rsplit(".", 1)[-1]
+    if workers > 1 and cache_type in PROCESS_LOCAL_CACHES:
+        raise RuntimeError(f"{workers} workers need a shared cache for catalog invalidation; "
+                           f"set REDIS_URL or CACHE_TYPE instead of {cache_type}")
+
+def load_question_records():
+    """Loads every question with its tags and test cases in three queries."""
+    tag_names = {}
+    for question_id, name in (db.session.query(QuestionTag.questionID, Tag.name)
+                              .join(Tag, Tag.tagID == QuestionTag.tagID)
+                              .order_by(QuestionTag.questionTagID)):
+        tag_names.setdefault(question_id, []).append(name)
+    test_cases = {}
+    for question_id, *values in (db.session.query(
+            TestCase.questionID, TestCase.testCaseID, TestCase.inputData,
+            TestCase.expectedOutput, TestCase.isSample).order_by(TestCase.testCaseID)):
+        test_cases.setdefault(question_id, []).append(TestCaseRecord(*values))
+    rows = db.session.query(
+        Question.questionID, Question.title, Question.description, Question.difficulty,
+        Question.createdDate, Question.template_code, Question.expected_method
+    ).order_by(Question.questionID)
+    return [QuestionRecord(*row, tuple(tag_names.get(row[0], ())),
+                           tuple(test_cases.get(row[0], ())))
+            for row in rows]
+
+class CatalogSnapshot:
+    """Immutable view of the catalog with lookup indexes and pre-serialized listings.
+
+    `questions` is ordered by questionID, `by_id` maps IDs to records, `by_tag` maps
+    tag names to ordered question IDs, and `listing_json` holds each question's
+    /questions JSON so full listings are assembled without serializing.
+    """
+    __slots__ = ("generation", "questions", "ids", "by_id", "by_tag", "listing_json", "derived")
+
+    def __init__(self, generation, records):
+        self.generation = generation
+        self.questions = tuple(records)
+        self.ids = tuple(record.questionID for record in self.questions)
+        self.by_id = MappingProxyType({record.questionID: record for record in self.questions})
+        by_tag = {}
+        for record in self.questions:
+            for name in record.tag_names:
+                by_tag.setdefault(name, []).append(record.questionID)
+        self.by_tag = MappingProxyType({name: tuple(ids) for name, ids in by_tag.items()})
+        self.listing_json = MappingProxyType({
+            record.questionID: current_app.json.dumps(serialize_record(record))
+            for record in self.questions})
+        self.derived = {}
+
+    def memoize(self, key, build):
+        """Returns a structure derived from this snapshot, building it once.
+
+        Builds run without a lock because derived values may depend on each other
+        (the library page HTML is built from the library); a racing duplicate build
+        is discarded.
+        """
+        if key not in self.derived:
+            value = build()
+            self.derived.setdefault(key, value)
+        return self.derived[key]
+
+def get_snapshot():
+    """Returns the current catalog snapshot, rebuilding and swapping it in if stale."""
+    generation = cache_generation()
+    snapshot = current_app.extensions.get("catalog_snapshot")
+    if snapshot is None or snapshot.generation != generation:
+        with current_app.extensions.setdefault("catalog_snapshot_lock", threading.Lock()):
+            snapshot = current_app.extensions.get("catalog_snapshot")
+            if snapshot is None or snapshot.generation != generation:
+                # The snapshot serves every later request, so never build it from a replica.
+                with use_primary():
+                    snapshot = CatalogSnapshot(generation, load_question_records())
+                # Readers holding the old snapshot finish with it; new reads see this one.
+                current_app.extensions["catalog_snapshot"] = snapshot
+    return snapshot
+
+def get_question_record(question_id):
+    """Returns a question with its tags and test cases, or None for unknown IDs."""
+    return get_snapshot().by_id.get(question_id)
+
+def cached(key, build):
+    """Returns the value cached under `key` for the current catalog, building it on a miss.
+
+    Values live on the snapshot for the shared catalog generation, so a change
+    committed by any worker invalidates them in every worker.
+    """
+    return get_snapshot().memoize(key, build)
+
+def build_library():
+    """Builds the tag -> question summaries mapping for the library page."""
+    snapshot = get_snapshot()
+    library = {}
+    for tag_name in sorted(snapshot.by_tag):
+        records = sorted(
+            (snapshot.by_id[question_id] for question_id in snapshot.by_tag[tag_name]),
+            key=lambda record: (Question.DIFFICULTY_RANK.get(
+                record.difficulty.lower(), len(Question.DIFFICULTY_RANK)), record.questionID))
+        library[tag_name] = [
+            QuestionSummary(record.questionID, record.title, record.difficulty,
+                            record.tag_names)
+            for record in records]
+    return library
+
+def get_library():
+    """Returns the cached tag -> question summaries mapping."""
+    return cached("library", build_library)
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_flush(session, _flush_context):
+    if any(isinstance(obj, CATALOG_MODELS)
+           for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["catalog_changed"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_catalog_bulk_writes(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+            mapper.class_ in CATALOG_MODELS for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info["catalog_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop("catalog_changed", False) and has_app_context():
+        bump_catalog_version()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("catalog_changed", None)
@@ -1,16 +1,46 @@
 """Methods for code execution"""
 import os
+import signal
 import subprocess
 import tempfile
 import shutil
 import json
-from flask import Blueprint, request, jsonify
+import time
+from functools import lru_cache
+from flask import Blueprint, request, jsonify, abort, current_app
 from flask_login import login_required, current_user
-from website.models import Question, Submission
+from website.models import Submission
+from website.catalog import get_question_record
 from website.extensions import db
+from website.stats import record_submission
+from website.recommendations import remove_from_queue
+from website.mastery import schedule_mastery_update
+from website.distributions import record_usage
+from website.metrics import increment, observe
 
 code_exec_blueprint = Blueprint("code_exec", __name__)
 
+SOLUTION_TIMEOUT = 5
+MEASURE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "measure.py")
+SOLUTION_IMPORTS = (
+    "from typing import List, Dict, Tuple\n"
+    "import math\n"
+    "import heapq\n"
+    "import bisect\n"
+    "import collections\n"
+    "import itertools\n"
+    "import string\n"
+    "import re\n"
+    "import random\n"
+    "import time\n"
+    "import sys\n"
+    "import json\n"
+    "import functools\n"
+    "import operator\n"
+)
+BASELINE_SOLUTION = "class Solution:\n    def noop(self, args):\n        return None\n"
+BASELINE_RUNS = 3
+
 def execute_code(command, timeout=5):
     """Executes a command in a subprocess and returns its output and return code."""
     try:
@@ -27,70 +57,140 @@ def execute_code(command, timeout=5):
     except Exception as e:
         return (str(e), 1)
 
-def execute_code_with_test(code, test_input, expected_method):
-    """Runs code on a given test input and returns the result."""
-    temp_dir = tempfile.mkdtemp()
-    try:
-        imports = (
-            "from typing import List, Dict, Tuple\n"
-            "import math\n"
-            "import heapq\n"
-            "import bisect\n"
-            "import collections\n"
-            "import itertools\n"
-            "import string\n"
-            "import re\n"
-            "import random\n"
-            "import time\n"
-            "import sys\n"
-            "import json\n"
-            "import functools\n"
-            "import operator\n"
-        )
+def read_report(report, supervisor_returncode):
+    """Parses the supervisor's report into (exit code, wall us, peak KB) and records metrics.
 
-        runner = (
-            "\nif __name__ == '__main__':\n"
-            "    import sys, json\n"
-            "    data = sys.stdin.read().strip()\n"
-            "    args = json.loads(data)\n"
-            "    sol = Solution()\n"
-            f"    result = sol.{expected_method}(args)\n"
-            "    print(json.dumps(result))\n"  # Print as JSON
-        )
+    Without a report the supervisor itself failed, so its own exit code is used.
+    """
+    values = report.read().split()
+    if not values:
+        return supervisor_returncode, 0, None
+    returncode, runtime, peak, cpu = map(int, values)
+    observe("devready_sandbox_wall_seconds", runtime / 1e6)
+    observe("devready_sandbox_cpu_seconds", cpu / 1e6)
+    return returncode, runtime, peak
 
-        full_code = imports + code + runner
-        code_file = os.path.join(temp_dir, "solution.py")
+def run_measured(command, input_text, timeout=SOLUTION_TIMEOUT):
+    """Runs a command under the measure.py supervisor.
 
-        with open(code_file, "w", encoding="utf-8") as f:
-            f.write(full_code)
-
-        process = subprocess.run(
-            ["python3", code_file],
-            input=test_input,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if process.returncode != 0:
-            # Extract just the last line from stderr (usually the error message)
-            err_lines = process.stderr.strip().splitlines()
-            error_message = err_lines[-1] if err_lines else "Unknown error occurred."
-            return {"error": error_message}
+    Returns the completed process with the command's exit code and output, its
+    wall time in microseconds and its peak memory in KB (None if the supervisor
+    could not start the command). The figures arrive over a pipe the command
+    cannot write to, so solution code cannot fake them.
+    """
+    report_read, report_write = os.pipe()
+    with os.fdopen(report_read, encoding="utf-8") as report, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as stdin, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as stdout, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as stderr:
+        stdin.write(input_text)
+        stdin.seek(0)
+        try:
+            with subprocess.Popen(["python3", "-I", MEASURE_SCRIPT, str(report_write), *command],
+                                  stdin=stdin, stdout=stdout, stderr=stderr,
+                                  pass_fds=(report_write,), start_new_session=True) as process:
+                os.close(report_write)
+                report_write = None
+                increment("devready_sandbox_spawns_total")
+                try:
+                    process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    # The solution runs in the supervisor's process group.
+                    os.killpg(process.pid, signal.SIGKILL)
+                    increment("devready_sandbox_timeouts_total")
+                    raise
+        finally:
+            if report_write is not None:
+                os.close(report_write)
+        returncode, runtime, peak = read_report(report, process.returncode)
+        stdout.seek(0)
+        stderr.seek(0)
+        completed = subprocess.CompletedProcess(command, returncode, stdout.read(), stderr.read())
+    return completed, runtime, peak
 
-        # Parse and return the output as a proper type
-        return json.loads(process.stdout.strip())
+def build_script(code, expected_method):
+    """Wraps solution code in a script that calls `expected_method` on JSON from stdin."""
+    runner = (
+        "\nif __name__ == '__main__':\n"
+        "    import sys, json\n"
+        "    data = sys.stdin.read().strip()\n"
+        "    args = json.loads(data)\n"
+        "    sol = Solution()\n"
+        f"    result = sol.{expected_method}(args)\n"
+        "    print(json.dumps(result))\n"  # Print as JSON
+    )
+    return SOLUTION_IMPORTS + code + runner
 
+def run_script(script, test_input):
+    """Writes `script` to a temporary file and runs it under the supervisor."""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        code_file = os.path.join(temp_dir, "solution.py")
+        with open(code_file, "w", encoding="utf-8") as f:
+            f.write(script)
+        return run_measured(["python3", code_file], test_input)
     finally:
         shutil.rmtree(temp_dir)
 
+@lru_cache(maxsize=None)
+def startup_baseline():
+    """Wall time (microseconds) of a solution that does nothing, measured once per process.
+
+    Interpreter startup and the standard imports dominate a short solution's wall
+    time, so this is subtracted from every measurement. The fastest of a few runs
+    is used so a single slow start doesn't inflate it.
+    """
+    runtimes = []
+    for _ in range(BASELINE_RUNS):
+        process, runtime, _ = run_script(build_script(BASELINE_SOLUTION, "noop"), "null")
+        if process.returncode == 0:
+            runtimes.append(runtime)
+    return min(runtimes, default=0)
+
+def execute_code_with_test(code, test_input, expected_method, usage=None):
+    """Runs code on a given test input and returns the result.
+
+    If a `usage` dict is given, the solution's wall time beyond interpreter startup
+    (microseconds) and its peak memory (KB), as measured by its supervisor, are
+    added to it. Timing stays outside the solution process so it cannot be faked.
+    """
+    process, runtime, peak = run_script(build_script(code, expected_method), test_input)
+    if process.returncode != 0:
+        # Extract just the last line from stderr (usually the error message)
+        err_lines = process.stderr.strip().splitlines()
+        error_message = err_lines[-1] if err_lines else "Unknown error occurred."
+        return {"error": error_message}
+
+    if usage is not None:
+        usage["runtime"] += max(runtime - startup_baseline(), 0)
+        if peak is not None:
+            usage["memory"] = max(usage["memory"] or 0, peak)
+    # Parse and return the output as a proper type
+    return json.loads(process.stdout.strip())
+
 
 def run_tests(code, test_cases, expected_method):
-    """Runs the given user code against question's test cases."""
+    """Runs the given user code against question's test cases.
+
+    Returns the per-test results, whether all passed, and the total runtime and
+    peak memory used.
+    """
     results = []
     all_passed = True
+    usage = {"runtime": 0, "memory": None}
+    stub_seconds = None
+    if current_app.config.get("LOAD_TEST") or current_app.testing:
+        stub_seconds = current_app.config.get("SANDBOX_STUB_SECONDS")
 
     for test in test_cases:
-        actual_output = execute_code_with_test(code, test.inputData, expected_method)
+        if stub_seconds is not None:
+            # Load-test mode: stand in for the sandbox with a fixed delay and a pass.
+            time.sleep(stub_seconds)
+            usage["runtime"] += round(stub_seconds * 1e6)
+            results.append({"passed": True, "input": "Stubbed", "expected": "Stubbed",
+                            "actual": "Stubbed"})
+            continue
+        actual_output = execute_code_with_test(code, test.inputData, expected_method, usage)
         expected = json.loads(test.expectedOutput)
         passed = actual_output == expected
 
@@ -104,7 +204,7 @@ def run_tests(code, test_cases, expected_method):
         if not passed:
             all_passed = False
 
-    return results, all_passed
+    return results, all_passed, usage
 
 
 @code_exec_blueprint.route("/run/<int:question_id>", methods=["POST"])
@@ -118,9 +218,11 @@ def run_code_samples(question_id):
         return jsonify({"error": "No code provided"}), 400
 
     try:
-        question = Question.query.get_or_404(question_id)
+        question = get_question_record(question_id)
+        if question is None:
+            abort(404)
         sample_tests = [test for test in question.testCases if test.isSample]
-        results, all_passed = run_tests(code, sample_tests, question.expected_method)
+        results, all_passed, _ = run_tests(code, sample_tests, question.expected_method)
 
         return jsonify({
             "passed": all_passed,
@@ -139,23 +241,37 @@ def submit_solution(question_id):
     if not code:
         return jsonify({"error": "No code provided"}), 400
 
-    question = Question.query.get_or_404(question_id)
-    results, all_passed = run_tests(code, question.testCases, question.expected_method)
+    question = get_question_record(question_id)
+    if question is None:
+        abort(404)
+    results, all_passed, usage = run_tests(code, question.testCases, question.expected_method)
+    if not all_passed:
+        usage = {"runtime": None, "memory": None}
 
     try:
+        record_submission(current_user.userID, question_id, all_passed)
+        remove_from_queue(current_user.userID, question_id)
+        ranks = record_usage(question_id, usage) if all_passed else {}
         submission = Submission(
             userID=current_user.userID,
             questionID=question_id,
             code=code,
             result="Passed" if all_passed else "Failed",
+            runtime=usage["runtime"],
+            memory=usage["memory"],
             language="python"
         )
         db.session.add(submission)
         db.session.commit()
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": f"Failed to save submission: {str(e)}"}), 500
 
+    schedule_mastery_update(current_user.userID, question_id, all_passed)
+
     return jsonify({
         "passed": all_passed,
-        "results": results
+        "results": results,
+        "usage": usage,
+        "ranks": ranks
     })
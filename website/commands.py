@@ -0,0 +1,59 @@
+"""Flask CLI commands for maintaining DevReady data."""
+import click
+from flask import Blueprint, current_app
+from .assets import build_assets, brotli
+from .importer import DEFAULT_BATCH_SIZE, CatalogImportError, import_questions
+from .mastery import backfill_mastery
+from .startup import boot_report
+from .stats import rebuild_question_stats
+
+commands_blueprint = Blueprint("commands", __name__, cli_group=None)
+
+@commands_blueprint.cli.command("rebuild-question-stats")
+def rebuild_question_stats_command():
+    """Recompute per-question submission statistics from submission history."""
+    count = rebuild_question_stats()
+    click.echo(f"Rebuilt statistics for {count} questions.")
+
+@commands_blueprint.cli.command("backfill-mastery")
+@click.option("--batch-size", default=1000, show_default=True,
+              help="Submissions read per batch.")
+def backfill_mastery_command(batch_size):
+    """Recompute every user's mastery scores from submission history."""
+    count = backfill_mastery(batch_size)
+    click.echo(f"Recomputed mastery scores for {count} users.")
+
+@commands_blueprint.cli.command("import-questions")
+@click.argument("path", type=click.Path(exists=True))
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="Questions or test cases written per batch.")
+def import_questions_command(path, batch_size):
+    """Import questions from a JSON Lines file or a directory of question bundles."""
+    try:
+        counts = import_questions(path, batch_size)
+    except CatalogImportError as error:
+        raise click.ClickException(str(error)) from error
+    click.echo(f"Created {counts['created']} and updated {counts['updated']} questions "
+               f"with {counts['test_cases']} test cases.")
+
+@commands_blueprint.cli.command("boot-report")
+@click.option("--top", default=15, show_default=True, help="Packages listed by import time.")
+def boot_report_command(top):
+    """Boot the app in a fresh interpreter and show where startup time goes."""
+    phases, imports = boot_report()
+    click.echo("Phase           ms")
+    for name, elapsed in phases.items():
+        click.echo(f"{name:<12}{elapsed:>8.1f}")
+    click.echo(f"{'total':<12}{sum(phases.values()):>8.1f}")
+    click.echo("\nPackage                    import ms")
+    for name, self_us in imports.most_common(top):
+        click.echo(f"{name:<24}{self_us / 1000:>12.1f}")
+
+@commands_blueprint.cli.command("build-assets")
+def build_assets_command():
+    """Fingerprint and precompress static files into ASSET_BUILD_DIR."""
+    build_dir = current_app.config["ASSET_BUILD_DIR"]
+    manifest = build_assets(current_app.static_folder, build_dir)
+    click.echo(f"Built {len(manifest)} assets into {build_dir}.")
+    if brotli is None:
+        click.echo("The brotli module is not installed; only gzip variants were written.")
@@ -0,0 +1,240 @@
+"""Local static complexity analysis for submitted Python solutions."""
+import ast
+
+SORT_CALLS = {"sorted", "sort"}
+HEAP_CALLS = {"heappush", "heappop", "heapify", "heappushpop", "heapreplace",
+              "nlargest", "nsmallest"}
+CONTAINER_CALLS = {"list", "dict", "set", "deque", "defaultdict", "Counter", "OrderedDict"}
+GROWTH_METHODS = {"append", "appendleft", "add", "extend", "insert", "update", "setdefault"}
+MEMO_DECORATORS = {"cache", "lru_cache"}
+
+class ComplexityVisitor(ast.NodeVisitor):
+    """Collects structural signals (loops, recursion, library calls) from a module AST."""
+
+    def __init__(self):
+        self.loop_depth = 0
+        self.max_loop_depth = 0
+        self.has_log_loop = False
+        self.sort_depth = None
+        self.heap_depth = None
+        self.max_growth_depth = None
+        self.function_stack = []
+        self.recursive_calls = {}
+        self.traversals = set()
+        self.halving = set()
+        self.memoized = set()
+
+    def _enter_loop(self, node, logarithmic=False):
+        if logarithmic:
+            self.has_log_loop = True
+            self.generic_visit(node)
+            return
+        self.loop_depth += 1
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    def _record_growth(self, depth):
+        if depth and (self.max_growth_depth is None or depth > self.max_growth_depth):
+            self.max_growth_depth = depth
+
+    def visit_FunctionDef(self, node):  # pylint: disable=invalid-name
+        """Tracks the enclosing function so self-calls can be detected."""
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            name = target.attr if isinstance(target, ast.Attribute) else getattr(target, "id", "")
+            if name in MEMO_DECORATORS:
+                self.memoized.add(node.name)
+        self.function_stack.append(node.name)
+        outer_depth, self.loop_depth = self.loop_depth, 0
+        self.generic_visit(node)
+        self.loop_depth = outer_depth
+        self.function_stack.pop()
+        if any(_is_recursive_call(child, node.name) for child in ast.walk(node)):
+            self.recursive_calls[node.name] = max(self.recursive_calls.get(node.name, 0),
+                                                  _calls_on_path(node.body, node.name))
+            if _is_halving(node):
+                self.halving.add(node.name)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_For(self, node):  # pylint: disable=invalid-name
+        """A `for` loop adds one level of linear nesting."""
+        self._enter_loop(node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):  # pylint: disable=invalid-name
+        """A `while` loop that halves its range (binary search) is logarithmic."""
+        self._enter_loop(node, logarithmic=_is_halving(node))
+
+    def _visit_comprehension(self, node):
+        for _ in node.generators:
+            self.loop_depth += 1
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        self.generic_visit(node)
+        self._record_growth(self.loop_depth)
+        self.loop_depth -= len(node.generators)
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+
+    def visit_GeneratorExp(self, node):  # pylint: disable=invalid-name
+        """Generators iterate like loops but do not allocate a container."""
+        for _ in node.generators:
+            self.loop_depth += 1
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        self.generic_visit(node)
+        self.loop_depth -= len(node.generators)
+
+    def visit_Call(self, node):  # pylint: disable=invalid-name
+        """Classifies calls: recursion, sorting, heap operations and container growth."""
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+
+        if self.function_stack and self.loop_depth and _is_recursive_call(
+                node, self.function_stack[-1]):
+            # Recursing once per loop item walks a tree or graph rather than branching.
+            self.traversals.add(name)
+        if name in SORT_CALLS:
+            self.sort_depth = max(self.sort_depth or 0, self.loop_depth)
+        if name in HEAP_CALLS:
+            self.heap_depth = max(self.heap_depth or 0, self.loop_depth)
+            if name == "heappush":
+                self._record_growth(self.loop_depth)
+        if name in GROWTH_METHODS and isinstance(func, ast.Attribute):
+            self._record_growth(self.loop_depth)
+        if name in CONTAINER_CALLS and node.args:
+            self._record_growth(max(self.loop_depth, 1))
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):  # pylint: disable=invalid-name
+        """Item assignment inside a loop (e.g. `seen[x] = i`) grows a container."""
+        if isinstance(node.ctx, ast.Store):
+            self._record_growth(self.loop_depth)
+        self.generic_visit(node)
+
+def _is_recursive_call(node, function_name):
+    """Returns True if `node` calls `function_name` directly or through `self`."""
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id == function_name
+    return (isinstance(func, ast.Attribute) and func.attr == function_name
+            and isinstance(func.value, ast.Name) and func.value.id == "self")
+
+def _count_calls(node, function_name):
+    return sum(_is_recursive_call(child, function_name) for child in ast.walk(node))
+
+def _terminates(statements):
+    return bool(statements) and isinstance(statements[-1], (ast.Return, ast.Raise))
+
+def _calls_on_path(statements, function_name):
+    """Returns the most recursive calls one invocation can make along a single path.
+
+    Calls in exclusive branches (`if`/`else`, or an `if` that returns before later
+    calls) are alternatives, not fan-out; a call inside a loop counts once.
+    """
+    total = 0
+    for index, statement in enumerate(statements):
+        if not isinstance(statement, ast.If):
+            total += _count_calls(statement, function_name)
+            continue
+        total += _count_calls(statement.test, function_name)
+        body = _calls_on_path(statement.body, function_name)
+        orelse = _calls_on_path(statement.orelse, function_name)
+        if _terminates(statement.body) or _terminates(statement.orelse):
+            rest = _calls_on_path(statements[index + 1:], function_name)
+            body += 0 if _terminates(statement.body) else rest
+            orelse += 0 if _terminates(statement.orelse) else rest
+            return total + max(body, orelse)
+        total += max(body, orelse)
+    return total
+
+def _is_halving(node):
+    """Returns True if `node` divides or shifts a bound by two, as in binary search."""
+    for child in ast.walk(node):
+        if isinstance(child, (ast.BinOp, ast.AugAssign)) and isinstance(
+                child.op, (ast.FloorDiv, ast.RShift)):
+            value = child.right if isinstance(child, ast.BinOp) else child.value
+            if isinstance(value, ast.Constant) and value.value in (1, 2):
+                return True
+    return False
+
+def format_complexity(power, logs=0, exponential=False):
+    """Formats a complexity class, e.g. (2, 1) -> 'O(n^2 log n)'."""
+    if exponential:
+        return "O(2^n)"
+    terms = []
+    if power == 1:
+        terms.append("n")
+    elif power > 1:
+        terms.append(f"n^{power}")
+    if logs == 1:
+        terms.append("log n")
+    elif logs > 1:
+        terms.append(f"log^{logs} n")
+    return f"O({' '.join(terms) or '1'})"
+
+def analyze_complexity(code):
+    """Estimates time/space complexity of `code` from its AST.
+
+    Returns None if the code cannot be parsed, so callers can fall back to the LLM.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+
+    visitor = ComplexityVisitor()
+    visitor.visit(tree)
+
+    recursive = set(visitor.recursive_calls)
+    branching = {name for name in recursive
+                 if visitor.recursive_calls[name] > 1 and name not in visitor.memoized}
+    # Single-path recursion that halves its range is a recursive binary search.
+    halving = (recursive & visitor.halving) - branching
+    linear = recursive - branching - halving
+
+    power = visitor.max_loop_depth
+    logs = 1 if visitor.has_log_loop or halving else 0
+    if linear:
+        # A loop that only drives the recursion (visiting children) adds no extra factor.
+        extra_loop = visitor.max_loop_depth and not branching and linear - visitor.traversals
+        power = max(power, 1) + (1 if extra_loop else 0)
+    if visitor.sort_depth is not None:
+        if visitor.sort_depth + 1 >= power:
+            power, logs = visitor.sort_depth + 1, max(logs, 1)
+    if visitor.heap_depth is not None and visitor.heap_depth >= power:
+        power, logs = max(visitor.heap_depth, 1), max(logs, 1)
+
+    space_power = visitor.max_growth_depth or 0
+    space_logs = 1 if halving and not space_power else 0
+    if linear or branching:
+        space_power, space_logs = max(space_power, 1), 0
+
+    notes = []
+    if branching:
+        notes.append("Multiple recursive calls without memoization grow exponentially.")
+    if visitor.memoized & recursive:
+        notes.append("Memoized recursion: each subproblem is solved once.")
+    if visitor.sort_depth:
+        notes.append("Sorting inside a loop multiplies the loop cost by n log n.")
+    if visitor.max_growth_depth and visitor.max_growth_depth > 1:
+        notes.append("Containers are grown inside nested loops.")
+
+    return {
+        "time_complexity": format_complexity(power, logs, exponential=bool(branching)),
+        "space_complexity": format_complexity(space_power, space_logs),
+        "signals": {
+            "max_loop_depth": visitor.max_loop_depth,
+            "recursive_functions": sorted(recursive),
+            "memoized": sorted(visitor.memoized & recursive),
+            "sorts": visitor.sort_depth is not None,
+            "heap_operations": visitor.heap_depth is not None,
+            "container_growth_depth": visitor.max_growth_depth or 0,
+        },
+        "notes": notes,
+    }
@@ -0,0 +1,73 @@
+"""Database engine profile and read-replica routing."""
+from contextlib import contextmanager
+from functools import wraps
+from importlib.util import find_spec
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+MYSQL_DRIVERS = ("mysqldb", "pymysql")
+
+def default_mysql_driver():
+    """Prefers the C mysqlclient driver, falling back to PyMySQL if it isn't installed."""
+    return "mysqldb" if find_spec("MySQLdb") else "pymysql"
+
+def database_url(url, driver=None):
+    """Rewrites a plain `mysql://` URL (as given by JawsDB) to use the chosen driver."""
+    if not url or not url.startswith("mysql://"):
+        return url
+    driver = driver or default_mysql_driver()
+    if driver not in MYSQL_DRIVERS:
+        raise ValueError(f"DB_DRIVER must be one of: {', '.join(MYSQL_DRIVERS)}")
+    return url.replace("mysql://", f"mysql+{driver}://", 1)
+
+def engine_options(url, environ):
+    """Builds pool settings for server databases; SQLite keeps SQLAlchemy's defaults.
+
+    Recycling connections before MySQL's idle timeout and pinging them on checkout
+    avoids "server has gone away" errors after quiet periods. Pool sizes are per
+    process, so they should be sized against the number of gunicorn workers.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(environ.get("DB_POOL_SIZE", 5)),
+        "max_overflow": int(environ.get("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": int(environ.get("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(environ.get("DB_POOL_RECYCLE", 280)),
+        "pool_pre_ping": environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+class RoutingSession(Session):
+    """Sends reads to the replica bind during requests marked with `read_replica`.
+
+    Flushes always go to the primary, as does everything when no replica is configured.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context()
+                and g.get("use_replica") and REPLICA_BIND in self._db.engines):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def read_replica(view):
+    """Marks a read-only view so its queries may be served by the replica."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.use_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+@contextmanager
+def use_primary():
+    """Routes queries in the block to the primary even inside a `read_replica` view.
+
+    For reads whose results outlive the request, such as shared caches, which must
+    not be built from a lagging replica.
+    """
+    previous = g.pop("use_replica", None) if has_request_context() else None
+    try:
+        yield
+    finally:
+        if previous is not None:
+            g.use_replica = previous
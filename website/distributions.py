@@ -0,0 +1,96 @@
+"""Per-question runtime and memory distributions for "faster than X%" rankings."""
+import math
+import struct
+from .extensions import db
+from .models import QuestionDistribution, insert_ignoring_duplicates
+
+METRICS = ("runtime", "memory")
+BUCKETS_PER_DOUBLING = 4
+BUCKET_COUNT = 160
+COUNTS_FORMAT = f"<{BUCKET_COUNT}I"
+
+class LogHistogram:
+    """Fixed log-scale histogram: bucket i holds values in [2^(i/4), 2^((i+1)/4)).
+
+    Each bucket spans about 19%, so ranks are accurate to within one bucket. Histograms
+    with the same layout merge by adding counts, and serialize to 640 bytes.
+    """
+
+    def __init__(self, counts=None):
+        self.counts = list(counts) if counts else [0] * BUCKET_COUNT
+
+    @staticmethod
+    def bucket(value):
+        """Returns the bucket index for a non-negative value."""
+        if value < 1:
+            return 0
+        return min(int(math.log2(value) * BUCKETS_PER_DOUBLING), BUCKET_COUNT - 1)
+
+    @property
+    def total(self):
+        """Number of values recorded."""
+        return sum(self.counts)
+
+    def add(self, value):
+        """Records one value."""
+        self.counts[self.bucket(value)] += 1
+
+    def merge(self, other):
+        """Adds another histogram's counts into this one."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def rank(self, value):
+        """Percentage of recorded values above `value`, counting its own bucket as half."""
+        total = self.total
+        if not total:
+            return None
+        index = self.bucket(value)
+        above = sum(self.counts[index + 1:]) + self.counts[index] / 2
+        return round(above / total * 100, 1)
+
+    def to_bytes(self):
+        """Serializes the counts as little-endian 32-bit integers."""
+        return struct.pack(COUNTS_FORMAT, *self.counts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restores a histogram written by `to_bytes`."""
+        return cls(struct.unpack(COUNTS_FORMAT, data))
+
+def _locked_rows(question_id):
+    return {row.metric: row for row in QuestionDistribution.query.filter_by(
+        questionID=question_id).with_for_update()}
+
+def record_usage(question_id, usage):
+    """Adds a passing submission's usage to the question's histograms.
+
+    Returns the submission's rank for each metric as the percentage of passing
+    submissions that used more. Rows are locked for the update on databases that
+    support it; the caller commits.
+    """
+    metrics = [metric for metric in METRICS if usage.get(metric) is not None]
+    rows = _locked_rows(question_id)
+    missing = [metric for metric in metrics if metric not in rows]
+    if missing:
+        # Concurrent first submissions may both get here; only one row is created.
+        empty = LogHistogram().to_bytes()
+        db.session.execute(
+            insert_ignoring_duplicates(QuestionDistribution, db.session.get_bind().dialect.name),
+            [{"questionID": question_id, "metric": metric, "counts": empty, "total": 0}
+             for metric in missing])
+        rows = _locked_rows(question_id)
+    ranks = {}
+    for metric in metrics:
+        value = usage[metric]
+        row = rows[metric]
+        histogram = LogHistogram.from_bytes(row.counts)
+        histogram.add(value)
+        row.counts = histogram.to_bytes()
+        row.total = histogram.total
+        ranks[metric] = histogram.rank(value)
+    return ranks
+
+def get_rank(question_id, metric, value):
+    """Returns the percentage of passing submissions that used more than `value`, or None."""
+    row = db.session.get(QuestionDistribution, (question_id, metric))
+    return LogHistogram.from_bytes(row.counts).rank(value) if row else None
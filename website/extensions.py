@@ -1,4 +1,9 @@
 """Necessary extensions for the website."""
+from flask_caching import Cache
+from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from .database import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+migrate = Migrate()
+cache = Cache()
@@ -0,0 +1,120 @@
+"""Process-local cache of logged-in user identities for Flask-Login."""
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from flask import current_app, has_app_context
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .extensions import db
+from .models import User
+
+DEFAULT_TTL = 60
+DEFAULT_SIZE = 1024
+
+class UserIdentity(UserMixin):
+    """Compact, detached snapshot of a User that is enough to render most pages.
+
+    Call `load()` for the full ORM user when relationships are needed.
+    """
+    __slots__ = ("userID", "username", "email")
+
+    def __init__(self, userID, username, email):
+        self.userID = userID
+        self.username = username
+        self.email = email
+
+    def get_id(self):
+        """Returns the user ID as a string."""
+        return str(self.userID)
+
+    def load(self):
+        """Returns the ORM User this identity was taken from."""
+        return db.session.get(User, self.userID)
+
+class IdentityCache:
+    """Thread-safe LRU of user identities whose entries expire after `ttl` seconds.
+
+    Entries are dropped when their user changes in this process; other workers
+    notice the change once the entry expires.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, size=DEFAULT_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        """Returns a fresh cached identity, or None."""
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id, identity):
+        """Caches an identity, evicting the least recently used one when full."""
+        with self.lock:
+            self.entries[user_id] = (time.monotonic() + self.ttl, identity)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_ids=None):
+        """Drops the given users, or every entry when `user_ids` is None."""
+        with self.lock:
+            if user_ids is None:
+                self.entries.clear()
+            for user_id in user_ids or ():
+                self.entries.pop(user_id, None)
+
+def get_identity_cache():
+    """Returns this app's identity cache, creating it from config on first use."""
+    if "identity_cache" not in current_app.extensions:
+        current_app.extensions["identity_cache"] = IdentityCache(
+            current_app.config.get("USER_CACHE_TTL", DEFAULT_TTL),
+            current_app.config.get("USER_CACHE_SIZE", DEFAULT_SIZE))
+    return current_app.extensions["identity_cache"]
+
+def load_identity(user_id):
+    """Flask-Login user loader: returns a cached UserIdentity, querying only on a miss."""
+    cache = get_identity_cache()
+    identity = cache.get(user_id)
+    if identity is None:
+        row = (db.session.query(User.userID, User.username, User.email)
+               .filter(User.userID == user_id).first())
+        if row is None:
+            return None
+        identity = UserIdentity(*row)
+        cache.put(user_id, identity)
+    return identity
+
+@event.listens_for(Session, "after_flush")
+def _track_user_flush(session, _flush_context):
+    changed = {obj.userID for obj in chain(session.dirty, session.deleted)
+               if isinstance(obj, User)}
+    if changed:
+        changed_users = session.info.setdefault("changed_users", set())
+        if changed_users is not None:
+            changed_users.update(changed)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_user_bulk_writes(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+            mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info["changed_users"] = None
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if "changed_users" in session.info and has_app_context():
+        get_identity_cache().invalidate(session.info.pop("changed_users"))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("changed_users", None)
@@ -0,0 +1,195 @@
+"""Streaming bulk import of questions, tags and test cases."""
+import json
+import os
+from sqlalchemy import insert, update
+from .catalog import bump_catalog_version
+from .extensions import db
+from .models import Question, QuestionTag, RecommendationQueue, Tag, TestCase
+
+DEFAULT_BATCH_SIZE = 500
+QUESTION_COLUMNS = ("description", "difficulty", "template_code", "expected_method")
+BUNDLE_QUESTION_FILE = "question.json"
+BUNDLE_TESTS_FILE = "tests.jsonl"
+
+class CatalogImportError(ValueError):
+    """Raised when an import file is malformed."""
+
+def read_jsonl(path):
+    """Yields one parsed object per non-blank line of a JSON Lines file."""
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise CatalogImportError(f"{path}:{line_number}: {error}") from error
+
+def as_text(value):
+    """Stores test data as JSON text unless it is already a string."""
+    return value if isinstance(value, str) else json.dumps(value)
+
+def as_flag(value, source):
+    """Parses a boolean field, accepting JSON booleans and "true"/"false"-style strings."""
+    if not isinstance(value, str):
+        return bool(value)
+    flag = value.strip().lower()
+    if flag in ("true", "1", "yes"):
+        return True
+    if flag in ("false", "0", "no", ""):
+        return False
+    raise CatalogImportError(f"{source}: expected a boolean, got {value!r}")
+
+def validate_question(data, source):
+    """Checks the required question fields and returns the normalized record."""
+    if not isinstance(data, dict):
+        raise CatalogImportError(f"{source}: expected a JSON object, got {type(data).__name__}")
+    missing = [field for field in ("title", "description", "difficulty") if not data.get(field)]
+    if missing:
+        raise CatalogImportError(f"{source}: missing {', '.join(missing)}")
+    if len(data["title"]) > Question.title.type.length:
+        raise CatalogImportError(f"{source}: title longer than {Question.title.type.length}")
+    return data
+
+def validate_test_case(data, source):
+    """Converts an imported test case into TestCase column values."""
+    if not isinstance(data, dict):
+        raise CatalogImportError(f"{source}: test case must be a JSON object")
+    if "input" not in data or "expected_output" not in data:
+        raise CatalogImportError(f"{source}: test case needs input and expected_output")
+    return {"inputData": as_text(data["input"]),
+            "expectedOutput": as_text(data["expected_output"]),
+            "isSample": as_flag(data.get("is_sample", False), source)}
+
+class CatalogImporter:
+    """Upserts questions by title in batches using bulk INSERT/UPDATE statements.
+
+    Only `batch_size` questions or test cases are held in memory at a time, and
+    each batch is committed on its own.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.question_ids = dict(db.session.query(Question.title, Question.questionID))
+        self.tag_ids = dict(db.session.query(Tag.name, Tag.tagID))
+        self.pending = {}
+        self.counts = {"created": 0, "updated": 0, "test_cases": 0}
+        self.committed = False
+
+    def add(self, data, source, tests_path=None):
+        """Queues one question; its external test file, if any, is streamed right away."""
+        data = validate_question(data, source)
+        self.pending[data["title"]] = (data, source)
+        if tests_path or len(self.pending) >= self.batch_size:
+            self.flush()
+        if tests_path:
+            question_id = self.question_ids[data["title"]]
+            self.insert_test_cases(
+                (question_id, validate_test_case(test, tests_path))
+                for test in read_jsonl(tests_path))
+            db.session.commit()
+            self.committed = True
+
+    def flush(self):
+        """Writes all queued questions with their tags and inline test cases."""
+        if not self.pending:
+            return
+        batch = list(self.pending.values())
+        self.pending = {}
+        new = [data for data, _ in batch if data["title"] not in self.question_ids]
+        existing = [data for data, _ in batch if data["title"] in self.question_ids]
+
+        if new:
+            db.session.execute(insert(Question), [
+                {"title": data["title"],
+                 **{column: data.get(column) for column in QUESTION_COLUMNS}}
+                for data in new])
+            titles = [data["title"] for data in new]
+            self.question_ids.update(db.session.query(Question.title, Question.questionID)
+                                     .filter(Question.title.in_(titles)))
+        if existing:
+            ids = [self.question_ids[data["title"]] for data in existing]
+            db.session.execute(update(Question), [
+                {"questionID": self.question_ids[data["title"]],
+                 **{column: data.get(column) for column in QUESTION_COLUMNS}}
+                for data in existing])
+            TestCase.query.filter(TestCase.questionID.in_(ids)).delete()
+            QuestionTag.query.filter(QuestionTag.questionID.in_(ids)).delete()
+
+        self.ensure_tags({name for data, _ in batch for name in data.get("tags", [])})
+        question_tags = [
+            {"questionID": self.question_ids[data["title"]], "tagID": self.tag_ids[name]}
+            for data, _ in batch for name in dict.fromkeys(data.get("tags", []))]
+        if question_tags:
+            db.session.execute(insert(QuestionTag), question_tags)
+
+        self.insert_test_cases(
+            (self.question_ids[data["title"]], validate_test_case(test, source))
+            for data, source in batch for test in data.get("test_cases", []))
+        db.session.commit()
+        self.committed = True
+        self.counts["created"] += len(new)
+        self.counts["updated"] += len(existing)
+
+    def ensure_tags(self, names):
+        """Creates any tags that don't exist yet."""
+        missing = sorted(name for name in names if name not in self.tag_ids)
+        if missing:
+            db.session.execute(insert(Tag), [{"name": name} for name in missing])
+            self.tag_ids.update(db.session.query(Tag.name, Tag.tagID)
+                                .filter(Tag.name.in_(missing)))
+
+    def insert_test_cases(self, rows):
+        """Bulk-inserts (questionID, test case values) pairs `batch_size` rows at a time."""
+        buffer = []
+        for question_id, values in rows:
+            buffer.append({"questionID": question_id, **values})
+            if len(buffer) >= self.batch_size:
+                db.session.execute(insert(TestCase), buffer)
+                self.counts["test_cases"] += len(buffer)
+                buffer = []
+        if buffer:
+            db.session.execute(insert(TestCase), buffer)
+            self.counts["test_cases"] += len(buffer)
+
+def iter_sources(path):
+    """Yields (question data, source label, external tests path or None) from a file or directory.
+
+    A directory may hold JSON Lines files and bundle subdirectories, each with a
+    question.json and an optional tests.jsonl of (typically hidden) test cases.
+    """
+    if os.path.isfile(path):
+        for line_number, data in enumerate(read_jsonl(path), 1):
+            yield data, f"{path}:{line_number}", None
+        return
+    for name in sorted(os.listdir(path)):
+        entry = os.path.join(path, name)
+        if os.path.isdir(entry) and os.path.isfile(os.path.join(entry, BUNDLE_QUESTION_FILE)):
+            question_file = os.path.join(entry, BUNDLE_QUESTION_FILE)
+            with open(question_file, encoding="utf-8") as file:
+                try:
+                    data = json.load(file)
+                except json.JSONDecodeError as error:
+                    raise CatalogImportError(f"{question_file}: {error}") from error
+            tests_path = os.path.join(entry, BUNDLE_TESTS_FILE)
+            yield data, question_file, tests_path if os.path.isfile(tests_path) else None
+        elif name.endswith(".jsonl"):
+            yield from iter_sources(entry)
+
+def import_questions(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Imports every question under `path`, upserting by title. Returns the import counts."""
+    importer = CatalogImporter(batch_size)
+    try:
+        for data, source, tests_path in iter_sources(path):
+            importer.add(data, source, tests_path)
+        importer.flush()
+    except Exception:
+        db.session.rollback()
+        # Earlier batches are already committed, so cached catalog reads must not outlive them.
+        if importer.committed:
+            bump_catalog_version()
+        raise
+    RecommendationQueue.query.delete()
+    db.session.commit()
+    bump_catalog_version()
+    return importer.counts
@@ -0,0 +1,120 @@
+"""Incremental MasteryScore updates driven by submissions."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import and_, or_
+from .extensions import db
+from .metrics import observe
+from .models import MasteryScore, QuestionTag, Submission
+from .recommendations import invalidate_queue, remove_from_queue, rescore_queue
+
+DEFAULT_ALPHA = 0.3
+INITIAL_SCORE = 50.0
+PASS_TARGET = 100.0
+FAIL_TARGET = 0.0
+
+def updated_score(score, passed, alpha=DEFAULT_ALPHA):
+    """Moves a score a fraction `alpha` of the way toward 100 on a pass or 0 on a fail."""
+    target = PASS_TARGET if passed else FAIL_TARGET
+    return score + alpha * (target - score)
+
+def apply_submission(user_id, question_id, passed):
+    """Updates the user's scores for the question's tags, touching only those rows.
+
+    The question leaves the user's recommendation queue and queued questions on the
+    same tags are re-ranked in place, so the next page load can still use the queue.
+    """
+    alpha = current_app.config.get("MASTERY_ALPHA", DEFAULT_ALPHA)
+    tag_ids = [tag_id for (tag_id,) in
+               db.session.query(QuestionTag.tagID).filter_by(questionID=question_id)]
+    remove_from_queue(user_id, question_id)
+    if not tag_ids:
+        db.session.commit()
+        return
+    scores = {score.tagID: score for score in MasteryScore.query.filter(
+        MasteryScore.userID == user_id, MasteryScore.tagID.in_(tag_ids))}
+    for tag_id in tag_ids:
+        score = scores.get(tag_id)
+        if score is None:
+            score = MasteryScore(userID=user_id, tagID=tag_id, score=INITIAL_SCORE)
+            db.session.add(score)
+        score.score = updated_score(score.score, passed, alpha)
+    rescore_queue(user_id, tag_ids)
+    db.session.commit()
+
+def _run_update(app, user_id, question_id, passed, queued):
+    observe("devready_mastery_queue_wait_seconds", time.perf_counter() - queued)
+    with app.app_context():
+        try:
+            apply_submission(user_id, question_id, passed)
+        # A failed update must not kill the worker thread.
+        except Exception:  # pylint: disable=broad-exception-caught
+            db.session.rollback()
+            app.logger.exception("Mastery update failed for user %s", user_id)
+
+def schedule_mastery_update(user_id, question_id, passed):
+    """Queues a mastery update to run after the response, off the request path.
+
+    Updates run on a single background thread per process so a user's scores are
+    applied in submission order. Set MASTERY_ASYNC_UPDATES to False (the default
+    under testing) to apply them inline.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    if not app.config.get("MASTERY_ASYNC_UPDATES", not app.testing):
+        apply_submission(user_id, question_id, passed)
+        return
+    executor = app.extensions.get("mastery_executor")
+    if executor is None:
+        executor = app.extensions["mastery_executor"] = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mastery")
+    executor.submit(_run_update, app, user_id, question_id, passed, time.perf_counter())
+
+def _save_user_scores(user_id, scores):
+    MasteryScore.query.filter_by(userID=user_id).delete()
+    db.session.add_all([MasteryScore(userID=user_id, tagID=tag_id, score=score)
+                        for tag_id, score in scores.items()])
+    invalidate_queue(user_id)
+
+def backfill_mastery(batch_size=1000):
+    """Recomputes every user's scores by replaying submission history in order.
+
+    Submissions are read in keyset-paginated batches ordered by user, so only one
+    user's scores are held in memory at a time. Returns the number of users updated.
+    """
+    alpha = current_app.config.get("MASTERY_ALPHA", DEFAULT_ALPHA)
+    question_tags = {}
+    for question_id, tag_id in db.session.query(QuestionTag.questionID, QuestionTag.tagID):
+        question_tags.setdefault(question_id, []).append(tag_id)
+
+    current_user_id, scores, users = None, {}, 0
+    last_user_id, last_submission_id = 0, 0
+    while True:
+        batch = (
+            db.session.query(Submission.userID, Submission.submissionID,
+                             Submission.questionID, Submission.result)
+            .filter(or_(Submission.userID > last_user_id,
+                        and_(Submission.userID == last_user_id,
+                             Submission.submissionID > last_submission_id)))
+            .order_by(Submission.userID, Submission.submissionID)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        for user_id, submission_id, question_id, result in batch:
+            if user_id != current_user_id:
+                if current_user_id is not None:
+                    _save_user_scores(current_user_id, scores)
+                    users += 1
+                current_user_id, scores = user_id, {}
+            for tag_id in question_tags.get(question_id, ()):
+                scores[tag_id] = updated_score(scores.get(tag_id, INITIAL_SCORE),
+                                               result == "Passed", alpha)
+            last_user_id, last_submission_id = user_id, submission_id
+        db.session.commit()
+
+    if current_user_id is not None:
+        _save_user_scores(current_user_id, scores)
+        users += 1
+        db.session.commit()
+    return users
@@ -0,0 +1,36 @@
+"""Runs a command and reports its wall time, peak memory and CPU time on a private pipe.
+
+Usage: python3 -I measure.py REPORT_FD COMMAND...
+
+code_execution starts this small supervisor rather than the solution itself for
+two reasons. The kernel's peak RSS for a process includes whatever its parent
+had mapped when it forked, so measuring from the web worker would count the
+worker's own memory. And the report goes to REPORT_FD, which the command does
+not inherit, so solution code cannot write fake figures there. The command's
+standard streams are passed through untouched.
+
+Only the standard library is used, since this runs outside the application.
+"""
+import os
+import subprocess
+import sys
+import time
+
+
+def main():
+    """Runs the command and writes "<exit code> <wall us> <peak KB> <CPU us>" to REPORT_FD."""
+    report_fd, command = int(sys.argv[1]), sys.argv[2:]
+    started = time.perf_counter()
+    # close_fds (the default) keeps REPORT_FD out of the command.
+    with subprocess.Popen(command) as process:
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - started
+    with os.fdopen(report_fd, "w", encoding="utf-8") as report:
+        cpu = rusage.ru_utime + rusage.ru_stime
+        report.write(f"{process.returncode} {round(elapsed * 1e6)} {rusage.ru_maxrss} "
+                     f"{round(cpu * 1e6)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Request, SQL, sandbox and AI metrics, exported in Prometheus text format.
+
+Figures are recorded with prometheus_client. Under several gunicorn workers, set
+PROMETHEUS_MULTIPROC_DIR: every worker then writes its figures to memory-mapped
+files in that directory, and whichever worker answers a scrape aggregates all of
+them, so counters stay monotonic across scrapes. Without it figures stay in the
+process, which is only correct for a single worker.
+"""
+import glob
+import hmac
+import os
+import threading
+import time
+from flask import Blueprint, Response, abort, current_app, g, has_request_context, request
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram
+from prometheus_client import generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# name -> (type, help text, histogram buckets or None, label names)
+METRICS = {
+    "devready_request_duration_seconds": (
+        "histogram", "Request latency by endpoint.", LATENCY_BUCKETS,
+        ("endpoint", "method", "status")),
+    "devready_request_sql_queries": (
+        "histogram", "SQL statements issued per request by endpoint.", QUERY_BUCKETS,
+        ("endpoint",)),
+    "devready_request_sql_seconds": (
+        "histogram", "Time spent in SQL per request by endpoint.", LATENCY_BUCKETS,
+        ("endpoint",)),
+    "devready_sql_queries_total": (
+        "counter", "SQL statements executed, inside and outside requests.", None, ()),
+    "devready_sandbox_spawns_total": ("counter", "Solution processes started.", None, ()),
+    "devready_sandbox_timeouts_total": (
+        "counter", "Solution processes killed on timeout.", None, ()),
+    "devready_sandbox_wall_seconds": (
+        "histogram", "Wall time of solution processes.", LATENCY_BUCKETS, ()),
+    "devready_sandbox_cpu_seconds": (
+        "histogram", "User plus system CPU time of solution processes.", LATENCY_BUCKETS, ()),
+    "devready_mastery_queue_wait_seconds": (
+        "histogram", "Time mastery updates wait for the background thread.", LATENCY_BUCKETS,
+        ()),
+    "devready_ai_request_seconds": (
+        "histogram", "Latency of AI model requests.", LATENCY_BUCKETS, ()),
+    "devready_ai_errors_total": (
+        "counter", "Failed AI model requests by error kind.", None, ("kind",)),
+}
+
+metrics_blueprint = Blueprint("metrics", __name__)
+
+# Metrics are created on first use, so importing the app in the gunicorn master
+# opens no per-process files before the workers fork.
+REGISTRY = CollectorRegistry()
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+def get_metric(name):
+    """Returns the prometheus_client metric for `name`, creating it on first use."""
+    metric = _metrics.get(name)
+    if metric is None:
+        with _metrics_lock:
+            metric = _metrics.get(name)
+            if metric is None:
+                kind, help_text, buckets, labels = METRICS[name]
+                if kind == "counter":
+                    metric = Counter(name, help_text, labels, registry=REGISTRY)
+                else:
+                    metric = Histogram(name, help_text, labels, registry=REGISTRY,
+                                       buckets=buckets)
+                _metrics[name] = metric
+    return metric
+
+def increment(name, amount=1, **labels):
+    """Adds `amount` to a counter."""
+    metric = get_metric(name)
+    (metric.labels(**labels) if labels else metric).inc(amount)
+
+def observe(name, value, **labels):
+    """Records a histogram observation."""
+    metric = get_metric(name)
+    (metric.labels(**labels) if labels else metric).observe(value)
+
+def render():
+    """Returns every metric, summed over all workers in multiprocess mode."""
+    directory = os.environ.get(MULTIPROC_ENV)
+    if not directory:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=directory)
+    return generate_latest(registry)
+
+def clear_multiprocess_dir():
+    """Deletes figures left in PROMETHEUS_MULTIPROC_DIR by an earlier server run."""
+    directory = os.environ.get(MULTIPROC_ENV)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+def require_shared_metrics(app, workers):
+    """Refuses to export metrics from several workers that can't see each other's figures.
+
+    Each scrape reaches one worker, so per-process figures would jump between
+    workers' values from one scrape to the next.
+    """
+    if workers > 1 and app.config.get("METRICS_TOKEN") and not os.environ.get(MULTIPROC_ENV):
+        raise RuntimeError(f"{workers} workers need {MULTIPROC_ENV} to export metrics")
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, _cursor, _statement, _parameters, _context, _executemany):
+    conn.info["metrics_started"] = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, _cursor, _statement, _parameters, _context, _executemany):
+    elapsed = time.perf_counter() - conn.info.pop("metrics_started", time.perf_counter())
+    increment("devready_sql_queries_total")
+    if has_request_context() and "metrics_sql" in g:
+        g.metrics_sql[0] += 1
+        g.metrics_sql[1] += elapsed
+
+def _start_request_timer():
+    g.metrics_started = time.perf_counter()
+    g.metrics_sql = [0, 0.0]
+
+def _remember_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+def _record_request(error):
+    # Teardown runs even when the view raised, so unhandled errors count as 500s.
+    started = g.pop("metrics_started", None)
+    if started is None:
+        return
+    status = 500 if error is not None else g.pop("metrics_status", 500)
+    endpoint = request.endpoint or "unmatched"
+    observe("devready_request_duration_seconds", time.perf_counter() - started,
+            endpoint=endpoint, method=request.method, status=status)
+    observe("devready_request_sql_queries", g.metrics_sql[0], endpoint=endpoint)
+    observe("devready_request_sql_seconds", g.metrics_sql[1], endpoint=endpoint)
+
+def init_metrics(app):
+    """Times every request of `app`; the /metrics route is registered separately."""
+    app.before_request(_start_request_timer)
+    app.after_request(_remember_status)
+    app.teardown_request(_record_request)
+
+@metrics_blueprint.route("/metrics", methods=["GET"])
+def export_metrics():
+    """Prometheus scrape endpoint, enabled by METRICS_TOKEN and sent as a bearer token."""
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token:
+        abort(404)
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        abort(401)
+    return Response(render(), content_type=CONTENT_TYPE_LATEST)
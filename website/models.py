@@ -1,10 +1,32 @@
 """Database models for DevReady."""
+import hashlib
+import zlib
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
 from website.extensions import db
 
+def insert_ignoring_duplicates(model, dialect):
+    """INSERT statement for `model` that leaves rows whose primary key already exists untouched.
+
+    Only a duplicate key is tolerated, so concurrent writers creating the same row
+    cannot conflict while every other error still surfaces.
+    """
+    if dialect == "mysql":
+        statement = mysql.insert(model)
+        key = model.__table__.primary_key.columns.values()[0].name
+        return statement.on_duplicate_key_update({key: statement.inserted[key]})
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    return insert(model)
+
 class User(db.Model, UserMixin):
     """Represents a user in the system."""
+    __table_args__ = (
+        db.Index('ix_user_username', 'username', unique=True),
+    )
     userID = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(128), nullable=False)
     passwordHash = db.Column(db.String(128), nullable=False)
@@ -21,25 +43,43 @@ class Question(db.Model):
     """Represents a coding question."""
     questionID = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(50), nullable=False)
-    description = db.Column(db.Text, nullable=False)
+    # Large text is deferred; undefer the 'content' group where a question is rendered.
+    description = db.deferred(db.Column(db.Text, nullable=False), group='content')
     difficulty = db.Column(db.String(50), nullable=False)
     createdDate = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    template_code = db.Column(db.Text, nullable=True)
+    template_code = db.deferred(db.Column(db.Text, nullable=True), group='content')
     expected_method = db.Column(db.String(50), nullable=True)
 
     submissions = db.relationship('Submission', back_populates='question', lazy=True)
-    questionTags = db.relationship('QuestionTag', back_populates='question', lazy=True)
-
-    def to_dict(self):
-        """Convert question object to dictionary."""
-        return {
-            'questionID': self.questionID,
-            'title': self.title,
-            'description': self.description,
-            'difficulty': self.difficulty,
-            'createdDate': self.createdDate.isoformat() if self.createdDate else None,
-            'expected_method': self.expected_method if self.expected_method else None
-        }
+    questionTags = db.relationship('QuestionTag', back_populates='question', lazy=True,
+                                   order_by='QuestionTag.questionTagID')
+
+    DICT_FIELDS = ('questionID', 'title', 'description', 'difficulty', 'createdDate',
+                   'expected_method')
+    SUMMARY_FIELDS = ('questionID', 'title', 'difficulty')
+    DIFFICULTY_RANK = {'easy': 0, 'medium': 1, 'hard': 2}
+
+    @classmethod
+    def summary_columns(cls):
+        """Columns needed to list a question, without its large text."""
+        return [getattr(cls, field) for field in cls.SUMMARY_FIELDS]
+
+    @classmethod
+    def summaries(cls):
+        """Row query over the summary columns for listing contexts."""
+        return db.session.query(*cls.summary_columns())
+
+    def to_dict(self, fields=None):
+        """Convert question object to dictionary, optionally limited to `fields`."""
+        data = {}
+        for field in fields or self.DICT_FIELDS:
+            value = getattr(self, field)
+            if field == 'createdDate':
+                value = value.isoformat() if value else None
+            elif field == 'expected_method':
+                value = value if value else None
+            data[field] = value
+        return data
 
     @property
     def tags(self):
@@ -61,6 +101,10 @@ class Tag(db.Model):
 
 class QuestionTag(db.Model):
     """Associative table mapping questions to tags."""
+    __table_args__ = (
+        db.Index('ix_question_tag_question_tag', 'questionID', 'tagID', unique=True),
+        db.Index('ix_question_tag_tag_question', 'tagID', 'questionID'),
+    )
     questionTagID = db.Column(db.Integer, primary_key=True)
     questionID = db.Column(db.Integer, db.ForeignKey('question.questionID'))
     tagID = db.Column(db.Integer, db.ForeignKey('tag.tagID'))
@@ -70,34 +114,178 @@ class QuestionTag(db.Model):
 
 class Submission(db.Model):
     """Represents a user submission for a coding question."""
+    __table_args__ = (
+        db.Index('ix_submission_question_result', 'questionID', 'result'),
+        db.Index('ix_submission_user_question', 'userID', 'questionID'),
+        db.Index('ix_submission_user_time', 'userID', 'time'),
+        db.Index('ix_submission_code_hash', 'codeHash'),
+    )
     submissionID = db.Column(db.Integer, primary_key=True)
     userID = db.Column(db.Integer, db.ForeignKey('user.userID'), nullable=False)
     questionID = db.Column(db.Integer, db.ForeignKey('question.questionID'), nullable=False)
-    code = db.Column(db.Text, nullable=False)  # Added code field
+    codeHash = db.Column(db.String(64), db.ForeignKey('code_blob.codeHash'), nullable=False)
     result = db.Column(db.String(50), nullable=False)
+    # Total wall microseconds of the solution processes and peak RSS in KB; passing runs only.
     runtime = db.Column(db.Integer, nullable=True)
+    memory = db.Column(db.Integer, nullable=True)
     language = db.Column(db.String(50), nullable=False)
     time = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     user = db.relationship('User', back_populates='submissions')
     question = db.relationship('Question', back_populates='submissions')
+    blob = db.relationship('CodeBlob')
+
+    SUMMARY_FIELDS = ('submissionID', 'questionID', 'result', 'runtime', 'language', 'time')
+
+    # Encoded blob for code assigned since the last flush; written by _store_code_blobs.
+    pending_blob = None
+
+    @property
+    def code(self):
+        """The submitted source, loaded from its blob on first access."""
+        if self.pending_blob is not None:
+            return CodeBlob.decode(self.pending_blob)
+        blob = self.blob or db.session.get(CodeBlob, self.codeHash)
+        return blob.text if blob else None
+
+    @code.setter
+    def code(self, text):
+        self.pending_blob = CodeBlob.encode(text)
+        self.codeHash = self.pending_blob["codeHash"]
+
+    @classmethod
+    def summary_columns(cls):
+        """Columns needed to list a submission, without its code."""
+        return [getattr(cls, field) for field in cls.SUMMARY_FIELDS]
+
+    @classmethod
+    def summaries(cls):
+        """Row query over the summary columns for listing contexts."""
+        return db.session.query(*cls.summary_columns())
+
+class CodeBlob(db.Model):
+    """Submitted source code, stored once per distinct content and keyed by its SHA-256."""
+    __tablename__ = 'code_blob'
+    codeHash = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    compressed = db.Column(db.Boolean, nullable=False, default=False)
+    size = db.Column(db.Integer, nullable=False)
+
+    COMPRESS_MIN_SIZE = 256
+
+    @staticmethod
+    def encode(text):
+        """Returns the column values for `text`, zlib-compressing all but short sources."""
+        raw = text.encode("utf-8")
+        compressed = len(raw) >= CodeBlob.COMPRESS_MIN_SIZE
+        return {"codeHash": hashlib.sha256(raw).hexdigest(),
+                "data": zlib.compress(raw) if compressed else raw,
+                "compressed": compressed,
+                "size": len(raw)}
+
+    @classmethod
+    def insert_missing(cls, dialect):
+        """INSERT statement that leaves blobs whose hash is already stored untouched."""
+        return insert_ignoring_duplicates(cls, dialect)
+
+    @classmethod
+    def store_all(cls, session, blobs):
+        """Saves encoded blobs (see `encode`) that aren't stored yet, in one statement."""
+        if blobs:
+            dialect = session.get_bind().dialect.name
+            session.execute(cls.insert_missing(dialect), list(blobs))
+
+    @staticmethod
+    def decode(values):
+        """Returns the source code held in `encode`d column values."""
+        data = values["data"]
+        return (zlib.decompress(data) if values["compressed"] else data).decode("utf-8")
+
+    @property
+    def text(self):
+        """The decoded source code."""
+        return CodeBlob.decode({"data": self.data, "compressed": self.compressed})
 
 class TestCase(db.Model):
     """Represents a test case for a coding question."""
+    __table_args__ = (
+        db.Index('ix_test_case_question_sample', 'questionID', 'isSample'),
+    )
     testCaseID = db.Column(db.Integer, primary_key=True)
     questionID = db.Column(db.Integer, db.ForeignKey('question.questionID'), nullable=False)
     inputData = db.Column(db.Text, nullable=False)
     expectedOutput = db.Column(db.Text, nullable=False)
     isSample = db.Column(db.Boolean, default=False)
 
-    question = db.relationship('Question', backref='testCases')
+    question = db.relationship('Question', backref=db.backref(
+        'testCases', order_by='TestCase.testCaseID'))
 
 class MasteryScore(db.Model):
     """Tracks a user's proficiency in different coding concepts."""
     __tablename__ = 'mastery_score'
+    __table_args__ = (
+        db.Index('ix_mastery_score_user_score', 'userID', 'score'),
+    )
     userID = db.Column(db.Integer, db.ForeignKey('user.userID'), primary_key=True)
     tagID = db.Column(db.Integer, db.ForeignKey('tag.tagID'), primary_key=True)
     score = db.Column(db.Float, nullable=False, default=0.0)
 
     user = db.relationship('User', back_populates='mastery_scores')
     tag = db.relationship('Tag', back_populates='mastery_scores')
+
+
+class QuestionStats(db.Model):
+    """Running submission totals for a question, maintained as submissions are saved."""
+    __tablename__ = 'question_stats'
+    questionID = db.Column(db.Integer, db.ForeignKey('question.questionID'), primary_key=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    passes = db.Column(db.Integer, nullable=False, default=0)
+    uniqueAttempters = db.Column(db.Integer, nullable=False, default=0)
+    uniqueSolvers = db.Column(db.Integer, nullable=False, default=0)
+    lastSubmissionTime = db.Column(db.DateTime, nullable=True)
+
+    question = db.relationship('Question', backref=db.backref('stats', uselist=False))
+
+    @property
+    def success_rate(self):
+        """Percentage of submissions that passed, rounded to a whole number."""
+        return round(self.passes / self.attempts * 100) if self.attempts else 0
+
+
+class QuestionDistribution(db.Model):
+    """Log-scale histogram of one resource metric over a question's passing submissions."""
+    __tablename__ = 'question_distribution'
+    questionID = db.Column(db.Integer, db.ForeignKey('question.questionID'), primary_key=True)
+    metric = db.Column(db.String(20), primary_key=True)
+    counts = db.Column(db.LargeBinary, nullable=False)
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+
+class RecommendationQueue(db.Model):
+    """Precomputed next-question candidates for a user, served lowest rank first."""
+    __tablename__ = 'recommendation_queue'
+    __table_args__ = (
+        db.Index('ix_recommendation_queue_user_rank', 'userID', 'rank'),
+    )
+    userID = db.Column(db.Integer, db.ForeignKey('user.userID'), primary_key=True)
+    questionID = db.Column(db.Integer, db.ForeignKey('question.questionID'), primary_key=True)
+    rank = db.Column(db.Integer, nullable=False)
+    # The user's weakest mastery score over the question's tags, the primary ranking key.
+    score = db.Column(db.Float, nullable=True)
+
+    question = db.relationship('Question')
+
+@event.listens_for(Session, "before_flush")
+def _store_code_blobs(session, _flush_context, _instances):
+    """Writes the blobs for flushed submissions, so assigning code issues no SQL."""
+    CodeBlob.store_all(session, {
+        obj.codeHash: obj.pending_blob
+        for obj in session.new.union(session.dirty)
+        if isinstance(obj, Submission) and obj.pending_blob is not None}.values())
+
+@event.listens_for(Session, "after_flush")
+def _clear_stored_code(session, _flush_context):
+    # Cleared only once the flush succeeded, so a retried flush writes the blobs again.
+    for obj in session.new.union(session.dirty):
+        if isinstance(obj, Submission):
+            obj.pending_blob = None
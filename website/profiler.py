@@ -0,0 +1,122 @@
+"""Opt-in sampling profiler for single requests.
+
+With PROFILER_DIR and PROFILER_TOKEN configured, a request that carries the token
+in an `X-Profile` header or a `_profile` query argument is sampled while it runs.
+Two files are written to PROFILER_DIR: `<id>.folded` holds collapsed stacks for
+flamegraph.pl, speedscope or inferno, and `<id>.sql` holds the SQL statements the
+request issued with their durations. Without PROFILER_DIR no hook is installed,
+so requests pay nothing.
+"""
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_INTERVAL = 0.005
+
+def collapse(frame):
+    """Formats a frame's call stack, outermost first, as one collapsed-stack key."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                     f"{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class StackSampler(threading.Thread):
+    """Counts the stacks of one thread every `interval` seconds until stopped."""
+
+    def __init__(self, thread_id, interval=DEFAULT_INTERVAL):
+        super().__init__(name="profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pylint: disable=protected-access
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+    def stop(self):
+        """Stops sampling and waits for the sampler thread to exit."""
+        self.stopped.set()
+        self.join()
+
+class RequestProfile:
+    """Samples the current thread and records the SQL it issues until `finish`."""
+
+    def __init__(self, interval):
+        self.thread_id = threading.get_ident()
+        self.started = time.perf_counter()
+        self.statements = []
+        self.sampler = StackSampler(self.thread_id, interval)
+        event.listen(Engine, "before_cursor_execute", self._before_query)
+        event.listen(Engine, "after_cursor_execute", self._after_query)
+        self.sampler.start()
+
+    def _before_query(self, conn, _cursor, _statement, _parameters, _context, _executemany):
+        if threading.get_ident() == self.thread_id:
+            conn.info["profile_started"] = time.perf_counter()
+
+    def _after_query(self, conn, _cursor, statement, parameters, _context, _executemany):
+        started = conn.info.pop("profile_started", None)
+        if started is not None:
+            self.statements.append((time.perf_counter() - started, statement, parameters))
+
+    def finish(self, directory, label):
+        """Stops profiling and writes the dumps. Returns the profile ID."""
+        self.sampler.stop()
+        event.remove(Engine, "before_cursor_execute", self._before_query)
+        event.remove(Engine, "after_cursor_execute", self._after_query)
+        elapsed = time.perf_counter() - self.started
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{label}"
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{profile_id}.folded"), "w",
+                  encoding="utf-8") as file:
+            file.writelines(f"{stack} {count}\n" for stack, count in self.sampler.stacks.items())
+        with open(os.path.join(directory, f"{profile_id}.sql"), "w", encoding="utf-8") as file:
+            file.write(f"-- {len(self.statements)} statements, "
+                       f"{sum(duration for duration, _, _ in self.statements) * 1000:.1f} ms "
+                       f"of {elapsed * 1000:.1f} ms\n")
+            for duration, statement, parameters in self.statements:
+                file.write(f"-- {duration * 1000:.2f} ms, parameters: {parameters!r}\n"
+                           f"{statement};\n")
+        return profile_id
+
+def init_profiler(app):
+    """Installs the profiling hooks if PROFILER_DIR and PROFILER_TOKEN are configured."""
+    directory = app.config.get("PROFILER_DIR")
+    token = app.config.get("PROFILER_TOKEN")
+    if not directory or not token:
+        return
+    interval = app.config.get("PROFILER_INTERVAL", DEFAULT_INTERVAL)
+
+    @app.before_request
+    def start_profile():
+        supplied = request.headers.get("X-Profile") or request.args.get("_profile")
+        if supplied and hmac.compare_digest(supplied.encode(), token.encode()):
+            g.profile = RequestProfile(interval)
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop("profile", None)
+        if profile is not None:
+            label = (request.endpoint or "unmatched").replace(".", "-")
+            response.headers["X-Profile-Id"] = profile.finish(directory, label)
+        return response
+
+    @app.teardown_request
+    def discard_profile(_error):
+        # Requests that raised never reach after_request; still stop the sampler.
+        profile = g.pop("profile", None)
+        if profile is not None:
+            profile.finish(directory, "failed")
@@ -0,0 +1,81 @@
+"""Server-side prompt assembly for the AI helper, bounded by a token budget."""
+import math
+import re
+from flask import current_app
+from .catalog import get_question_record
+
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 1500
+DESCRIPTION_SHARE = 0.4
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token) that avoids loading a tokenizer."""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+def compact_description(text, max_tokens):
+    """Collapses whitespace and truncates a description to `max_tokens`."""
+    text = re.sub(r"\s+", " ", text or "").strip()
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+def compact_code(code, max_tokens):
+    """Shrinks code to `max_tokens`, keeping its head and tail.
+
+    Blank lines and trailing whitespace are dropped first, then comment-only lines,
+    and only then is the middle of the file elided. Budget left over after whole
+    lines is filled with the start of the next line, so a single over-long line is
+    truncated rather than lost.
+    """
+    lines = [line.rstrip() for line in (code or "").strip().splitlines() if line.strip()]
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len("\n".join(lines)) > max_chars:
+        lines = [line for line in lines if not line.lstrip().startswith("#")]
+    if len("\n".join(lines)) <= max_chars:
+        return "\n".join(lines)
+
+    head, tail, size = [], [], 0
+    for front, back in zip(lines, reversed(lines)):
+        if size + len(front) + len(back) + 2 > max_chars or len(head) + len(tail) >= len(lines):
+            break
+        head.append(front)
+        tail.append(back)
+        size += len(front) + len(back) + 2
+    omitted = lines[len(head):len(lines) - len(tail)]
+    room = max_chars - size - len(f"# ... {len(omitted)} lines omitted ...") - len(" ...") - 2
+    if room > 0:
+        head.append(omitted.pop(0)[:room] + " ...")
+    marker = [f"# ... {len(omitted)} lines omitted ..."] if omitted else []
+    return "\n".join(head + marker + list(reversed(tail)))
+
+def get_question_context(question_id):
+    """Returns a (title, description) pair for a question, or None if it doesn't exist."""
+    question = get_question_record(question_id)
+    if not question:
+        return None
+    return question.title, question.description
+
+def build_prompt_parts(code, question_id=None, question_description=None):
+    """Returns (question_text, code) trimmed to the configured token budget.
+
+    The question text is assembled from the stored question when `question_id` is given;
+    `question_description` is only used by older clients that still send it.
+    Returns (None, None) if the question cannot be resolved.
+    """
+    if question_id is not None:
+        context = get_question_context(question_id)
+        if not context:
+            return None, None
+        title, description = context
+        question_text = f"{title}: {description}"
+    elif question_description:
+        question_text = question_description
+    else:
+        return None, None
+
+    budget = current_app.config.get("AI_PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)
+    description_budget = int(budget * DESCRIPTION_SHARE)
+    question_text = compact_description(question_text, description_budget)
+    code_budget = budget - estimate_tokens(question_text)
+    return question_text, compact_code(code, code_budget)
@@ -1,35 +1,147 @@
 """This module handles the endpoints and functions related to questions."""
-from flask import Blueprint, request, jsonify, render_template, redirect, url_for
+from bisect import bisect_right
+from flask import Blueprint, request, jsonify, render_template, redirect, url_for, current_app
 from flask_login import login_required, current_user
-from .models import Question, QuestionTag, MasteryScore, Submission, Tag, TestCase
+from .models import Submission
 from .extensions import db
+from .stats import get_success_rate
+from .catalog import (LISTING_FIELDS, get_library, get_question_record, get_snapshot,
+                      serialize_record)
+from .search import search_questions
+from .database import read_replica
 
 questions_blueprint = Blueprint("questions", __name__)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+QUESTION_FIELDS = LISTING_FIELDS
+
+def get_list_arg(name):
+    """Returns a query argument given repeatedly and/or comma-separated as a list."""
+    return [value.strip() for raw in request.args.getlist(name)
+            for value in raw.split(",") if value.strip()]
+
+def parse_listing_args():
+    """Validates the pagination, filter and projection arguments of GET /questions."""
+    fields = get_list_arg("fields") or list(QUESTION_FIELDS)
+    unknown = [field for field in fields if field not in QUESTION_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if "questionID" not in fields:
+        fields.insert(0, "questionID")
+
+    status = request.args.get("status")
+    if status not in (None, "attempted", "unattempted"):
+        raise ValueError("status must be 'attempted' or 'unattempted'")
+
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+        after = int(request.args.get("after", 0))
+    except ValueError as e:
+        raise ValueError("limit and after must be integers") from e
+    if limit < 1:
+        raise ValueError("limit must be positive")
+
+    return {
+        "fields": fields,
+        "difficulties": [value.lower() for value in get_list_arg("difficulty")],
+        "tags": get_list_arg("tag"),
+        "status": status,
+        "limit": min(limit, MAX_PAGE_SIZE),
+        "after": after,
+    }
+
+def listing_response(snapshot, question_ids, fields):
+    """Builds a JSON array response, reusing pre-serialized entries for full listings."""
+    if tuple(fields) == QUESTION_FIELDS:
+        body = "[" + ",".join(snapshot.listing_json[question_id]
+                              for question_id in question_ids) + "]"
+    else:
+        body = current_app.json.dumps([serialize_record(snapshot.by_id[question_id], fields)
+                                       for question_id in question_ids])
+    return current_app.response_class(body, mimetype="application/json")
+
+def filter_listing(snapshot, args, user_id):
+    """Returns up to limit + 1 question IDs after the cursor that match the filters."""
+    attempted = None
+    if args["status"]:
+        attempted = {question_id for question_id, in db.session.query(Submission.questionID)
+                     .filter(Submission.userID == user_id).distinct()}
+    difficulties = set(args["difficulties"])
+    tags = set(args["tags"])
+    matches = []
+    for record in snapshot.questions[bisect_right(snapshot.ids, args["after"]):]:
+        if difficulties and record.difficulty.lower() not in difficulties:
+            continue
+        if not tags.issubset(record.tag_names):
+            continue
+        if attempted is not None and (
+                (record.questionID in attempted) != (args["status"] == "attempted")):
+            continue
+        matches.append(record.questionID)
+        if len(matches) > args["limit"]:
+            break
+    return matches
+
 @questions_blueprint.route("/questions", methods=["GET"])
 @login_required
+@read_replica
 def get_questions():
-    """Get all questions from the database, with sample test cases."""
+    """Get a page of questions, with optional filters, field projection and sample test cases.
+
+    Pages are keyed on questionID: pass the `X-Next-Cursor` response header back as `after`.
+    """
     try:
-        questions = Question.query.all()
-        return jsonify([{
-            **question.to_dict(),
-            "tags": [tag.name for tag in question.tags],
-            "sample_test_cases": [
-                {"input": tc.inputData, "expected_output": tc.expectedOutput}
-                for tc in question.testCases
-                if tc.isSample
-            ]
-        } for question in questions])
+        args = parse_listing_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        snapshot = get_snapshot()
+        question_ids = filter_listing(snapshot, args, current_user.userID)
+        has_more = len(question_ids) > args["limit"]
+        question_ids = question_ids[:args["limit"]]
+        response = listing_response(snapshot, question_ids, args["fields"])
+        if has_more:
+            next_cursor = question_ids[-1]
+            link_args = request.args.to_dict(flat=False)
+            link_args["after"] = next_cursor
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+            response.headers["Link"] = (
+                f'<{url_for("questions.get_questions", **link_args)}>; rel="next"')
+        return response
     except Exception as e:
         return jsonify({"error": "Failed to fetch questions", "details": str(e)}), 500
 
+@questions_blueprint.route("/questions/search", methods=["GET"])
+@login_required
+@read_replica
+def search():
+    """Search question titles, descriptions and tags, returning ranked, paginated results."""
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    try:
+        limit = min(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        offset = max(int(request.args.get("offset", 0)), 0)
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
+    try:
+        total, results = search_questions(query, limit, offset)
+        return jsonify({"query": query, "total": total, "offset": offset, "results": results})
+    except Exception as e:
+        return jsonify({"error": "Failed to search questions", "details": str(e)}), 500
+
 @questions_blueprint.route("/questions/<int:question_id>", methods=["GET"])
 @login_required
+@read_replica
 def get_question_by_id(question_id):
     """Get a question by its ID and render the question template."""
     try:
-        question = Question.query.get(question_id)
+        question = get_question_record(question_id)
         if not question:
             return jsonify({"error": "Question not found"}), 404
         examples = [{
@@ -37,12 +149,7 @@ def get_question_by_id(question_id):
             "output": tc.expectedOutput
         } for tc in question.testCases if tc.isSample]
 
-        total_submissions = Submission.query.filter_by(questionID=question_id).count()
-        successful_submissions = Submission.query.filter_by(
-            questionID=question_id, result="Passed"
-        ).count()
-        success_rate = round((successful_submissions / total_submissions * 100) 
-                           if total_submissions > 0 else 0)
+        success_rate = get_success_rate(question_id)
 
         return render_template('question.html',
                              question=question,
@@ -54,6 +161,7 @@ def get_question_by_id(question_id):
 
 @questions_blueprint.route("/questions/tags", methods=["GET"])
 @login_required
+@read_replica
 def get_questions_by_tag():
     """Get questions, with sample test cases, by a specific tag."""
     try:
@@ -61,69 +169,11 @@ def get_questions_by_tag():
         if not tag:
             return jsonify({"error": "Tag parameter is required"}), 400
 
-        questions = Question.query.join(QuestionTag).filter(
-            QuestionTag.tag.has(name=tag)
-        ).all()
-        return jsonify([{
-            **question.to_dict(),
-            "tags": [tag.name for tag in question.tags],
-            "sample_test_cases": [
-                {"input": tc.inputData, "expected_output": tc.expectedOutput}
-                for tc in question.testCases
-                if tc.isSample
-            ]
-        } for question in questions])
+        snapshot = get_snapshot()
+        return listing_response(snapshot, snapshot.by_tag.get(tag, ()), QUESTION_FIELDS)
     except Exception as e:
         return jsonify({"error": "Failed to fetch questions by tag", "details": str(e)}), 500
 
-def get_next_question(user_id):
-    """Fetch the next question based on the user's weakest skill."""
-    # Find the weakest skill (tag with lowest mastery score)
-    weakest_tag = (
-        db.session.query(MasteryScore)
-        .filter_by(userID=user_id)
-        .order_by(MasteryScore.score.asc())
-        .first()
-    )
-
-    if weakest_tag:
-        # Get an unattempted question for this tag
-        question = (
-            db.session.query(Question)
-            .join(QuestionTag, QuestionTag.questionID == Question.questionID)
-            .filter(QuestionTag.tagID == weakest_tag.tagID)
-            .outerjoin(
-                Submission,
-                (Submission.questionID == Question.questionID) & (Submission.userID == user_id)
-            )
-            .filter(Submission.submissionID == None)
-            .order_by(Question.difficulty)
-            .first()
-        )
-    else:
-        # Default: Get any question if no mastery score exists yet
-        question = db.session.query(Question).order_by(Question.difficulty).first()
-
-    sample_tests = [test for test in question.testCases if test.isSample]
-    return question, sample_tests
-
 def get_all_tags_with_questions():
-    """Fetch all tags with their associated questions."""
-    # Fetch all tags and their associated questions in one optimized query
-    tag_questions = {}
-
-    tags_with_questions = (
-        db.session.query(Tag.name, Question)
-        .join(QuestionTag, Tag.tagID == QuestionTag.tagID)
-        .join(Question, Question.questionID == QuestionTag.questionID)
-        .order_by(Tag.name, Question.difficulty)
-        .all()
-    )
-
-    # Group questions under their respective tags
-    for tag_name, question in tags_with_questions:
-        if tag_name not in tag_questions:
-            tag_questions[tag_name] = []
-        tag_questions[tag_name].append(question)
-
-    return tag_questions
+    """Fetch all tags with summaries of their associated questions, cached per catalog version."""
+    return get_library()
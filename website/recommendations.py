@@ -0,0 +1,143 @@
+"""Per-user recommendation queue backing the home page's next question."""
+from sqlalchemy import and_, case, func
+from sqlalchemy.exc import IntegrityError
+from .catalog import cache_generation
+from .extensions import cache, db
+from .models import MasteryScore, Question, QuestionTag, RecommendationQueue, Submission, TestCase
+
+QUEUE_SIZE = 10
+DIFFICULTY_RANK = Question.DIFFICULTY_RANK
+EXHAUSTED_KEY = "recommendations:exhausted:{}"
+
+def difficulty_rank():
+    """SQL expression ranking difficulties Easy < Medium < Hard (unknown values last)."""
+    return case(
+        dict(DIFFICULTY_RANK),
+        value=func.lower(Question.difficulty),
+        else_=len(DIFFICULTY_RANK)
+    )
+
+def rank_candidates(user_id, limit=QUEUE_SIZE):
+    """Returns up to `limit` unattempted (question ID, score) pairs in recommendation order.
+
+    Questions touching the user's weakest mastered tag come first, then easier
+    questions before harder ones. Questions with no scored tag come last. The
+    score is the weakest mastery score over the question's tags.
+    """
+    attempted = db.session.query(Submission.submissionID).filter(
+        Submission.questionID == Question.questionID,
+        Submission.userID == user_id
+    ).exists()
+    weakest = func.min(MasteryScore.score)  # pylint: disable=assignment-from-no-return
+    rows = (
+        db.session.query(Question.questionID, weakest)
+        .outerjoin(QuestionTag, QuestionTag.questionID == Question.questionID)
+        .outerjoin(MasteryScore, and_(MasteryScore.tagID == QuestionTag.tagID,
+                                      MasteryScore.userID == user_id))
+        .filter(~attempted)
+        .group_by(Question.questionID, Question.difficulty)
+        .order_by(weakest.is_(None), weakest, difficulty_rank(), Question.questionID)
+        .limit(limit)
+        .all()
+    )
+    return [tuple(row) for row in rows]
+
+def rebuild_queue(user_id):
+    """Replaces the user's queue with freshly ranked candidates and commits.
+
+    Returns False when nothing is left to recommend; the user is then marked as
+    exhausted for the current catalog so later page loads skip the ranking query
+    and write nothing. A concurrent rebuild for the same user wins harmlessly.
+    """
+    candidates = rank_candidates(user_id)
+    if not candidates:
+        cache.set(EXHAUSTED_KEY.format(user_id), cache_generation())
+        return False
+    invalidate_queue(user_id)
+    db.session.add_all([
+        RecommendationQueue(userID=user_id, questionID=question_id, rank=rank, score=score)
+        for rank, (question_id, score) in enumerate(candidates)
+    ])
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request rebuilt the same queue first; its rows are as good as ours.
+        db.session.rollback()
+    return True
+
+def is_exhausted(user_id):
+    """Returns True if the user had attempted every question in the current catalog."""
+    return cache.get(EXHAUSTED_KEY.format(user_id)) == cache_generation()
+
+def invalidate_queue(user_id):
+    """Drops the user's queue so it is re-ranked on the next home page load."""
+    RecommendationQueue.query.filter_by(userID=user_id).delete()
+    cache.delete(EXHAUSTED_KEY.format(user_id))
+
+def remove_from_queue(user_id, question_id):
+    """Removes a question the user just attempted from their queue. The caller commits."""
+    RecommendationQueue.query.filter_by(userID=user_id, questionID=question_id).delete()
+
+def rescore_queue(user_id, tag_ids):
+    """Re-ranks the user's queue after their scores for `tag_ids` changed. The caller commits.
+
+    Only queued questions carrying one of those tags get a new score; the rest keep
+    theirs, so the catalog-wide ranking query is not repeated.
+    """
+    queued = {row.questionID: row for row in RecommendationQueue.query.filter_by(userID=user_id)}
+    if not queued or not tag_ids:
+        return
+    affected = db.session.query(QuestionTag.questionID).filter(
+        QuestionTag.questionID.in_(list(queued)), QuestionTag.tagID.in_(tag_ids))
+    weakest = func.min(MasteryScore.score)  # pylint: disable=assignment-from-no-return
+    rows = (
+        db.session.query(QuestionTag.questionID, weakest)
+        .outerjoin(MasteryScore, and_(MasteryScore.tagID == QuestionTag.tagID,
+                                      MasteryScore.userID == user_id))
+        .filter(QuestionTag.questionID.in_(affected))
+        .group_by(QuestionTag.questionID)
+        .all()
+    )
+    if not rows:
+        return
+    for question_id, score in rows:
+        queued[question_id].score = score
+    ordered = (
+        RecommendationQueue.query
+        .join(Question, Question.questionID == RecommendationQueue.questionID)
+        .filter(RecommendationQueue.userID == user_id)
+        .order_by(RecommendationQueue.score.is_(None), RecommendationQueue.score,
+                  difficulty_rank(), RecommendationQueue.questionID)
+        .all()
+    )
+    for rank, row in enumerate(ordered):
+        row.rank = rank
+
+def get_queue_head(user_id):
+    """Returns the user's next queued question, with its content loaded, or None."""
+    return (
+        Question.query
+        .join(RecommendationQueue, RecommendationQueue.questionID == Question.questionID)
+        .filter(RecommendationQueue.userID == user_id)
+        .order_by(RecommendationQueue.rank)
+        .options(db.undefer_group('content'))
+        .first()
+    )
+
+def get_next_question(user_id):
+    """Fetch the next question based on the user's weakest skill, with its sample tests.
+
+    Returns (None, []) when the user has attempted every question.
+    """
+    question = get_queue_head(user_id)
+    if question is None:
+        if is_exhausted(user_id) or not rebuild_queue(user_id):
+            return None, []
+        question = get_queue_head(user_id)
+    if question is None:
+        return None, []
+
+    sample_tests = TestCase.query.filter_by(
+        questionID=question.questionID, isSample=True
+    ).order_by(TestCase.testCaseID).all()
+    return question, sample_tests
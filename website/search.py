@@ -0,0 +1,97 @@
+"""In-process inverted index for ranked question search, rebuilt with each catalog snapshot."""
+import math
+import re
+from bisect import bisect_left
+from .catalog import cached, get_snapshot
+
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "description": 1.0}
+STOPWORDS = {"a", "an", "and", "are", "for", "given", "in", "is", "of", "on", "or", "the",
+             "to", "with"}
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIX_EXPANSIONS = 20
+
+def tokenize(text):
+    """Lowercases text and splits it into alphanumeric terms, dropping stopwords."""
+    return [term for term in re.findall(r"[a-z0-9]+", (text or "").lower())
+            if term not in STOPWORDS]
+
+class SearchIndex:
+    """BM25-ranked inverted index over question titles, tags and descriptions.
+
+    Postings map each term to {questionID: weighted term frequency}, with title and
+    tag matches counting more than description matches. The sorted vocabulary
+    allows prefix matching on the last query term.
+    """
+
+    def __init__(self, documents):
+        self.postings = {}
+        self.lengths = {}
+        self.summaries = {}
+        for doc in documents:
+            question_id = doc["questionID"]
+            self.summaries[question_id] = {
+                "questionID": question_id,
+                "title": doc["title"],
+                "difficulty": doc["difficulty"],
+                "tags": doc["tags"],
+            }
+            length = 0.0
+            for field, weight in FIELD_WEIGHTS.items():
+                text = " ".join(doc[field]) if field == "tags" else doc[field]
+                for term in tokenize(text):
+                    postings = self.postings.setdefault(term, {})
+                    postings[question_id] = postings.get(question_id, 0.0) + weight
+                    length += weight
+            self.lengths[question_id] = length
+        self.vocabulary = sorted(self.postings)
+        self.average_length = (sum(self.lengths.values()) / len(self.lengths)
+                               if self.lengths else 0.0)
+
+    def expand(self, term):
+        """Returns `term` plus a bounded number of indexed terms it is a prefix of."""
+        if len(term) < MIN_PREFIX_LENGTH:
+            return [term]
+        start = bisect_left(self.vocabulary, term)
+        matches = []
+        for candidate in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not candidate.startswith(term):
+                break
+            matches.append(candidate)
+        return matches or [term]
+
+    def search(self, query):
+        """Returns (questionID, score) pairs for `query`, best match first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        expanded = [[term] for term in terms[:-1]] + [self.expand(terms[-1])]
+
+        total = len(self.lengths)
+        scores = {}
+        for alternatives in expanded:
+            for term in alternatives:
+                postings = self.postings.get(term, {})
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for question_id, frequency in postings.items():
+                    norm = 1 - BM25_B + BM25_B * self.lengths[question_id] / self.average_length
+                    scores[question_id] = scores.get(question_id, 0.0) + idf * (
+                        frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm))
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+def build_search_index():
+    """Indexes the searchable text of every question in the catalog snapshot."""
+    return SearchIndex(
+        {"questionID": record.questionID, "title": record.title,
+         "difficulty": record.difficulty, "description": record.description,
+         "tags": list(record.tag_names)}
+        for record in get_snapshot().questions)
+
+def search_questions(query, limit=20, offset=0):
+    """Returns (total matches, one page of ranked question summaries with scores)."""
+    index = cached("search_index", build_search_index)
+    ranked = index.search(query)
+    page = [{**index.summaries[question_id], "score": round(score, 4)}
+            for question_id, score in ranked[offset:offset + limit]]
+    return len(ranked), page
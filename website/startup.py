@@ -0,0 +1,42 @@
+"""Boot-time accounting for application workers."""
+import json
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+BOOT_SCRIPT = (
+    "import json, time\n"
+    "started = time.perf_counter()\n"
+    "from website import create_app\n"
+    "imported = time.perf_counter()\n"
+    "app = create_app()\n"
+    "print(json.dumps({'import': round((imported - started) * 1000, 1),"
+    " **app.extensions['boot_timings']}))\n"
+)
+
+@contextmanager
+def boot_phase(timings, name):
+    """Records the milliseconds spent in the block under `name` in `timings`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+def parse_importtime(stderr):
+    """Sums `python -X importtime` self times (microseconds) by top-level package."""
+    totals = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+    return totals
+
+def boot_report():
+    """Boots the app in a fresh interpreter and returns (phase ms, import us by package)."""
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+                             capture_output=True, text=True, check=True)
+    return json.loads(process.stdout.strip().splitlines()[-1]), parse_importtime(process.stderr)
@@ -3,9 +3,9 @@ document.addEventListener("DOMContentLoaded", function () {
     const hintBtn = document.getElementById("hint-btn");
     const chatBox = document.getElementById("chat-box");
 
-    function getQuestionDescription() {
-        const descriptionElement = document.getElementById("question-description");
-        return descriptionElement ? descriptionElement.innerText.trim() : "Unknown Problem";
+    function getQuestionId() {
+        const titleElement = document.getElementById("question-title");
+        return titleElement ? titleElement.dataset.questionId : null;
     }
 
     function addMessage(role, text) {
@@ -37,13 +37,12 @@ document.addEventListener("DOMContentLoaded", function () {
         if (loadingDiv) loadingDiv.remove();
     }
 
-    async function fetchHint(description, code) {
+    async function fetchHint(questionId, code) {
         try {
-            console.log(description)
             const response = await fetch("/hint", {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({ question_description: description, code: code })
+                body: JSON.stringify({ question_id: questionId, code: code })
             });
 
             const result = await response.json();
@@ -54,9 +53,13 @@ document.addEventListener("DOMContentLoaded", function () {
     }
 
     hintBtn.addEventListener("click", async function () {
-        const questionDescription = getQuestionDescription();
+        const questionId = getQuestionId();
         const code = editor.getValue().trim();
 
+        if (!questionId) {
+            addMessage("AI Helper", "<span class='text-danger'>No question selected.</span>");
+            return;
+        }
         if (!code) {
             addMessage("AI Helper", "<span class='text-danger'>Please write some code first.</span>");
             return;
@@ -65,7 +68,7 @@ document.addEventListener("DOMContentLoaded", function () {
         addMessage("user", "Get Hint!");
         showLoadingIndicator();
 
-        const hint = await fetchHint(questionDescription, code);
+        const hint = await fetchHint(questionId, code);
         removeLoadingIndicator();
         addMessage("AI Helper", hint);
     });
@@ -22,6 +22,7 @@ async function executeCode(endpoint, outputId, isSubmission = false) {
             return;
         }
         isSubmission ? displaySubmissionResults(result.results) : displayRunResults(result.results);
+        if (isSubmission) displayUsage(result);
     } catch (error) {
         outputDiv.innerHTML = `<pre class="text-danger">Error: ${error.message}</pre>`;
     }
@@ -66,6 +67,25 @@ function displaySubmissionResults(results) {
     showTestCase(results[0].expected, results[0].input, results[0].actual, buttons[0]);
 }
 
+// Show runtime and memory of a passing submission with its percentile ranks
+function displayUsage(result) {
+    const usageDiv = document.getElementById("submission-usage");
+    if (!usageDiv) return;
+    if (!result.passed || !result.usage || result.usage.runtime === null) {
+        usageDiv.innerHTML = "";
+        return;
+    }
+    const ranks = result.ranks || {};
+    const parts = [`Runtime ${(result.usage.runtime / 1000).toFixed(2)} ms`];
+    if (ranks.runtime !== undefined) parts[0] += `, faster than ${ranks.runtime}% of passing submissions`;
+    if (result.usage.memory !== null) {
+        let memory = `Memory ${(result.usage.memory / 1024).toFixed(1)} MB`;
+        if (ranks.memory !== undefined) memory += `, less than ${ranks.memory}% of passing submissions`;
+        parts.push(memory);
+    }
+    usageDiv.innerHTML = parts.join("<br>");
+}
+
 // Display a single test case result
 function showTestCase(expected, input, actual, activeButton) {
     document.getElementById("expected-text").innerHTML = `<strong>${expected}</strong>`;
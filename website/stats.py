@@ -0,0 +1,121 @@
+"""Materialized per-question submission statistics."""
+from datetime import datetime
+from sqlalchemy import and_, case, distinct, func, or_
+from .extensions import db
+from .models import (MasteryScore, Question, QuestionStats, Submission, Tag,
+                     insert_ignoring_duplicates)
+
+PROFILE_PAGE_SIZE = 20
+
+def record_submission(user_id, question_id, passed, time=None):
+    """Folds one new submission into the question's stats row.
+
+    Must run before the submission itself is added to the session, so the
+    first-attempt/first-pass checks only see the user's earlier submissions.
+    The caller commits both in the same transaction.
+    """
+    previous = Submission.query.filter_by(userID=user_id, questionID=question_id)
+    first_attempt = not db.session.query(previous.exists()).scalar()
+    first_pass = passed and not db.session.query(
+        previous.filter_by(result="Passed").exists()).scalar()
+
+    stats = db.session.get(QuestionStats, question_id)
+    if stats is None:
+        # Another worker may create the row first; theirs is as good as ours.
+        db.session.execute(
+            insert_ignoring_duplicates(QuestionStats, db.session.get_bind().dialect.name),
+            {"questionID": question_id, "attempts": 0, "passes": 0,
+             "uniqueAttempters": 0, "uniqueSolvers": 0})
+        stats = db.session.get(QuestionStats, question_id)
+
+    # Increment in SQL so concurrent workers don't overwrite each other's counts.
+    stats.attempts = QuestionStats.attempts + 1
+    if passed:
+        stats.passes = QuestionStats.passes + 1
+    if first_attempt:
+        stats.uniqueAttempters = QuestionStats.uniqueAttempters + 1
+    if first_pass:
+        stats.uniqueSolvers = QuestionStats.uniqueSolvers + 1
+    stats.lastSubmissionTime = time or datetime.utcnow()
+    return stats
+
+def get_success_rate(question_id):
+    """Returns a question's success rate from its stats row in a single primary-key lookup."""
+    stats = db.session.get(QuestionStats, question_id)
+    return stats.success_rate if stats else 0
+
+def rebuild_question_stats():
+    """Recomputes every stats row from the Submission table. Returns the number of rows."""
+    passed = Submission.result == "Passed"
+    rows = db.session.query(
+        Submission.questionID,
+        func.count(Submission.submissionID),
+        func.sum(case((passed, 1), else_=0)),
+        func.count(distinct(Submission.userID)),
+        func.count(distinct(case((passed, Submission.userID)))),
+        func.max(Submission.time),
+    ).group_by(Submission.questionID).all()
+
+    db.session.query(QuestionStats).delete()
+    db.session.add_all([
+        QuestionStats(questionID=question_id, attempts=attempts, passes=passes or 0,
+                      uniqueAttempters=attempters, uniqueSolvers=solvers,
+                      lastSubmissionTime=last_time)
+        for question_id, attempts, passes, attempters, solvers, last_time in rows
+    ])
+    db.session.commit()
+    return len(rows)
+
+def get_profile_stats(user_id):
+    """Aggregates a user's submission counts and per-tag mastery without loading submissions."""
+    passed = Submission.result == "Passed"
+    total, passes, solved = db.session.query(
+        func.count(Submission.submissionID),
+        func.sum(case((passed, 1), else_=0)),
+        func.count(distinct(case((passed, Submission.questionID)))),
+    ).filter(Submission.userID == user_id).one()
+
+    mastery = [
+        {"tag": name, "score": round(score)}
+        for name, score in db.session.query(Tag.name, MasteryScore.score)
+        .join(MasteryScore, MasteryScore.tagID == Tag.tagID)
+        .filter(MasteryScore.userID == user_id)
+        .order_by(Tag.name)
+    ]
+    return {
+        "submissions": total,
+        "passed": passes or 0,
+        "solved": solved,
+        "pass_rate": round((passes or 0) / total * 100) if total else 0,
+        "mastery": mastery,
+        "average_mastery": (round(sum(row["score"] for row in mastery) / len(mastery))
+                            if mastery else 0),
+    }
+
+def get_submission_history(user_id, before=None, per_page=PROFILE_PAGE_SIZE):
+    """Returns a user's submissions older than the `before` cursor, newest first.
+
+    Pages are keyed on (time, submissionID), so deep pages cost the same as the
+    first one. Returns the rows and the cursor for the next page, or None on the
+    last page. Only the listed columns and the question title are selected;
+    submitted code is never loaded.
+    """
+    query = (
+        Submission.summaries().add_columns(Question.title)
+        .join(Question, Question.questionID == Submission.questionID)
+        .filter(Submission.userID == user_id)
+    )
+    if before is not None:
+        cursor_time = (db.session.query(Submission.time)
+                       .filter_by(submissionID=before, userID=user_id)
+                       .scalar_subquery())
+        query = query.filter(or_(
+            Submission.time < cursor_time,
+            and_(Submission.time == cursor_time, Submission.submissionID < before)))
+    rows = (
+        query.order_by(Submission.time.desc(), Submission.submissionID.desc())
+        .limit(per_page + 1)
+        .all()
+    )
+    next_cursor = rows[per_page - 1].submissionID if len(rows) > per_page else None
+    return rows[:per_page], next_cursor
@@ -1,7 +1,12 @@
 """This module contains endpoints for DevReady"""
-from flask import Blueprint, render_template
+from flask import Blueprint, render_template, request
+from markupsafe import Markup
 from flask_login import login_required, current_user
-from .questions import get_next_question, get_all_tags_with_questions
+from .questions import get_all_tags_with_questions
+from .catalog import cached
+from .database import read_replica
+from .recommendations import get_next_question
+from .stats import get_profile_stats, get_submission_history
 
 # Create a blueprint
 main_blueprint = Blueprint('main', __name__)
@@ -15,16 +20,23 @@ def main():
 
 @main_blueprint.route('/library', methods=['GET', 'POST'])
 @login_required
+@read_replica
 def library():
     """Endpoint to get problem library page."""
-    tag_questions = get_all_tags_with_questions()
-    return render_template('library.html', user=current_user, tag_questions=tag_questions)
+    accordion = cached("library_html", lambda: Markup(render_template(
+        'library_accordion.html', tag_questions=get_all_tags_with_questions())))
+    return render_template('library.html', user=current_user, accordion=accordion)
 
 @main_blueprint.route('/profile', methods=['GET', 'POST'])
 @login_required
+@read_replica
 def profile():
     """Endpoint to get profile page."""
-    return render_template('profile.html', user=current_user)
+    before = request.args.get('before', type=int)
+    history, next_cursor = get_submission_history(current_user.userID, before)
+    return render_template('profile.html', user=current_user,
+                           stats=get_profile_stats(current_user.userID),
+                           history=history, before=before, next_cursor=next_cursor)
 
 @main_blueprint.route('/settings', methods=['GET', 'POST'])
 @login_required